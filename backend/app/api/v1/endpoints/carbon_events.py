@@ -1,121 +1,249 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from app.core.database import get_db
-from app.models.carbon_event import CarbonEvent
+from app.core.database import get_async_db
+from app.core.etag import make_etag, not_modified, validator_headers
 from app.schemas.carbon_event import CarbonEventCreate, CarbonEventResponse, CarbonEventUpdate
+from app.services.carbon_event_service import (
+    AsyncCarbonEventService, EXPORT_FORMATS, export_carbon_events, ndjson_lines, parse_fields
+)
+from app.services.rollup_service import EmissionsRollupService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CarbonEventResponse])
+@router.get(
+    "/",
+    response_model=None,
+    responses={
+        200: {
+            "description": "Carbon events, with only the requested fields when fields is given",
+            "content": {"application/json": {"schema": {"type": "array", "items": {"type": "object"}}}},
+            "headers": {
+                "X-Next-Cursor": {
+                    "description": "Cursor for the next page; absent on the last page",
+                    "schema": {"type": "string"}
+                }
+            }
+        }
+    }
+)
 async def get_carbon_events(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
     supplier_id: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db)
+    where: List[str] = Query([], description="Extracted-field filters as field:op:value, e.g. distance_km:gte:1000"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,supplier_id,emissions_kg_co2e"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get carbon events with optional filtering"""
-    query = db.query(CarbonEvent)
+    """Get carbon events with optional filtering, ordered by timestamp then id
     
-    if supplier_id:
-        query = query.filter(CarbonEvent.supplier_id == supplier_id)
+    When more events follow, the X-Next-Cursor header holds the cursor for the next page.
+    Rows are encoded straight to JSON with orjson; with fields set, each row has only
+    those keys, so the response is not validated against CarbonEventResponse.
+    Polls whose filter scope is unchanged get a 304 before the page is queried.
+    """
+    carbon_event_service = AsyncCarbonEventService(db)
+    try:
+        fields = parse_fields(fields)
+        version = await carbon_event_service.get_scope_version(supplier_id, start_date, end_date, where)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if start_date:
-        query = query.filter(CarbonEvent.timestamp >= start_date)
+    headers = validator_headers(
+        make_etag("carbon-events", tuple(version), skip, limit, cursor, supplier_id, start_date, end_date, where, fields),
+        version.last_modified
+    )
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
     
-    if end_date:
-        query = query.filter(CarbonEvent.timestamp <= end_date)
+    try:
+        carbon_events, next_cursor = await carbon_event_service.list_events(
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            supplier_id=supplier_id,
+            start_date=start_date,
+            end_date=end_date,
+            where=where,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    carbon_events = query.offset(skip).limit(limit).all()
-    return carbon_events
+    response = ORJSONResponse(carbon_events, headers=headers)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
 
 @router.post("/", response_model=CarbonEventResponse)
 async def create_carbon_event(
     carbon_event: CarbonEventCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new carbon event"""
-    db_carbon_event = CarbonEvent(**carbon_event.dict())
-    db.add(db_carbon_event)
-    db.commit()
-    db.refresh(db_carbon_event)
-    return db_carbon_event
+    return await AsyncCarbonEventService(db).create_event(carbon_event.dict())
+
+@router.post("/bulk")
+async def bulk_create_carbon_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many carbon events from a JSON array or a streamed NDJSON body
+    
+    Events are validated and inserted in chunks, one transaction per chunk; invalid
+    rows are reported by index without failing the rest of the upload.
+    """
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        records = ndjson_lines(request.stream())
+    else:
+        try:
+            records = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(records, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    
+    try:
+        return await AsyncCarbonEventService(db).ingest(records)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk ingestion failed: {str(e)}")
+
+@router.get("/export")
+async def export_events(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|arrow)$"),
+    supplier_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream every matching carbon event as NDJSON, CSV or Arrow IPC"""
+    version = await AsyncCarbonEventService(db).get_scope_version(supplier_id, start_date, end_date)
+    headers = validator_headers(
+        make_etag("carbon-events-export", tuple(version), format, supplier_id, start_date, end_date),
+        version.last_modified
+    )
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    
+    return StreamingResponse(
+        export_carbon_events(format, supplier_id=supplier_id, start_date=start_date, end_date=end_date),
+        media_type=EXPORT_FORMATS[format],
+        headers={**headers, "Content-Disposition": f'attachment; filename="carbon_events.{format}"'}
+    )
+
+@router.get("/extracted/summary")
+async def get_extracted_summary(
+    request: Request,
+    response: Response,
+    field: Optional[str] = Query(None, description="Numeric extracted field to total, e.g. fuel_consumption"),
+    group_by: Optional[str] = Query(None, description="supplier_id, product_id, event_type or an extracted field, e.g. vehicle_type"),
+    where: List[str] = Query([], description="Extracted-field filters as field:op:value, e.g. distance_km:gte:1000"),
+    supplier_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Aggregate emissions and extracted document fields such as fuel use by vehicle type"""
+    carbon_event_service = AsyncCarbonEventService(db)
+    try:
+        version = await carbon_event_service.get_scope_version(supplier_id, start_date, end_date, where)
+        headers = validator_headers(
+            make_etag("extracted-summary", tuple(version), field, group_by, where, supplier_id, start_date, end_date),
+            version.last_modified
+        )
+        unchanged = not_modified(request, headers)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(headers)
+        return await carbon_event_service.summarise_extracted(
+            field=field,
+            group_by=group_by,
+            where=where,
+            supplier_id=supplier_id,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error summarising extracted data: {str(e)}")
 
 @router.get("/{carbon_event_id}", response_model=CarbonEventResponse)
 async def get_carbon_event(
+    request: Request,
+    response: Response,
     carbon_event_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a specific carbon event by ID"""
-    carbon_event = db.query(CarbonEvent).filter(CarbonEvent.id == carbon_event_id).first()
+    """Get a specific carbon event by ID
+    
+    Its supplier is unknown until it is loaded, so the ETag follows the version of
+    all events; a poll with no writes since gets a 304 without reading the event.
+    """
+    carbon_event_service = AsyncCarbonEventService(db)
+    version = await carbon_event_service.get_scope_version()
+    headers = validator_headers(make_etag("carbon-event", carbon_event_id, tuple(version)), version.last_modified)
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    
+    carbon_event = await carbon_event_service.get_event(carbon_event_id)
     if not carbon_event:
         raise HTTPException(status_code=404, detail="Carbon event not found")
+    response.headers.update(headers)
     return carbon_event
 
 @router.put("/{carbon_event_id}", response_model=CarbonEventResponse)
 async def update_carbon_event(
     carbon_event_id: int,
     carbon_event_update: CarbonEventUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a carbon event"""
-    db_carbon_event = db.query(CarbonEvent).filter(CarbonEvent.id == carbon_event_id).first()
+    carbon_event_service = AsyncCarbonEventService(db)
+    db_carbon_event = await carbon_event_service.get_event(carbon_event_id)
     if not db_carbon_event:
         raise HTTPException(status_code=404, detail="Carbon event not found")
     
-    for field, value in carbon_event_update.dict(exclude_unset=True).items():
-        setattr(db_carbon_event, field, value)
-    
-    db.commit()
-    db.refresh(db_carbon_event)
-    return db_carbon_event
+    return await carbon_event_service.update_event(db_carbon_event, carbon_event_update.dict(exclude_unset=True))
 
 @router.delete("/{carbon_event_id}")
 async def delete_carbon_event(
     carbon_event_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a carbon event"""
-    carbon_event = db.query(CarbonEvent).filter(CarbonEvent.id == carbon_event_id).first()
+    carbon_event_service = AsyncCarbonEventService(db)
+    carbon_event = await carbon_event_service.get_event(carbon_event_id)
     if not carbon_event:
         raise HTTPException(status_code=404, detail="Carbon event not found")
     
-    db.delete(carbon_event)
-    db.commit()
+    await carbon_event_service.delete_event(carbon_event)
     return {"message": "Carbon event deleted successfully"}
 
 @router.get("/summary/dashboard")
 async def get_carbon_summary(
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get carbon emissions summary for dashboard"""
-    # Get total emissions for current month
-    current_month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    total_emissions = db.query(CarbonEvent).filter(
-        CarbonEvent.timestamp >= current_month_start
-    ).with_entities(
-        db.func.sum(CarbonEvent.emissions_kg_co2e).label("total_emissions")
-    ).scalar() or 0
-    
-    # Get top suppliers by emissions
-    top_suppliers = db.query(CarbonEvent).filter(
-        CarbonEvent.timestamp >= current_month_start
-    ).with_entities(
-        CarbonEvent.supplier_id,
-        db.func.sum(CarbonEvent.emissions_kg_co2e).label("total_emissions")
-    ).group_by(CarbonEvent.supplier_id).order_by(
-        db.func.sum(CarbonEvent.emissions_kg_co2e).desc()
-    ).limit(5).all()
+    version = await db.run_sync(lambda session: EmissionsRollupService(session).get_dashboard_version())
+    headers = validator_headers(make_etag("dashboard", date.today().replace(day=1), version), version[-1])
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
     
-    return {
-        "total_emissions_kg_co2e": float(total_emissions),
-        "top_suppliers": [
-            {"supplier_id": supplier.supplier_id, "emissions": float(supplier.total_emissions)}
-            for supplier in top_suppliers
-        ]
-    } 
\ No newline at end of file
+    # Current month's totals come pre-summed from the monthly rollup
+    return await db.run_sync(lambda session: EmissionsRollupService(session).get_dashboard_summary())
\ No newline at end of file
@@ -1,82 +1,158 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import json
 
 from app.core.database import get_db
+from app.core.etag import make_etag, not_modified, validator_headers
 from app.services.forecast_service import ForecastService
-from app.schemas.forecast import ForecastRequest, ForecastResponse
+from app.schemas.forecast import (
+    ForecastRequest, ForecastResponse, PortfolioForecastRequest, PortfolioForecastResponse
+)
 
 router = APIRouter()
 
 @router.post("/", response_model=ForecastResponse)
-async def generate_forecast(
+def generate_forecast(
     forecast_request: ForecastRequest,
     db: Session = Depends(get_db)
 ):
     """Generate emissions forecast for specified parameters"""
     try:
         forecast_service = ForecastService(db)
-        forecast = await forecast_service.generate_forecast(
+        forecast = forecast_service.generate_forecast(
             supplier_id=forecast_request.supplier_id,
             product_id=forecast_request.product_id,
             forecast_horizon_days=forecast_request.forecast_horizon_days,
-            confidence_level=forecast_request.confidence_level
+            confidence_level=forecast_request.confidence_level,
+            engine=forecast_request.engine
         )
         return forecast
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
 
+@router.post("/portfolio", response_model=PortfolioForecastResponse)
+def generate_portfolio_forecast(
+    portfolio_request: PortfolioForecastRequest,
+    db: Session = Depends(get_db)
+):
+    """Forecast a list of suppliers (or all of them) in one pass, with a portfolio total"""
+    try:
+        forecast_service = ForecastService(db)
+        supplier_ids = portfolio_request.supplier_ids
+        forecast = forecast_service.generate_portfolio_forecast(
+            supplier_ids=None if supplier_ids == "all" else supplier_ids,
+            forecast_horizon_days=portfolio_request.forecast_horizon_days,
+            confidence_level=portfolio_request.confidence_level
+        )
+        return forecast
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Portfolio forecast failed: {str(e)}")
+
+def forecast_validators(
+    forecast_service: ForecastService, supplier_id: str, horizon_days: int, engine: str
+) -> Optional[Dict[str, str]]:
+    """ETag and Last-Modified of the supplier's stored forecast, or None while none is current"""
+    version = forecast_service.get_forecast_version(supplier_id, engine=engine, horizon_days=horizon_days)
+    if version is None:
+        return None
+    return validator_headers(make_etag("forecast", supplier_id, horizon_days, engine, version), version["generated_at"])
+
 @router.get("/supplier/{supplier_id}")
-async def get_supplier_forecast(
+def get_supplier_forecast(
+    request: Request,
+    response: Response,
     supplier_id: str,
     horizon_days: int = Query(90, ge=1, le=365),
+    refresh: bool = Query(False, description="Regenerate instead of serving the stored forecast"),
+    engine: str = Query("auto", pattern="^(auto|random_forest|exponential_smoothing)$"),
     db: Session = Depends(get_db)
 ):
-    """Get forecast for a specific supplier"""
+    """Get forecast for a specific supplier
+    
+    Unless refreshing, a poll whose stored forecast is still current gets a 304
+    without loading the model or the forecast itself.
+    """
     try:
         forecast_service = ForecastService(db)
-        forecast = await forecast_service.generate_forecast(
+        headers = None if refresh else forecast_validators(forecast_service, supplier_id, horizon_days, engine)
+        if headers is not None:
+            unchanged = not_modified(request, headers)
+            if unchanged is not None:
+                return unchanged
+        
+        forecast = forecast_service.generate_forecast(
             supplier_id=supplier_id,
-            forecast_horizon_days=horizon_days
+            forecast_horizon_days=horizon_days,
+            use_materialized=not refresh,
+            engine=engine
         )
+        if headers is None:
+            # Validators for the forecast just stored; fallback forecasts are not stored and get none
+            headers = forecast_validators(forecast_service, supplier_id, horizon_days, engine)
+        if headers is not None:
+            response.headers.update(headers)
         return forecast
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Forecast generation failed: {str(e)}")
 
 @router.get("/trends")
-async def get_forecast_trends(
+def get_forecast_trends(
     db: Session = Depends(get_db)
 ):
     """Get overall forecast trends and insights"""
     try:
         forecast_service = ForecastService(db)
-        trends = await forecast_service.get_forecast_trends()
+        trends = forecast_service.get_forecast_trends()
         return trends
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Trend analysis failed: {str(e)}")
 
-@router.post("/train")
-async def retrain_models(
+@router.post("/train", status_code=202)
+def retrain_models(
+    mode: str = Query("global", pattern="^(global|fleet)$"),
     db: Session = Depends(get_db)
 ):
-    """Retrain the forecasting models with latest data"""
+    """Queue retraining of the forecasting models with latest data"""
     try:
         forecast_service = ForecastService(db)
-        result = await forecast_service.retrain_models()
-        return {"message": "Models retrained successfully", "details": result}
+        job = forecast_service.retrain_models(mode)
+        return {"message": "Model retraining queued", "job_id": job["job_id"], "details": job}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Model retraining failed: {str(e)}")
 
+@router.get("/train/{job_id}")
+def get_training_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """Get progress and results of a model training job"""
+    forecast_service = ForecastService(db)
+    job = forecast_service.get_training_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job
+
 @router.get("/accuracy")
-async def get_model_accuracy(
+def get_model_accuracy(
     db: Session = Depends(get_db)
 ):
     """Get model accuracy metrics"""
     try:
         forecast_service = ForecastService(db)
-        accuracy = await forecast_service.get_model_accuracy()
+        accuracy = forecast_service.get_model_accuracy()
         return accuracy
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Accuracy calculation failed: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Accuracy calculation failed: {str(e)}") 
+
+@router.get("/registry/stats")
+def get_registry_stats(
+    db: Session = Depends(get_db)
+):
+    """Get model registry cache statistics"""
+    try:
+        forecast_service = ForecastService(db)
+        return forecast_service.get_registry_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch registry stats: {str(e)}")
\ No newline at end of file
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 import io
 
 from app.core.database import get_db
+from app.core.etag import make_etag, not_modified, validator_headers
 from app.services.report_service import ReportService
 from app.schemas.report import ReportRequest, ReportResponse
 
@@ -83,7 +84,9 @@ async def check_compliance_status(
         raise HTTPException(status_code=500, detail=f"Compliance check failed: {str(e)}")
 
 @router.get("/history")
-async def get_report_history(
+def get_report_history(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
@@ -91,7 +94,14 @@ async def get_report_history(
     """Get history of generated reports"""
     try:
         report_service = ReportService(db)
-        history = await report_service.get_report_history(skip, limit)
+        version = report_service.get_history_version()
+        headers = validator_headers(make_etag("report-history", version, skip, limit), version[-1])
+        unchanged = not_modified(request, headers)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(headers)
+        
+        history = report_service.get_report_history(skip, limit)
         return history
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch report history: {str(e)}") 
\ No newline at end of file
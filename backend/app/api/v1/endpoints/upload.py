@@ -4,33 +4,30 @@ from typing import List, Optional
 import json
 
 from app.core.database import get_db
-from app.services.upload_service import UploadService
+from app.services.upload_service import ALLOWED_CONTENT_TYPES, UploadService
 from app.schemas.upload import UploadResponse, ParsedData
 
 router = APIRouter()
 
-@router.post("/file", response_model=UploadResponse)
+@router.post("/file", response_model=UploadResponse, status_code=202)
 async def upload_file(
     file: UploadFile = File(...),
     supplier_id: Optional[str] = Form(None),
     document_type: Optional[str] = Form("invoice"),
     db: Session = Depends(get_db)
 ):
-    """Upload and process a file (PDF, CSV, etc.) for emissions data extraction"""
+    """Upload a file (PDF, CSV, etc.) and queue it for emissions data extraction
+    
+    Returns at once with an upload_id; poll /upload/status/{upload_id} for progress.
+    """
     try:
         upload_service = UploadService(db)
         
         # Validate file type
-        allowed_types = [
-            "application/pdf", 
-            "text/csv", 
-            "text/plain",
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        ]
-        if file.content_type not in allowed_types:
+        if file.content_type not in ALLOWED_CONTENT_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.content_type}")
         
-        # Process the file
+        # Spool the file and queue it
         result = await upload_service.process_file(
             file=file,
             supplier_id=supplier_id,
@@ -38,6 +35,10 @@ async def upload_file(
         )
         
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File processing failed: {str(e)}")
 
@@ -45,29 +46,26 @@ async def upload_file(
 async def upload_bulk_files(
     files: List[UploadFile] = File(...),
     supplier_id: Optional[str] = Form(None),
+    document_type: Optional[str] = Form("invoice"),
     db: Session = Depends(get_db)
 ):
-    """Upload multiple files for batch processing"""
+    """Upload and process multiple files concurrently
+    
+    Returns each file's outcome, so one bad file does not fail the batch, and
+    throughput statistics for the whole batch.
+    """
     try:
         upload_service = UploadService(db)
-        results = []
-        
-        for file in files:
-            result = await upload_service.process_file(
-                file=file,
-                supplier_id=supplier_id
-            )
-            results.append(result)
-        
-        return {
-            "message": f"Processed {len(results)} files",
-            "results": results
-        }
+        return await upload_service.process_bulk(
+            files=files,
+            supplier_id=supplier_id,
+            document_type=document_type or "invoice"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Bulk upload failed: {str(e)}")
 
 @router.post("/manual")
-async def manual_data_entry(
+def manual_data_entry(
     data: dict,
     supplier_id: str,
     db: Session = Depends(get_db)
@@ -75,36 +73,40 @@ async def manual_data_entry(
     """Manually enter emissions data"""
     try:
         upload_service = UploadService(db)
-        result = await upload_service.process_manual_data(data, supplier_id)
+        result = upload_service.process_manual_data(data, supplier_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Manual data entry failed: {str(e)}")
 
 @router.get("/status/{upload_id}")
-async def get_upload_status(
+def get_upload_status(
     upload_id: str,
     db: Session = Depends(get_db)
 ):
     """Get the status of a file upload/processing job"""
     try:
         upload_service = UploadService(db)
-        status = await upload_service.get_upload_status(upload_id)
-        return status
+        status = upload_service.get_upload_status(upload_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get upload status: {str(e)}")
+    if status is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return status
 
 @router.get("/parsed-data/{upload_id}")
-async def get_parsed_data(
+def get_parsed_data(
     upload_id: str,
     db: Session = Depends(get_db)
 ):
     """Get the parsed data from a processed upload"""
     try:
         upload_service = UploadService(db)
-        data = await upload_service.get_parsed_data(upload_id)
-        return data
+        data = upload_service.get_parsed_data(upload_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get parsed data: {str(e)}")
+    if data is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return data
 
 @router.post("/validate")
 async def validate_parsed_data(
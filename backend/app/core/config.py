@@ -5,6 +5,9 @@ import os
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./walmart_esg.db"
+    DB_POOL_SIZE: int = 5  # Connections the async engine keeps open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under load; pool + overflow caps concurrent queries
+    DB_POOL_TIMEOUT: int = 30  # Seconds a request waits for a free connection before failing
     
     # Security
     SECRET_KEY: str = "your-secret-key-here"
@@ -21,10 +24,26 @@ class Settings(BaseSettings):
     # File upload
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+    UPLOAD_WORKERS: int = 2  # Uploads processed at once in the background; the rest wait queued
+    PDF_EXTRACTION_WORKERS: Optional[int] = None  # PDF parsing process pool size (defaults to CPU count)
+    PDF_PAGES_PER_TASK: int = 10  # Pages of one PDF parsed per pool task
+    BULK_UPLOAD_CONCURRENCY: int = 8  # Files of one bulk upload spooled and parsed at once
+    
+    # Data export and bulk ingestion
+    EXPORT_CHUNK_ROWS: int = 5000  # Rows fetched and written per chunk by streaming exports
+    BULK_INSERT_CHUNK_ROWS: int = 1000  # Events validated and inserted per transaction by bulk ingestion
     
     # ML Model settings
     MODEL_CACHE_DIR: str = "models"
     FORECAST_HORIZON_DAYS: int = 90
+    MODEL_REGISTRY_MAX_MODELS: int = 256  # Hot models kept in memory
+    MODEL_REGISTRY_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB resident model budget
+    TRAINING_WORKERS: Optional[int] = None  # Training process pool size (defaults to CPU count)
+    FORECAST_CACHE_MAX_AGE_HOURS: int = 24  # Materialized forecasts older than this are regenerated
+    BACKTEST_FOLDS: int = 3  # Rolling-origin windows scored per model
+    BACKTEST_HORIZON_DAYS: int = 30  # Length of each held-out window
+    FORECAST_SMOOTHING_MAX_DAYS: int = 180  # "auto" engine uses exponential smoothing up to this many days of history
+    COLD_START_NEIGHBORS: int = 5  # Similar suppliers pooled to forecast a supplier without its own model
     
     # External APIs
     EPA_API_KEY: Optional[str] = None
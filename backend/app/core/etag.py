@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional, Dict, Any
+from starlette.requests import Request
+from starlette.responses import Response
+import hashlib
+import json
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag from whatever determines a response: a data version and the request's parameters"""
+    payload = json.dumps(parts, default=str, separators=(",", ":"))
+    return f'W/"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag, as HTTP requires for GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any(
+        (tag[2:] if tag.startswith("W/") else tag) == opaque
+        for tag in (tag.strip() for tag in if_none_match.split(","))
+    )
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        # Naive timestamps come from the database's UTC now()
+        last_modified = last_modified.replace(tzinfo=timezone.utc) if last_modified.tzinfo is None else last_modified
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """A 304 response if the client already holds the current ETag, otherwise None
+
+    Routes call this after computing their data version and before running their
+    main query, so an unchanged poll costs only the version lookup.
+    """
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
+
@@ -0,0 +1,47 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+from app.core.database import Base
+
+
+def upgrade_schema(engine: Engine):
+    """Bring tables created by an older release up to the models
+
+    create_all only creates missing tables, so columns and indexes added to
+    existing tables since are added here, on any backend; columns are added
+    nullable, as existing rows have no value for them. On PostgreSQL, JSON
+    columns still typed TEXT or JSON are converted to JSONB first, as the
+    ->> expression indexes need it. database/setup.sql does the same.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {
+                column["name"]: column["type"].compile(dialect=engine.dialect)
+                for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                column_type = column.type.compile(dialect=engine.dialect)
+                if column.name not in existing_columns:
+                    conn.execute(text(
+                        f"ALTER TABLE {quote(table.name)} "
+                        f"ADD COLUMN {quote(column.name)} {column_type}"
+                    ))
+                elif (
+                    engine.dialect.name == "postgresql"
+                    and column_type == "JSONB"
+                    and existing_columns[column.name] != "JSONB"
+                ):
+                    conn.execute(text(
+                        f"ALTER TABLE {quote(table.name)} "
+                        f"ALTER COLUMN {quote(column.name)} TYPE JSONB "
+                        f"USING {quote(column.name)}::jsonb"
+                    ))
+            # IF NOT EXISTS rather than checkfirst, which cannot see SQLite expression indexes
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
@@ -1,5 +1,9 @@
 # Models package
 from .carbon_event import CarbonEvent
+from .emissions_rollup import DailyEmissionsRollup, MonthlyEmissionsRollup
+from .event_scope_version import EventScopeVersion
 from .forecast import Forecast
+from .forecast_feature import ForecastFeature
 from .incentive import Incentive
-from .report import Report 
\ No newline at end of file
+from .report import Report
+from .upload_job import UploadJob 
\ No newline at end of file
@@ -1,26 +1,125 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, JSON, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.sql import func
+from typing import Any, Dict, Optional
+import math
 from app.core.database import Base
 
+# JSON on SQLite, JSONB on PostgreSQL; Python None is stored as SQL NULL, not JSON null
+JSONDocument = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 class CarbonEvent(Base):
     __tablename__ = "carbon_events"
-    
+    __table_args__ = (
+        # Keyset pagination on (timestamp, id), overall and within a supplier
+        Index("ix_carbon_events_timestamp_id", "timestamp", "id"),
+        Index("ix_carbon_events_supplier_timestamp_id", "supplier_id", "timestamp", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     supplier_id = Column(String(100), index=True, nullable=False)
     product_id = Column(String(100), index=True, nullable=True)
     event_type = Column(String(50), nullable=False)  # 'transport', 'manufacturing', 'energy', etc.
     emissions_kg_co2e = Column(Float, nullable=False)
-    activity_data = Column(Text, nullable=True)  # JSON string with activity details
+    activity_data = Column(JSONDocument, nullable=True)  # Activity details
     emission_factor = Column(Float, nullable=True)
     source_document = Column(String(255), nullable=True)  # File path or reference
     verification_status = Column(String(20), default="pending")  # pending, verified, rejected
-    audit_trail = Column(Text, nullable=True)  # JSON string with audit information
+    audit_trail = Column(JSONDocument, nullable=True)  # Audit information
     blockchain_hash = Column(String(255), nullable=True)
-    extracted_data = Column(Text, nullable=True)  # JSON string with extracted data from documents
+    extracted_data = Column(JSONDocument, nullable=True)  # Data extracted from documents
     confidence_score = Column(Float, nullable=True)  # Confidence score for AI extraction
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     timestamp = Column(DateTime(timezone=True), nullable=False)  # When the emission event occurred
-    
+
     def __repr__(self):
-        return f"<CarbonEvent(id={self.id}, supplier_id='{self.supplier_id}', emissions={self.emissions_kg_co2e}kg CO2e)>" 
\ No newline at end of file
+        return f"<CarbonEvent(id={self.id}, supplier_id='{self.supplier_id}', emissions={self.emissions_kg_co2e}kg CO2e)>"
+
+
+class extracted_number(FunctionElement):
+    """Numeric field of a JSON document column, e.g. extracted_data.distance_km"""
+    type = Float()
+    inherit_cache = True
+
+
+class extracted_text(FunctionElement):
+    """Text field of a JSON document column, e.g. extracted_data.vehicle_type"""
+    type = String()
+    inherit_cache = True
+
+
+# The field name is rendered inline (never as a bound parameter) so a query's
+# expression is identical to the expression index's and the planner can use it
+@compiles(extracted_number)
+@compiles(extracted_text)
+def _compile_extracted_sqlite(element, compiler, **kw):
+    document, field = element.clauses
+    return f"json_extract({compiler.process(document, **kw)}, '$.{field.name}')"
+
+
+@compiles(extracted_number, "postgresql")
+def _compile_extracted_number_postgresql(element, compiler, **kw):
+    document, field = element.clauses
+    return f"(CAST(({compiler.process(document, **kw)} ->> '{field.name}') AS DOUBLE PRECISION))"
+
+
+@compiles(extracted_text, "postgresql")
+def _compile_extracted_text_postgresql(element, compiler, **kw):
+    document, field = element.clauses
+    return f"({compiler.process(document, **kw)} ->> '{field.name}')"
+
+
+# Extracted document fields that can be filtered and aggregated on, each with an expression index
+EXTRACTED_FIELDS = {
+    "fuel_consumption": extracted_number,
+    "distance_km": extracted_number,
+    "energy_consumption": extracted_number,
+    "waste_generated": extracted_number,
+    "vehicle_type": extracted_text,
+}
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip().replace(",", "")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def normalise_extracted(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """extracted_data with its numeric indexed fields as numbers
+
+    Strings such as "1,200" become 1200.0 and values that are not numbers
+    (e.g. "n/a") are dropped, as PostgreSQL's expression indexes cast these
+    fields and one bad value would fail the insert.
+    """
+    if not data:
+        return data
+    normalised = dict(data)
+    for name, expression in EXTRACTED_FIELDS.items():
+        if expression is extracted_number and name in normalised:
+            number = _number(normalised[name])
+            if number is None:
+                del normalised[name]
+            else:
+                normalised[name] = number
+    return normalised
+
+
+def extracted_field(name: str) -> FunctionElement:
+    """SQL expression for an indexed extracted_data field; raises ValueError for other fields"""
+    if name not in EXTRACTED_FIELDS:
+        raise ValueError(f"Unknown extracted field: {name}. Use one of {', '.join(EXTRACTED_FIELDS)}")
+    return EXTRACTED_FIELDS[name](CarbonEvent.extracted_data, literal_column(name))
+
+
+for _name in EXTRACTED_FIELDS:
+    Index(f"ix_carbon_events_extracted_{_name}", extracted_field(_name))
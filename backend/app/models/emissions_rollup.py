@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class DailyEmissionsRollup(Base):
+    __tablename__ = "emissions_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("period", "supplier_id", "product_id", "event_type", name="uq_emissions_daily_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    period = Column(Date, nullable=False, index=True)  # Day of the events
+    supplier_id = Column(String(100), nullable=False, index=True)
+    product_id = Column(String(100), nullable=False, default="")  # '' for events without a product
+    event_type = Column(String(50), nullable=False)
+    emissions_total = Column(Float, nullable=False, default=0.0)
+    event_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class MonthlyEmissionsRollup(Base):
+    __tablename__ = "emissions_monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint("period", "supplier_id", "product_id", "event_type", name="uq_emissions_monthly_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    period = Column(Date, nullable=False, index=True)  # First day of the events' month
+    supplier_id = Column(String(100), nullable=False, index=True)
+    product_id = Column(String(100), nullable=False, default="")  # '' for events without a product
+    event_type = Column(String(50), nullable=False)
+    emissions_total = Column(Float, nullable=False, default=0.0)
+    event_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
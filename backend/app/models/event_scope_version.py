@@ -0,0 +1,17 @@
+from typing import Optional
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+ALL_EVENTS_SCOPE = "all"
+
+class EventScopeVersion(Base):
+    __tablename__ = "event_scope_versions"
+
+    scope_key = Column(String(110), primary_key=True)  # "all", or "supplier:<supplier_id>"
+    version = Column(Integer, nullable=False, default=0)  # Bumped by every event write in the scope
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+def scope_version_key(supplier_id: Optional[str] = None) -> str:
+    return f"supplier:{supplier_id}" if supplier_id is not None else ALL_EVENTS_SCOPE
@@ -1,15 +1,23 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Forecast(Base):
     __tablename__ = "forecasts"
+    __table_args__ = (
+        # Materialized forecast lookup: one row per day for each scope/horizon/model
+        Index("ix_forecasts_lookup", "supplier_id", "product_id", "horizon_days", "model_version"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     supplier_id = Column(String(100), index=True)
+    product_id = Column(String(100), nullable=True)
     forecast_date = Column(Date, nullable=False)
     predicted_emissions = Column(Float, nullable=False)
     confidence_interval_lower = Column(Float)
     confidence_interval_upper = Column(Float)
+    horizon_days = Column(Integer, nullable=True)
+    confidence_level = Column(Float, nullable=True)
     model_version = Column(String(50))
-    created_at = Column(DateTime(timezone=True), server_default=func.now()) 
\ No newline at end of file
+    data_version = Column(String(100), nullable=True)  # Training data version the forecast was generated from
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ForecastFeature(Base):
+    __tablename__ = "forecast_features"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope_key = Column(String(210), unique=True, nullable=False)  # Same key as the scope's forecast model
+    supplier_id = Column(String(100), index=True, nullable=True)  # NULL for the all-suppliers scope
+    product_id = Column(String(100), nullable=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    emissions_sum = Column(Float, nullable=False, default=0.0)
+    last_event_date = Column(Date, nullable=True)
+    daily_totals = Column(Text, nullable=True)  # JSON {date: [emissions sum, event count]} for the recent window
+    weekday_totals = Column(Text, nullable=True)  # JSON [[emissions sum], [event count]] per weekday, all history
+    event_type_totals = Column(Text, nullable=True)  # JSON {event type: [emissions sum, event count]}, all history
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
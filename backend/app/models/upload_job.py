@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.carbon_event import JSONDocument
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(String(32), unique=True, nullable=False)  # Public job id returned by /upload/file
+    filename = Column(String(255), nullable=True)
+    content_type = Column(String(100), nullable=True)
+    file_path = Column(String(500), nullable=False)  # Spooled copy under UPLOAD_DIR
+    file_size = Column(Integer, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the file, computed while spooling
+    duplicate_of = Column(String(32), nullable=True)  # upload_id whose result this repeat upload reuses
+    supplier_id = Column(String(100), nullable=True)
+    document_type = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, processing, completed, failed
+    progress = Column(Integer, nullable=False, default=0)  # Percent of the file processed
+    rows_received = Column(Integer, nullable=False, default=0)
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    pages_total = Column(Integer, nullable=True)
+    pages_processed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSONDocument, nullable=True)  # Row errors, capped at MAX_UPLOAD_ERRORS
+    result = Column(JSONDocument, nullable=True)  # Parsed data: extracted fields, column mapping, event ids
+    error_message = Column(String(1000), nullable=True)  # Why a failed job failed
+    confidence_score = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from app.models.carbon_event import normalise_extracted
+
 class CarbonEventBase(BaseModel):
     supplier_id: str = Field(..., description="Supplier identifier")
     product_id: Optional[str] = Field(None, description="Product identifier")
@@ -13,7 +15,12 @@ class CarbonEventBase(BaseModel):
     timestamp: datetime = Field(..., description="When the emission event occurred")
 
 class CarbonEventCreate(CarbonEventBase):
-    pass
+    extracted_data: Optional[Dict[str, Any]] = Field(None, description="Data extracted from the source document")
+
+    @field_validator("extracted_data")
+    @classmethod
+    def normalise_extracted_data(cls, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return normalise_extracted(value)
 
 class CarbonEventUpdate(BaseModel):
     supplier_id: Optional[str] = None
@@ -33,6 +40,8 @@ class CarbonEventResponse(CarbonEventBase):
     verification_status: str
     audit_trail: Optional[Dict[str, Any]] = None
     blockchain_hash: Optional[str] = None
+    extracted_data: Optional[Dict[str, Any]] = None
+    confidence_score: Optional[float] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Union, Literal
 from datetime import datetime
 
 class ForecastDataPoint(BaseModel):
@@ -13,6 +13,11 @@ class ForecastRequest(BaseModel):
     product_id: Optional[str] = Field(None, description="Product identifier")
     forecast_horizon_days: int = Field(90, ge=1, le=365, description="Forecast horizon in days")
     confidence_level: float = Field(0.95, ge=0.5, le=0.99, description="Confidence level for intervals")
+    engine: str = Field(
+        "auto",
+        pattern="^(auto|random_forest|exponential_smoothing)$",
+        description="Forecast backend; 'auto' picks exponential smoothing for short series"
+    )
 
 class ForecastResponse(BaseModel):
     supplier_id: Optional[str]
@@ -20,8 +25,33 @@ class ForecastResponse(BaseModel):
     forecast_horizon_days: int
     confidence_level: float
     forecast_data: List[ForecastDataPoint]
-    model_accuracy: float
+    model_accuracy: Optional[float] = Field(None, description="Backtested accuracy of the model version used, once evaluated")
     generated_at: datetime
+    engine: Optional[str] = Field(None, description="Forecast backend that produced the forecast")
+    fallback_model: bool = Field(False, description="Served by the global model while the dedicated one trains")
+    training_job_id: Optional[str] = Field(None, description="Background training job for this forecast's model")
+    similar_suppliers: Optional[List[str]] = Field(None, description="Suppliers whose models were pooled for a cold start")
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class PortfolioForecastRequest(BaseModel):
+    supplier_ids: Union[List[str], Literal["all"]] = Field("all", description="Suppliers to forecast, or 'all'")
+    forecast_horizon_days: int = Field(90, ge=1, le=365, description="Forecast horizon in days")
+    confidence_level: float = Field(0.95, ge=0.5, le=0.99, description="Confidence level for intervals")
+
+class SupplierForecast(BaseModel):
+    supplier_id: str
+    engine: str
+    fallback_model: bool = False
+    similar_suppliers: Optional[List[str]] = None
+    forecast_data: List[ForecastDataPoint]
+
+class PortfolioForecastResponse(BaseModel):
+    forecast_horizon_days: int
+    confidence_level: float
+    suppliers: List[SupplierForecast]
+    portfolio_total: List[ForecastDataPoint] = Field(
+        ..., description="Sum of supplier forecasts; bounds are summed, so they assume fully correlated errors"
+    )
+    generated_at: datetime
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class ParsedData(BaseModel):
     total_amount: Optional[float] = None
@@ -16,3 +16,9 @@ class UploadResponse(BaseModel):
     upload_id: Optional[str] = None
     extracted_data: Optional[Dict[str, Any]] = None
     confidence_score: Optional[float] = None
+    rows_received: Optional[int] = None
+    rows_inserted: Optional[int] = None
+    rows_failed: Optional[int] = None
+    errors: Optional[List[Dict[str, Any]]] = None
+    column_mapping: Optional[Dict[str, str]] = None
+    duplicate_of: Optional[str] = None
@@ -0,0 +1,484 @@
+from datetime import datetime
+from typing import Optional, List, Tuple, Any, Dict, AsyncIterator, Callable, Iterable, Iterator, Union
+from pydantic import ValidationError
+from sqlalchemy import Select, select, func, cast, tuple_, insert, Float, Integer, DateTime, Text, JSON
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import pyarrow as pa
+import itertools
+import operator
+import base64
+import json
+import csv
+import io
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.carbon_event import CarbonEvent, extracted_field, extracted_number
+from app.schemas.carbon_event import CarbonEventCreate, CarbonEventResponse
+from app.services.feature_store import FeatureStore
+from app.services.rollup_service import EmissionsRollupService
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream"
+}
+EXPORT_COLUMNS = list(CarbonEvent.__table__.columns)
+# Positions of the JSON document columns; NDJSON keeps them as objects, Arrow as JSON text
+EXPORT_JSON_INDEXES = [index for index, column in enumerate(EXPORT_COLUMNS) if isinstance(column.type, JSON)]
+# CSV cells hold JSON documents as their JSON text, cast in SQL
+EXPORT_CSV_COLUMNS = [
+    cast(column, Text).label(column.name) if isinstance(column.type, JSON) else column
+    for column in EXPORT_COLUMNS
+]
+# Columns event listings can project, and the default projection (the response model's fields)
+LIST_COLUMNS = {column.name: column for column in CarbonEvent.__table__.columns}
+DEFAULT_LIST_FIELDS = [name for name in CarbonEventResponse.model_fields if name in LIST_COLUMNS]
+EXTRACTED_FILTER_OPS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge
+}
+# Event columns extracted-field summaries can be grouped by, besides the extracted fields
+SUMMARY_GROUP_COLUMNS = {
+    "supplier_id": CarbonEvent.supplier_id,
+    "product_id": CarbonEvent.product_id,
+    "event_type": CarbonEvent.event_type
+}
+
+
+def _arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    return pa.string()
+
+
+EXPORT_ARROW_SCHEMA = pa.schema([(column.name, _arrow_type(column)) for column in EXPORT_COLUMNS])
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _arrow_columns(chunk: List[Any]) -> List[List[Any]]:
+    columns = [list(values) for values in zip(*chunk)]
+    for index in EXPORT_JSON_INDEXES:
+        columns[index] = [None if value is None else json.dumps(value) for value in columns[index]]
+    return columns
+
+
+async def _iterate(records: Iterable[Any]) -> AsyncIterator[Any]:
+    for record in records:
+        yield record
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Lists of up to size records, pulled lazily from any iterable"""
+    iterator = iter(records)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def id_ranges(ids: Iterable[int]) -> List[List[int]]:
+    """Sorted ids collapsed into [first, last] runs, e.g. [[1, 3], [7, 7]] for 1, 2, 3, 7"""
+    ranges: List[List[int]] = []
+    for event_id in sorted(ids):
+        if ranges and event_id == ranges[-1][1] + 1:
+            ranges[-1][1] = event_id
+        else:
+            ranges.append([event_id, event_id])
+    return ranges
+
+
+def _merge_batch(summary: Dict[str, Any], result: Dict[str, Any], max_errors: Optional[int] = None):
+    summary["received"] += result["received"]
+    summary["inserted"] += result["inserted"]
+    if "id_ranges" in summary:
+        for first, last in result["id_ranges"]:
+            if summary["id_ranges"] and first == summary["id_ranges"][-1][1] + 1:
+                summary["id_ranges"][-1][1] = last
+            else:
+                summary["id_ranges"].append([first, last])
+    errors = result["errors"] if max_errors is None else result["errors"][:max(0, max_errors - len(summary["errors"]))]
+    summary["errors"].extend(errors)
+
+
+async def ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Non-blank lines of a streamed NDJSON body, without buffering the whole body"""
+    pending = b""
+    async for data in stream:
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Columns named by a comma-separated fields= parameter; raises ValueError for unknown ones"""
+    if not fields:
+        return list(DEFAULT_LIST_FIELDS)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in LIST_COLUMNS]
+    if unknown or not names:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or fields}. Use any of {', '.join(LIST_COLUMNS)}")
+    return names
+
+
+def encode_cursor(event: Any) -> str:
+    """Opaque cursor pointing just past an event (or a row with timestamp and id) in (timestamp, id) order"""
+    payload = json.dumps([event.timestamp.isoformat(), event.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Position encoded by encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def extracted_filter(condition: str):
+    """SQL condition for a "field:op:value" filter on an extracted field, e.g. "distance_km:gte:1000"
+
+    Raises ValueError for a malformed filter, an unknown field or operator, or a
+    non-numeric value for a numeric field.
+    """
+    parts = condition.split(":", 2)
+    if len(parts) != 3 or parts[1] not in EXTRACTED_FILTER_OPS:
+        raise ValueError(f"Invalid filter: {condition}. Use field:op:value with op one of {', '.join(EXTRACTED_FILTER_OPS)}")
+    name, op, value = parts
+    expression = extracted_field(name)
+    if isinstance(expression, extracted_number):
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid filter: {condition}. {name} takes a number")
+    return EXTRACTED_FILTER_OPS[op](expression, value)
+
+
+def filtered_select(
+    supplier_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    where: Optional[List[str]] = None
+) -> Select:
+    """Carbon events matching the API's supplier, date and extracted-field filters, in (timestamp, id) order"""
+    statement = select(CarbonEvent)
+
+    if supplier_id:
+        statement = statement.where(CarbonEvent.supplier_id == supplier_id)
+
+    if start_date:
+        statement = statement.where(CarbonEvent.timestamp >= start_date)
+
+    if end_date:
+        statement = statement.where(CarbonEvent.timestamp <= end_date)
+
+    for condition in where or []:
+        statement = statement.where(extracted_filter(condition))
+
+    return statement.order_by(CarbonEvent.timestamp, CarbonEvent.id)
+
+
+class CarbonEventService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.feature_store = FeatureStore(db)
+        self.rollups = EmissionsRollupService(db)
+
+    def record_event(self, event: CarbonEvent, sign: int = 1):
+        """Apply an event write to everything derived from events (sign=-1 removes it)
+
+        Call in the write's transaction before it is flushed: before adding a new
+        event, and with sign=-1 before updating or deleting one.
+        """
+        self.feature_store.record_event(event, sign)
+        self.rollups.record_event(event, sign)
+
+    def record_events(self, events: List[CarbonEvent], sign: int = 1):
+        """record_event for many events, with one feature update per scope and day and one rollup statement per table"""
+        self.feature_store.record_events(events, sign)
+        self.rollups.record_events(events, sign)
+
+    def ingest_batch(self, records: List[Any], offset: int = 0) -> Dict[str, Any]:
+        """Validate and insert one chunk of events in a single transaction
+
+        records are event dicts or raw NDJSON lines; offset is the position of the
+        first record in the whole upload, used to number per-row errors. Invalid
+        rows are reported and skipped, and a failed insert only fails its chunk.
+        id_ranges holds the inserted events' ids as [first, last] runs.
+        """
+        rows, errors = [], []
+        for index, record in enumerate(records, start=offset):
+            try:
+                if isinstance(record, bytes):
+                    record = json.loads(record)
+                event = CarbonEventCreate.model_validate(record)
+            except ValidationError as e:
+                errors.append({"index": index, "errors": e.errors(include_url=False, include_context=False, include_input=False)})
+                continue
+            except ValueError as e:
+                errors.append({"index": index, "errors": f"Invalid JSON: {str(e)}"})
+                continue
+            values = event.model_dump()
+            rows.append(values)
+
+        ids = []
+        if rows:
+            try:
+                self.record_events([CarbonEvent(**values) for values in rows])
+                ids = self.db.execute(insert(CarbonEvent).returning(CarbonEvent.id), rows).scalars().all()
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                # Derived rows cached by this service were rolled back with the chunk
+                self.feature_store = FeatureStore(self.db)
+                errors.append({"index": offset, "count": len(records), "errors": f"Chunk insert failed: {str(e)}"})
+                rows, ids = [], []
+
+        return {"received": len(records), "inserted": len(rows), "errors": errors, "id_ranges": id_ranges(ids)}
+
+    def ingest(
+        self,
+        records: Iterable[Any],
+        max_errors: Optional[int] = None,
+        on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Insert an iterable of events chunk by chunk, committing every BULK_INSERT_CHUNK_ROWS rows
+
+        Records are pulled lazily, so a streamed source is held one chunk at a time;
+        max_errors caps how many row errors are kept (the rest are only counted).
+        on_chunk is called with the running summary after each chunk is committed.
+        The summary's id_ranges hold every inserted event's id as [first, last] runs.
+        """
+        summary = {"received": 0, "inserted": 0, "failed": 0, "errors": [], "id_ranges": []}
+        for chunk in chunked(records, settings.BULK_INSERT_CHUNK_ROWS):
+            _merge_batch(summary, self.ingest_batch(chunk, offset=summary["received"]), max_errors)
+            summary["failed"] = summary["received"] - summary["inserted"]
+            if on_chunk is not None:
+                on_chunk(summary)
+        return summary
+
+
+class AsyncCarbonEventService:
+    """Carbon event reads and writes for async endpoints, on an AsyncSession
+
+    Event queries are awaited directly. Writes still go through CarbonEventService
+    for the feature store and rollups, via run_sync, which drives that sync code
+    on the session's own connection without blocking the event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_events(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        supplier_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        where: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of events as dicts of the requested fields, and the next page's cursor (None on the last page)
+
+        Only the requested columns are selected (plus timestamp and id for the
+        cursor), and rows become dicts directly, without ORM objects or response
+        models. With a cursor the page starts right after the cursor's
+        (timestamp, id) via the composite index, so every page costs the same
+        however deep it is; skip is only applied without one.
+        """
+        fields = fields or DEFAULT_LIST_FIELDS
+        columns = [LIST_COLUMNS[name] for name in dict.fromkeys([*fields, "timestamp", "id"])]
+        statement = filtered_select(supplier_id, start_date, end_date, where).with_only_columns(*columns)
+        if cursor:
+            statement = statement.where(tuple_(CarbonEvent.timestamp, CarbonEvent.id) > decode_cursor(cursor))
+        elif skip:
+            statement = statement.offset(skip)
+
+        # Fetch one extra row to know whether another page follows
+        rows = (await self.db.execute(statement.limit(limit + 1))).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1])
+        return [dict(zip(fields, row)) for row in rows], next_cursor
+
+    async def get_scope_version(
+        self,
+        supplier_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        where: Optional[List[str]] = None
+    ) -> Any:
+        """Version that changes whenever an event matching the filters is added, edited or removed
+
+        Read from the supplier's (or all events') version counter by primary key, so
+        it costs the same however many events match; date and extracted-field
+        filters share their supplier's version. Raises ValueError for a bad filter.
+        """
+        for condition in where or []:
+            extracted_filter(condition)
+        return await self.db.run_sync(lambda session: EmissionsRollupService(session).get_scope_version(supplier_id))
+
+    async def summarise_extracted(
+        self,
+        field: Optional[str] = None,
+        group_by: Optional[str] = None,
+        where: Optional[List[str]] = None,
+        supplier_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Event counts and emissions, plus a numeric extracted field's totals, per group
+
+        Grouping, filtering and aggregation all run in the database on the indexed
+        extracted-field expressions. With a field, only events that report it count.
+        """
+        columns = [
+            func.count(CarbonEvent.id).label("event_count"),
+            func.sum(CarbonEvent.emissions_kg_co2e).label("emissions_kg_co2e")
+        ]
+        statement = filtered_select(supplier_id, start_date, end_date, where).order_by(None)
+        if field:
+            value = extracted_field(field)
+            if not isinstance(value, extracted_number):
+                raise ValueError(f"{field} is not a numeric field")
+            columns += [
+                func.sum(value).label("total"),
+                func.avg(value).label("average"),
+                func.min(value).label("min"),
+                func.max(value).label("max")
+            ]
+            statement = statement.where(value.isnot(None))
+        if group_by:
+            group = SUMMARY_GROUP_COLUMNS[group_by] if group_by in SUMMARY_GROUP_COLUMNS else extracted_field(group_by)
+            statement = statement.with_only_columns(group.label("group"), *columns).group_by(group).order_by(group)
+        else:
+            statement = statement.with_only_columns(*columns)
+
+        rows = (await self.db.execute(statement)).mappings().all()
+        return {
+            "field": field,
+            "group_by": group_by,
+            "groups": [dict(row) for row in rows if row["event_count"]]
+        }
+
+    async def get_event(self, event_id: int) -> Optional[CarbonEvent]:
+        return await self.db.get(CarbonEvent, event_id)
+
+    async def create_event(self, values: Dict[str, Any]) -> CarbonEvent:
+        event = CarbonEvent(**values)
+        await self.db.run_sync(lambda session: CarbonEventService(session).record_event(event))
+        self.db.add(event)
+        await self.db.commit()
+        await self.db.refresh(event)
+        return event
+
+    async def update_event(self, event: CarbonEvent, changes: Dict[str, Any]) -> CarbonEvent:
+        def apply(session: Session):
+            # Swap the event's old values for its new ones in the features and rollups
+            service = CarbonEventService(session)
+            service.record_event(event, sign=-1)
+            for field, value in changes.items():
+                setattr(event, field, value)
+            service.record_event(event)
+
+        await self.db.run_sync(apply)
+        await self.db.commit()
+        await self.db.refresh(event)
+        return event
+
+    async def delete_event(self, event: CarbonEvent):
+        await self.db.run_sync(lambda session: CarbonEventService(session).record_event(event, sign=-1))
+        await self.db.delete(event)
+        await self.db.commit()
+
+    async def ingest(self, records: Union[Iterable[Any], AsyncIterator[Any]]) -> Dict[str, Any]:
+        """Insert a list or stream of events chunk by chunk, committing every BULK_INSERT_CHUNK_ROWS rows"""
+        summary = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+
+        async def flush(chunk: List[Any]):
+            offset = summary["received"]
+            _merge_batch(summary, await self.db.run_sync(
+                lambda session: CarbonEventService(session).ingest_batch(chunk, offset)
+            ))
+
+        chunk = []
+        if not hasattr(records, "__aiter__"):
+            records = _iterate(records)
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= settings.BULK_INSERT_CHUNK_ROWS:
+                await flush(chunk)
+                chunk = []
+        if chunk:
+            await flush(chunk)
+
+        summary["failed"] = summary["received"] - summary["inserted"]
+        return summary
+
+
+async def export_carbon_events(
+    export_format: str,
+    supplier_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> AsyncIterator[bytes]:
+    """Stream matching events as NDJSON, CSV or Arrow IPC, one chunk of rows at a time
+
+    Rows come from a server-side cursor (yield_per) as plain tuples, so memory
+    stays at one chunk however many rows are exported. The generator owns its
+    session because it keeps running after the request handler has returned.
+    JSON documents are objects in NDJSON and JSON text in CSV and Arrow.
+    """
+    async with AsyncSessionLocal() as db:
+        columns = EXPORT_CSV_COLUMNS if export_format == "csv" else EXPORT_COLUMNS
+        statement = filtered_select(supplier_id, start_date, end_date).with_only_columns(*columns)
+        rows = await db.stream(statement.execution_options(yield_per=settings.EXPORT_CHUNK_ROWS))
+        names = [column.name for column in EXPORT_COLUMNS]
+
+        if export_format == "arrow":
+            sink = io.BytesIO()
+            with pa.ipc.new_stream(sink, EXPORT_ARROW_SCHEMA) as writer:
+                async for chunk in rows.partitions():
+                    writer.write_batch(pa.record_batch(_arrow_columns(chunk), schema=EXPORT_ARROW_SCHEMA))
+                    yield sink.getvalue()
+                    sink.seek(0)
+                    sink.truncate()
+            yield sink.getvalue()  # End-of-stream marker
+        elif export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            async for chunk in rows.partitions():
+                writer.writerows(chunk)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()  # Header alone when nothing matched
+        else:
+            async for chunk in rows.partitions():
+                yield "".join(
+                    json.dumps({name: _json_value(value) for name, value in zip(names, row)}) + "\n"
+                    for row in chunk
+                ).encode()
@@ -0,0 +1,192 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Callable, Iterable, Tuple
+import multiprocessing
+import re
+import threading
+
+import pdfplumber
+
+from app.core.config import settings
+
+NUMBER = r"(\d[\d,]*(?:\.\d+)?)"
+# Each field's pattern captures a number and, where it has one, a unit; units
+# are converted to the field's base unit (litres, km, kWh, kg, kg CO2e)
+FIELD_PATTERNS = {
+    "calculated_emissions": (
+        rf"{NUMBER}\s*(kg|kilograms?|t|tonnes?|metric\s+tons?)\s*(?:of\s+)?co2\s*-?e?\b",
+        {"t": 1000.0, "tonne": 1000.0, "tonnes": 1000.0, "metric ton": 1000.0, "metric tons": 1000.0}
+    ),
+    "energy_consumption": (
+        rf"{NUMBER}\s*(kwh|mwh)\b",
+        {"mwh": 1000.0}
+    ),
+    "fuel_consumption": (
+        rf"(?:fuel|diesel|gasoline|petrol)[^\d\n]{{0,40}}{NUMBER}\s*(l|litres?|liters?|gal|gallons?)\b",
+        {"gal": 3.78541, "gallon": 3.78541, "gallons": 3.78541}
+    ),
+    "distance_km": (
+        rf"{NUMBER}\s*(km|kilomet(?:er|re)s?|mi|miles?)\b",
+        {"mi": 1.60934, "mile": 1.60934, "miles": 1.60934}
+    ),
+    "waste_generated": (
+        rf"waste[^\d\n]{{0,40}}{NUMBER}\s*(kg|kilograms?|t|tonnes?)\b",
+        {"t": 1000.0, "tonne": 1000.0, "tonnes": 1000.0}
+    ),
+    "emission_factor": (
+        rf"emission\s+factor[^\d\n]{{0,40}}{NUMBER}()",
+        {}
+    ),
+    "total_amount": (
+        rf"(?:total(?:\s+amount)?(?:\s+due)?|amount\s+due)\s*:?\s*(?:[$€£]|usd|eur|gbp)\s*{NUMBER}()",
+        {}
+    ),
+}
+_COMPILED_PATTERNS = {field: (re.compile(pattern, re.IGNORECASE), units) for field, (pattern, units) in FIELD_PATTERNS.items()}
+# kg CO2e per unit of activity, used when a document states its activity but not its emissions:
+# diesel per litre, and an average grid factor per kWh
+DEFAULT_EMISSION_FACTORS = {"fuel_consumption": 2.31, "energy_consumption": 0.4}
+
+
+def find_fields(lines: Iterable[str]) -> Dict[str, float]:
+    """First value of each known field in a run of text lines, in base units"""
+    found: Dict[str, float] = {}
+    for line in lines:
+        for field, (pattern, units) in _COMPILED_PATTERNS.items():
+            if field in found:
+                continue
+            match = pattern.search(line)
+            if match:
+                unit = re.sub(r"\s+", " ", match.group(2).lower())
+                found[field] = float(match.group(1).replace(",", "")) * units.get(unit, 1.0)
+    return found
+
+
+def _table_lines(tables: List[List[List[Optional[str]]]]) -> List[str]:
+    # A table row such as ["Electricity", "12,400", "kWh"] reads as one line of text
+    return [" ".join(cell for cell in row if cell) for table in tables for row in table]
+
+
+def extract_page_range(path: str, first: int, last: int) -> Dict[str, Any]:
+    """Text, tables and fields of pages [first, last) of a PDF, run in a worker process
+
+    Only the fields found are sent back, not the page text, so little crosses the
+    process boundary however large the pages are.
+    """
+    pages = []
+    with pdfplumber.open(path, pages=list(range(first + 1, last + 1))) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            tables = page.extract_tables()
+            pages.append({
+                "fields": find_fields(text.splitlines() + _table_lines(tables)),
+                "has_text": bool(text.strip()),
+                "tables": len(tables)
+            })
+            page.close()  # Drop the page's parsed layout before the next one
+    return {"first": first, "pages": pages}
+
+
+def summarise_fields(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-page fields in page order into extracted_data with a confidence_score
+
+    Each field takes its first value in the document. When the document states
+    no emissions they are estimated from its activity and emission factor (or a
+    default factor), at lower confidence. The score also scales with the share of
+    pages that had extractable text, so scanned documents score low.
+    """
+    extracted: Dict[str, Any] = {}
+    for page in pages:
+        for field, value in page["fields"].items():
+            extracted.setdefault(field, value)
+
+    stated = "calculated_emissions" in extracted
+    if not stated:
+        for field, default_factor in DEFAULT_EMISSION_FACTORS.items():
+            if field in extracted:
+                extracted.setdefault("emission_factor", default_factor)
+                extracted["calculated_emissions"] = round(extracted[field] * extracted["emission_factor"], 3)
+                break
+
+    text_coverage = sum(1 for page in pages if page["has_text"]) / len(pages) if pages else 0.0
+    field_share = len(extracted) / len(FIELD_PATTERNS)
+    if stated:
+        confidence = 0.6 + 0.4 * field_share
+    elif "calculated_emissions" in extracted:
+        confidence = 0.4 + 0.3 * field_share
+    else:
+        confidence = 0.3 * field_share
+    return {
+        "extracted_data": extracted,
+        "confidence_score": round(min(1.0, confidence) * text_coverage, 2),
+        "pages": len(pages),
+        "tables": sum(page["tables"] for page in pages)
+    }
+
+
+def extract_text(text: str) -> Dict[str, Any]:
+    """extracted_data and confidence_score of a plain text document"""
+    return summarise_fields([{"fields": find_fields(text.splitlines()), "has_text": bool(text.strip()), "tables": 0}])
+
+
+def page_ranges(page_count: int, pages_per_task: int) -> List[Tuple[int, int]]:
+    return [(first, min(first + pages_per_task, page_count)) for first in range(0, page_count, pages_per_task)]
+
+
+class PdfExtractionPool:
+    """Extracts PDFs on a process pool, a range of pages per task
+
+    The pool size bounds how many pages are parsed at once across every upload;
+    a large document is spread over all workers, and many small ones share them.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, pages_per_task: int = 10):
+        self.max_workers = max_workers
+        self.pages_per_task = pages_per_task
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Created lazily so importing the app never spawns worker processes
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def extract(self, path: str, on_pages: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Extract a PDF and merge its pages; on_pages(done, total) is called as ranges finish
+
+        Blocks until every range is done, so call it from a worker thread.
+        """
+        with pdfplumber.open(path) as pdf:
+            page_count = len(pdf.pages)
+        if on_pages is not None:
+            on_pages(0, page_count)
+
+        futures = [
+            self.executor.submit(extract_page_range, path, first, last)
+            for first, last in page_ranges(page_count, self.pages_per_task)
+        ]
+        ranges, done = [], 0
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                ranges.append(result)
+                done += len(result["pages"])
+                if on_pages is not None:
+                    on_pages(done, page_count)
+        finally:
+            for future in futures:
+                future.cancel()  # A failed range fails the document; skip its pending ranges
+
+        pages = [page for result in sorted(ranges, key=lambda result: result["first"]) for page in result["pages"]]
+        return summarise_fields(pages)
+
+
+pdf_extraction = PdfExtractionPool(
+    max_workers=settings.PDF_EXTRACTION_WORKERS,
+    pages_per_task=settings.PDF_PAGES_PER_TASK
+)
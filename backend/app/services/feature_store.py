@@ -0,0 +1,282 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+import numpy as np
+import pandas as pd
+import json
+
+from app.models.carbon_event import CarbonEvent
+from app.models.forecast_feature import ForecastFeature
+from app.services.model_registry import model_key_for
+
+# Days of daily totals kept for the rolling and lag features, ending at the latest event day
+RECENT_WINDOW_DAYS = 28
+# Column order of the history features appended to the calendar features
+FEATURE_NAMES = ("recent_avg", "recent_trend", "volatility", "lag_1", "lag_7", "weekday_avg")
+
+
+def summarise_window(
+    offsets: np.ndarray,
+    sums: np.ndarray,
+    counts: np.ndarray,
+    weekday_sums: np.ndarray,
+    weekday_counts: np.ndarray
+) -> Dict[str, Any]:
+    """Rolling, lag and seasonal features from the recent window's daily totals
+
+    offsets are each day's distance from the latest day in the window (0 for the
+    latest day, -27 for the oldest), so lag_1 is the latest day's mean and lag_7
+    the mean six days before it; missing lag days fall back to the window mean.
+    """
+    means = sums / counts
+    recent_avg = float(sums.sum() / counts.sum())
+    if len(offsets) > 1:
+        centred = offsets - offsets.mean()
+        recent_trend = float(np.dot(centred, means - means.mean()) / np.dot(centred, centred))
+        volatility = float(means.std())
+    else:
+        recent_trend = volatility = 0.0
+
+    def lag(days: int) -> float:
+        match = offsets == -(days - 1)
+        return float(means[match][0]) if match.any() else recent_avg
+
+    overall_avg = weekday_sums.sum() / weekday_counts.sum() if weekday_counts.sum() else recent_avg
+    weekday_means = np.where(weekday_counts > 0, weekday_sums / np.maximum(weekday_counts, 1), overall_avg)
+    return {
+        "recent_avg": recent_avg,
+        "recent_trend": recent_trend,
+        "volatility": volatility,
+        "lag_1": lag(1),
+        "lag_7": lag(7),
+        "weekday_means": weekday_means.tolist()
+    }
+
+
+def _feature_rows(features: Dict[str, Any], weekdays: np.ndarray) -> np.ndarray:
+    constant = [features[name] for name in FEATURE_NAMES[:-1]]
+    weekday_avg = np.asarray(features["weekday_means"])[weekdays]
+    return np.column_stack([np.tile(constant, (len(weekdays), 1)), weekday_avg])
+
+
+def forecast_feature_matrix(future_dates: pd.DatetimeIndex, features: Dict[str, Any]) -> np.ndarray:
+    """History features for each future date, as of the scope's latest event day"""
+    return _feature_rows(features, np.asarray(future_dates.dayofweek))
+
+
+def history_feature_matrix(days: pd.DatetimeIndex, means: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """History features for each training day, using only the days before it
+
+    Each row is exactly what the feature store would have served on the previous
+    event day. The first day has no history and its row is all NaN.
+    """
+    sums = means * counts
+    day_numbers = days.values.astype("datetime64[D]").astype(np.int64)
+    weekdays = np.asarray(days.dayofweek)
+    weekday_sums, weekday_counts = np.zeros(7), np.zeros(7)
+
+    X = np.full((len(days), len(FEATURE_NAMES)), np.nan)
+    for i in range(1, len(days)):
+        weekday_sums[weekdays[i - 1]] += sums[i - 1]
+        weekday_counts[weekdays[i - 1]] += counts[i - 1]
+        anchor = day_numbers[i - 1]
+        start = np.searchsorted(day_numbers, anchor - RECENT_WINDOW_DAYS + 1)
+        features = summarise_window(
+            day_numbers[start:i] - anchor, sums[start:i], counts[start:i], weekday_sums, weekday_counts
+        )
+        X[i] = _feature_rows(features, weekdays[i:i + 1])[0]
+    return X
+
+
+class FeatureStore:
+    """Per supplier/product forecasting features, kept current as carbon events are written
+
+    Each scope (supplier+product, supplier, and all suppliers) has one row holding
+    running totals, so writes and reads cost O(1) instead of a scan of the events.
+    Writers lock the rows they change until their transaction ends, so concurrent
+    ingests add to each other's totals instead of overwriting them.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._rows: Dict[str, ForecastFeature] = {}
+
+    def record_event(self, event: CarbonEvent, sign: int = 1):
+        """Add an event to the features of every scope it belongs to (sign=-1 removes it)
+
+        Call in the same transaction as the event write, before that write is
+        flushed: before adding a new event, and before updating or deleting one
+        (with sign=-1) so its previous values can be taken out.
+        """
+        self.record_events([event], sign)
+
+    def record_events(self, events: List[CarbonEvent], sign: int = 1):
+        """record_event for many events, applying each scope's day and event type totals once"""
+        daily: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+        by_type: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+        for event in events:
+            if event.timestamp is None or event.emissions_kg_co2e is None:
+                continue
+            scopes = [(event.supplier_id, None), (None, None)]
+            if event.product_id:
+                scopes.insert(0, (event.supplier_id, event.product_id))
+            emissions = sign * float(event.emissions_kg_co2e)
+            for scope in scopes:
+                daily[scope + (event.timestamp.date(),)][0] += emissions
+                daily[scope + (event.timestamp.date(),)][1] += sign
+                by_type[scope + (event.event_type,)][0] += emissions
+                by_type[scope + (event.event_type,)][1] += sign
+
+        if not daily:
+            return
+        rows = self._lock_rows({key[:2] for key in daily})
+        for (supplier_id, product_id, day), (emissions, count) in daily.items():
+            self._apply(rows[model_key_for(supplier_id, product_id)], day, emissions, count)
+        for (supplier_id, product_id, event_type), (emissions, count) in by_type.items():
+            self._apply_event_type(rows[model_key_for(supplier_id, product_id)], event_type, emissions, count)
+
+    def get_features(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Current features of a scope from its feature row; empty if it has no events"""
+        return self._summarise(self.get_scope(supplier_id, product_id))
+
+    def get_scope(self, supplier_id: Optional[str], product_id: Optional[str]) -> ForecastFeature:
+        """A scope's feature row, seeding and saving it first if the scope has none yet"""
+        scope_key = model_key_for(supplier_id, product_id)
+        row = self._rows.get(scope_key) or self._query(scope_key).first()
+        if row is None:
+            # Scope predates the store (or is new): seed it from the events already written
+            if self._seed(scope_key, supplier_id, product_id):
+                self.db.commit()
+            row = self._query(scope_key).one()
+        self._rows[scope_key] = row
+        return row
+
+    def get_many(self, supplier_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Features for several suppliers (all products) with one lookup"""
+        keys = {model_key_for(supplier_id, None): supplier_id for supplier_id in supplier_ids}
+        for row in self.db.query(ForecastFeature).filter(ForecastFeature.scope_key.in_(list(keys))):
+            self._rows[row.scope_key] = row
+        return {supplier_id: self.get_features(supplier_id, None) for supplier_id in supplier_ids}
+
+    def _query(self, scope_key: str):
+        return self.db.query(ForecastFeature).filter(ForecastFeature.scope_key == scope_key)
+
+    def _lock_rows(self, scopes: Iterable[Tuple[Optional[str], Optional[str]]]) -> Dict[str, ForecastFeature]:
+        """The scopes' feature rows, locked for the rest of the transaction and freshly read
+
+        Rows are locked in key order, so writers never deadlock on each other, with
+        a no-op UPDATE: a row lock on PostgreSQL and the write lock on SQLite, where
+        SELECT ... FOR UPDATE is not available. Missing rows are seeded first.
+        """
+        keys = {model_key_for(supplier_id, product_id): (supplier_id, product_id) for supplier_id, product_id in scopes}
+        for scope_key in sorted(keys):
+            touch = update(ForecastFeature).where(ForecastFeature.scope_key == scope_key).values(
+                event_count=ForecastFeature.event_count
+            ).execution_options(synchronize_session=False)
+            if not self.db.execute(touch).rowcount and not self._seed(scope_key, *keys[scope_key]):
+                # Another transaction seeded it first; wait for its lock like any other writer
+                self.db.execute(touch)
+
+        # Rows this transaction already changed are locked and current; reload the rest
+        # over anything cached, which may predate another writer's commit
+        stale = [scope_key for scope_key in keys if self._rows.get(scope_key) not in self.db.dirty]
+        if stale:
+            rows = self.db.query(ForecastFeature).filter(ForecastFeature.scope_key.in_(stale)).populate_existing()
+            for row in rows:
+                self._rows[row.scope_key] = row
+        return {scope_key: self._rows[scope_key] for scope_key in keys}
+
+    def _seed(self, scope_key: str, supplier_id: Optional[str], product_id: Optional[str]) -> bool:
+        """Insert a scope's row with the totals of the events already written
+
+        False if another transaction inserted it first; that row is kept and
+        should be read again rather than seeded twice.
+        """
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        inserted = self.db.execute(dialect_insert(ForecastFeature).values(
+            scope_key=scope_key, supplier_id=supplier_id, product_id=product_id,
+            event_count=0, emissions_sum=0.0
+        ).on_conflict_do_nothing(index_elements=["scope_key"]))
+        if not inserted.rowcount:
+            return False
+
+        day = func.date(CarbonEvent.timestamp)
+        query = self.db.query(CarbonEvent)
+        if supplier_id:
+            query = query.filter(CarbonEvent.supplier_id == supplier_id)
+        if product_id:
+            query = query.filter(CarbonEvent.product_id == product_id)
+        rows = query.with_entities(
+            day.label("day"),
+            func.sum(CarbonEvent.emissions_kg_co2e).label("emissions"),
+            func.count(CarbonEvent.id).label("events")
+        ).group_by(day).all()
+        event_types = query.with_entities(
+            CarbonEvent.event_type,
+            func.sum(CarbonEvent.emissions_kg_co2e).label("emissions"),
+            func.count(CarbonEvent.id).label("events")
+        ).group_by(CarbonEvent.event_type).all()
+
+        row = self._query(scope_key).populate_existing().one()
+        for daily in rows:
+            day_value = daily.day if isinstance(daily.day, date) else date.fromisoformat(daily.day)
+            self._apply(row, day_value, float(daily.emissions), daily.events)
+        for totals in event_types:
+            self._apply_event_type(row, totals.event_type, float(totals.emissions), totals.events)
+        self.db.flush()
+        return True
+
+    def _apply(self, row: ForecastFeature, day: date, emissions: float, events: int):
+        totals = json.loads(row.daily_totals or "{}")
+        day_sum, day_count = totals.get(day.isoformat(), [0.0, 0])
+        if day_count + events > 0:
+            totals[day.isoformat()] = [day_sum + emissions, day_count + events]
+        else:
+            totals.pop(day.isoformat(), None)
+
+        # Keep only the recent window ending at the latest day (ISO dates sort as strings)
+        if totals:
+            latest = date.fromisoformat(max(totals))
+            cutoff = (latest - timedelta(days=RECENT_WINDOW_DAYS - 1)).isoformat()
+            totals = {key: value for key, value in totals.items() if key >= cutoff}
+            row.last_event_date = latest
+        else:
+            row.last_event_date = None
+
+        weekday_sums, weekday_counts = json.loads(row.weekday_totals or "[[0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0]]")
+        weekday_sums[day.weekday()] += emissions
+        weekday_counts[day.weekday()] += events
+
+        row.daily_totals = json.dumps(totals)
+        row.weekday_totals = json.dumps([weekday_sums, weekday_counts])
+        row.event_count = (row.event_count or 0) + events
+        row.emissions_sum = (row.emissions_sum or 0.0) + emissions
+
+    def _apply_event_type(self, row: ForecastFeature, event_type: Optional[str], emissions: float, events: int):
+        totals = json.loads(row.event_type_totals or "{}")
+        type_sum, type_count = totals.get(event_type or "", [0.0, 0])
+        if type_count + events > 0:
+            totals[event_type or ""] = [type_sum + emissions, type_count + events]
+        else:
+            totals.pop(event_type or "", None)
+        row.event_type_totals = json.dumps(totals)
+
+    def _summarise(self, row: ForecastFeature) -> Dict[str, Any]:
+        totals = json.loads(row.daily_totals or "{}")
+        if not row.event_count or not totals:
+            return {}
+
+        latest = row.last_event_date
+        days = sorted(totals)
+        offsets = np.array([(date.fromisoformat(key) - latest).days for key in days], dtype=float)
+        sums = np.array([totals[key][0] for key in days], dtype=float)
+        counts = np.array([totals[key][1] for key in days], dtype=float)
+        weekday_sums, weekday_counts = (np.asarray(values, dtype=float) for values in json.loads(row.weekday_totals))
+        return {
+            **summarise_window(offsets, sums, counts, weekday_sums, weekday_counts),
+            "event_count": row.event_count,
+            "as_of": latest
+        }
@@ -1,166 +1,704 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from statistics import NormalDist
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy import func, insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
-import joblib
 import os
 
+from app.core.config import settings
 from app.models.carbon_event import CarbonEvent
-from app.schemas.forecast import ForecastResponse, ForecastDataPoint
+from app.models.event_scope_version import EventScopeVersion, scope_version_key
+from app.models.forecast import Forecast
+from app.schemas.forecast import (
+    ForecastResponse, ForecastDataPoint, PortfolioForecastResponse, SupplierForecast
+)
+from app.services.feature_store import FeatureStore, forecast_feature_matrix, history_feature_matrix
+from app.services.supplier_index import supplier_index, supplier_profile
+from app.services.model_registry import (
+    ModelArtifact, GLOBAL_MODEL_KEY, MODEL_FILE_PREFIX, model_key_for, model_registry
+)
+from app.services.rollup_service import EmissionsRollupService
+from app.services.training_jobs import training_jobs
+
+# Minimum number of events in the training window before a dedicated model is fitted
+MIN_TRAINING_EVENTS = 30
+# Minimum days of history before a backtest fold's origin for the fold to be scored
+MIN_BACKTEST_TRAINING_DAYS = 14
+# Two full weeks are needed to initialise the smoothing engine's weekly season
+MIN_SMOOTHING_DAYS = 14
+
+ENGINE_AUTO = "auto"
+ENGINE_RANDOM_FOREST = "random_forest"
+ENGINE_EXPONENTIAL_SMOOTHING = "exponential_smoothing"
+
+
+def calendar_features(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Calendar features shared by training and prediction"""
+    return np.column_stack([
+        dates.dayofweek,
+        dates.month,
+        dates.year,
+        dates.dayofyear
+    ])
+
+
+class ForecastEngine:
+    """Interface implemented by every forecast backend"""
+    name: str = ""
+    
+    def forecast(
+        self,
+        future_dates: pd.DatetimeIndex,
+        confidence_level: float,
+        features: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """Point forecast and interval bounds per date as 'predicted', 'lower' and 'upper' arrays"""
+        raise NotImplementedError
+
+
+class RandomForestEngine(ForecastEngine):
+    """Serves a trained RandomForest from the model registry"""
+    name = ENGINE_RANDOM_FOREST
+    
+    def __init__(self, model: RandomForestRegressor, scaler: StandardScaler):
+        self.model = model
+        self.scaler = scaler
+    
+    def forecast(self, future_dates: pd.DatetimeIndex, confidence_level: float, features: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        future_features = self.create_features(future_dates, features)
+        tree_predictions = self.predict_trees(self.scaler.transform(future_features))
+        predictions = np.maximum(tree_predictions.mean(axis=0), 0)  # Ensure non-negative emissions
+        
+        # Calculate confidence intervals from the spread of the trees' predictions
+        tail = (1 - confidence_level) / 2
+        lower, upper = np.quantile(tree_predictions, [tail, 1 - tail], axis=0)
+        
+        # Keep the point forecast inside its interval and emissions non-negative
+        return {
+            'predicted': predictions,
+            'lower': np.maximum(np.minimum(lower, predictions), 0),
+            'upper': np.maximum(upper, predictions)
+        }
+    
+    def create_features(self, future_dates: pd.DatetimeIndex, features: Dict[str, Any]) -> np.ndarray:
+        """Create the feature matrix for a range of future dates (one row per date)"""
+        return np.column_stack([calendar_features(future_dates), forecast_feature_matrix(future_dates, features)])
+    
+    def predict_trees(self, X: np.ndarray) -> np.ndarray:
+        """Predictions of every tree in the forest as one (trees x horizon) matrix
+        
+        The forest's own predict is the mean of exactly these rows, so taking the
+        point forecast from this matrix makes the intervals cost nothing extra.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return np.stack([tree.predict(X, check_input=False) for tree in self.model.estimators_])
+
+
+class NeighborPoolEngine(ForecastEngine):
+    """Cold-start forecast blending similar suppliers' forests, rescaled to the cold supplier
+    
+    members are (engine, the neighbour's own features, similarity weight, scale)
+    where scale is the cold supplier's mean event emissions over the neighbour's.
+    """
+    name = ENGINE_RANDOM_FOREST
+    
+    def __init__(self, members: List[Tuple[RandomForestEngine, Dict[str, Any], float, float]], supplier_ids: List[str]):
+        self.members = members
+        self.supplier_ids = supplier_ids
+    
+    def forecast(self, future_dates: pd.DatetimeIndex, confidence_level: float, features: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        total_weight = sum(weight for _, _, weight, _ in self.members)
+        pooled = {key: np.zeros(len(future_dates)) for key in ('predicted', 'lower', 'upper')}
+        for engine, member_features, weight, scale in self.members:
+            member_forecast = engine.forecast(future_dates, confidence_level, member_features)
+            for key in pooled:
+                pooled[key] += (weight / total_weight) * scale * member_forecast[key]
+        return pooled
+
+
+class ExponentialSmoothingEngine(ForecastEngine):
+    """Damped additive Holt-Winters with a weekly season, fitted per request in NumPy
+    
+    Smoothing parameters are chosen by one-step-ahead SSE over a small grid; the
+    recursion runs once over the series with every grid point evaluated as a
+    vector, so fitting takes milliseconds and nothing needs to be stored.
+    """
+    name = ENGINE_EXPONENTIAL_SMOOTHING
+    model_version = "ets-v1"
+    season_length = 7
+    damping = 0.98
+    alphas = (0.05, 0.1, 0.2, 0.4, 0.7)
+    betas = (0.0, 0.01, 0.05, 0.15)
+    gammas = (0.0, 0.05, 0.15, 0.3)
+    
+    def fit(self, days: pd.DatetimeIndex, y: np.ndarray) -> "ExponentialSmoothingEngine":
+        return self.fit_batch([(days, y)])
+    
+    def fit_batch(self, histories: List[Tuple[pd.DatetimeIndex, np.ndarray]]) -> "ExponentialSmoothingEngine":
+        """Fit many daily series at once as a (series x grid) state matrix
+        
+        Series are laid on one shared calendar; each starts updating at its own
+        first day, so the recursion runs once for the whole batch.
+        """
+        ordinals = [days.values.astype("datetime64[D]").astype(np.int64) for days, _ in histories]
+        self.start = min(int(o[0]) for o in ordinals)
+        self.end = max(int(o[-1]) for o in ordinals)
+        n_series, n_days = len(histories), self.end - self.start + 1
+        
+        m = self.season_length
+        if any(o[-1] - o[0] + 1 < 2 * m for o in ordinals):
+            m = 1  # Too short to initialise a weekly season
+        gammas = self.gammas if m > 1 else (0.0,)
+        alpha, beta, gamma = (
+            grid.ravel() for grid in np.meshgrid(self.alphas, self.betas, gammas, indexing="ij")
+        )
+        phi = self.damping
+        
+        # Regular daily series; days without events are interpolated only to seed the
+        # first season and are otherwise skipped (the state just rolls forward), since
+        # filled values would leak the next observation into the fit
+        values = np.zeros((n_series, n_days))
+        observed = np.zeros((n_series, n_days), dtype=bool)
+        first = np.empty(n_series, dtype=np.int64)
+        self.last = np.empty(n_series, dtype=np.int64)
+        level = np.empty((n_series, 1))
+        trend = np.zeros((n_series, 1))
+        season = np.zeros((n_series, 1, m))
+        for i, (o, (_, y)) in enumerate(zip(ordinals, histories)):
+            series = np.interp(np.arange(o[0], o[-1] + 1), o, y)
+            offset = int(o[0]) - self.start
+            values[i, offset:offset + len(series)] = series
+            observed[i, o - self.start] = True
+            first[i], self.last[i] = offset, o[-1]
+            
+            level[i] = series[:m].mean()
+            if len(series) >= 2 * m:
+                trend[i] = (series[m:2 * m].mean() - level[i]) / m
+            season[i, 0, (offset + np.arange(m)) % m] = series[:m] - level[i]
+        
+        level = np.repeat(level, len(alpha), axis=1)
+        trend = np.repeat(trend, len(alpha), axis=1)
+        season = np.repeat(season, len(alpha), axis=1)
+        sse = np.zeros(level.shape)
+        
+        for t in range(n_days):
+            obs = observed[:, t, None]
+            started = (first <= t)[:, None]
+            value = values[:, t, None]
+            s = season[:, :, t % m]
+            damped = level + phi * trend
+            
+            sse += np.where(obs, (value - damped - s) ** 2, 0)
+            new_level = alpha * (value - s) + (1 - alpha) * damped
+            new_trend = beta * (new_level - level) + (1 - beta) * phi * trend
+            season[:, :, t % m] = np.where(obs, gamma * (value - new_level) + (1 - gamma) * s, s)
+            level = np.where(obs, new_level, np.where(started, damped, level))
+            trend = np.where(obs, new_trend, np.where(started, phi * trend, trend))
+        
+        best = np.argmin(sse, axis=1)
+        rows = np.arange(n_series)
+        self.m = m
+        self.alpha = alpha[best]
+        self.level = level[rows, best]
+        self.trend = trend[rows, best]
+        self.season = season[rows, best]
+        self.sigma = np.sqrt(sse[rows, best] / observed.sum(axis=1))
+        return self
+    
+    def forecast(self, future_dates: pd.DatetimeIndex, confidence_level: float, features: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        return {key: values[0] for key, values in self.forecast_batch(future_dates, confidence_level).items()}
+    
+    def forecast_batch(self, future_dates: pd.DatetimeIndex, confidence_level: float) -> Dict[str, np.ndarray]:
+        """Forecast every fitted series as (series x horizon) matrices"""
+        ordinals = future_dates.normalize().values.astype("datetime64[D]").astype(np.int64)
+        
+        # Level and trend were rolled forward to the batch's last day; dates up to it
+        # get the fitted level, and every date keeps the season slot of its own weekday
+        steps = np.maximum(ordinals - self.end, 0)
+        phi = self.damping
+        damped_trend = np.outer(self.trend, phi * (1 - phi ** steps) / (1 - phi))
+        predictions = self.level[:, None] + damped_trend + self.season[:, (ordinals - self.start) % self.m]
+        
+        # Simple-smoothing variance growth from each series' own last observation;
+        # trend and season terms are ignored
+        z_score = NormalDist().inv_cdf(0.5 + confidence_level / 2)
+        horizon = np.maximum(ordinals[None, :] - self.last[:, None], 1)
+        spread = z_score * self.sigma[:, None] * np.sqrt(1 + (horizon - 1) * self.alpha[:, None] ** 2)
+        
+        predictions = np.maximum(predictions, 0)
+        return {
+            'predicted': predictions,
+            'lower': np.maximum(predictions - spread, 0),
+            'upper': predictions + spread
+        }
+
 
 class ForecastService:
     def __init__(self, db: Session):
         self.db = db
-        self.model_cache_dir = "models"
+        self.model_cache_dir = settings.MODEL_CACHE_DIR
+        self.registry = model_registry
+        self.training_jobs = training_jobs
         self.scaler = StandardScaler()
         self.model = None
+        self.model_key = None
+        self.model_version = None
         
-    async def generate_forecast(
+    def generate_forecast(
         self,
         supplier_id: Optional[str] = None,
         product_id: Optional[str] = None,
         forecast_horizon_days: int = 90,
-        confidence_level: float = 0.95
+        confidence_level: float = 0.95,
+        use_materialized: bool = True,
+        engine: str = ENGINE_AUTO
     ) -> ForecastResponse:
         """Generate emissions forecast using ML models"""
         
-        # Load or train model
-        await self._load_or_train_model(supplier_id, product_id)
-        
-        # Prepare features for forecasting
-        features = await self._prepare_forecast_features(supplier_id, product_id)
-        
-        # Generate predictions
-        predictions = []
-        dates = []
-        
-        for i in range(forecast_horizon_days):
-            future_date = datetime.now() + timedelta(days=i)
-            dates.append(future_date)
-            
-            # Create feature vector for future date
-            future_features = self._create_future_features(future_date, features)
-            
-            # Make prediction
-            prediction = self.model.predict([future_features])[0]
-            predictions.append(max(0, prediction))  # Ensure non-negative emissions
+        # Serve the stored forecast when neither the model nor its data changed; stored
+        # forecasts are tagged with the engine requested, so a hit needs no history
+        data_version = self._data_version(supplier_id)
+        stored_version = f"{data_version}:{engine}"
+        if use_materialized:
+            try:
+                materialized = self._load_materialized_forecast(
+                    supplier_id, product_id, forecast_horizon_days, confidence_level, stored_version
+                )
+            except SQLAlchemyError:
+                # A forecasts table the schema upgrade has not reached yet; forecast afresh
+                self.db.rollback()
+                materialized = None
+            if materialized is not None:
+                return materialized
+        
+        engine_name = self._resolve_engine(engine, self._active_days(supplier_id, product_id, data_version))
+        
+        # Fit the smoothing engine on the fly, or load or train the forest
+        if engine_name == ENGINE_EXPONENTIAL_SMOOTHING:
+            forecast_engine = ExponentialSmoothingEngine().fit(
+                *self._load_daily_training_data(self._training_query(supplier_id, product_id))[:2]
+            )
+            self.model_key = None
+            self.model_version = ExponentialSmoothingEngine.model_version
+            model_status = {"fallback_model": False, "training_job_id": None}
+        else:
+            model_status = self._load_or_train_model(supplier_id, product_id)
+            forecast_engine = RandomForestEngine(self.model, self.scaler)
+            if model_status["fallback_model"] and not product_id:
+                supplier_index.refresh(self.db)
+                pooled_engine = self._cold_start_engine(supplier_id, FeatureStore(self.db))
+                if pooled_engine is not None:
+                    forecast_engine = pooled_engine
+                    model_status["similar_suppliers"] = pooled_engine.supplier_ids
+                    self.model_key = None  # Pooled forecasts have no single backtested model
+        
+        # Prepare features for forecasting; a fallback model gets its own (global) scope's features
+        if engine_name == ENGINE_EXPONENTIAL_SMOOTHING:
+            features = {}
+        elif model_status["fallback_model"]:
+            features = self._prepare_forecast_features(None, None)
+        else:
+            features = self._prepare_forecast_features(supplier_id, product_id)
         
-        # Calculate confidence intervals
-        confidence_intervals = self._calculate_confidence_intervals(
-            predictions, confidence_level
-        )
+        # Forecast the whole horizon in one vectorized call, a point per day from midnight
+        # today, as materialized forecasts store them
+        future_dates = pd.date_range(datetime.now(), periods=forecast_horizon_days, freq="D", normalize=True)
+        result = forecast_engine.forecast(future_dates, confidence_level, features)
         
         # Create forecast data points
-        forecast_points = []
-        for i, (date, pred, conf_low, conf_high) in enumerate(
-            zip(dates, predictions, confidence_intervals['lower'], confidence_intervals['upper'])
-        ):
-            forecast_points.append(ForecastDataPoint(
+        forecast_points = [
+            ForecastDataPoint(
                 date=date,
                 predicted_emissions=pred,
                 confidence_lower=conf_low,
                 confidence_upper=conf_high
-            ))
+            )
+            for date, pred, conf_low, conf_high in zip(
+                future_dates.to_pydatetime(),
+                result['predicted'].tolist(),
+                result['lower'].tolist(),
+                result['upper'].tolist()
+            )
+        ]
         
-        return ForecastResponse(
+        forecast = ForecastResponse(
             supplier_id=supplier_id,
             product_id=product_id,
             forecast_horizon_days=forecast_horizon_days,
             confidence_level=confidence_level,
             forecast_data=forecast_points,
-            model_accuracy=self._get_model_accuracy(),
-            generated_at=datetime.now()
+            model_accuracy=self._get_model_accuracy(self.model_key),
+            generated_at=datetime.now(),
+            engine=engine_name,
+            fallback_model=model_status["fallback_model"],
+            training_job_id=model_status["training_job_id"],
+            similar_suppliers=model_status.get("similar_suppliers")
         )
-    
-    async def _load_or_train_model(self, supplier_id: Optional[str], product_id: Optional[str]):
-        """Load existing model or train a new one"""
-        model_key = f"{supplier_id}_{product_id}" if supplier_id else "global"
-        model_path = os.path.join(self.model_cache_dir, f"forecast_model_{model_key}.joblib")
         
-        if os.path.exists(model_path):
-            self.model = joblib.load(model_path)
-        else:
-            await self._train_model(supplier_id, product_id, model_path)
-    
-    async def _train_model(self, supplier_id: Optional[str], product_id: Optional[str], model_path: str):
-        """Train a new forecasting model"""
-        # Get historical data
-        query = self.db.query(CarbonEvent)
-        
-        if supplier_id:
-            query = query.filter(CarbonEvent.supplier_id == supplier_id)
-        if product_id:
-            query = query.filter(CarbonEvent.product_id == product_id)
+        # Fallback forecasts are superseded as soon as the dedicated model is trained
+        if not forecast.fallback_model:
+            try:
+                self._store_materialized_forecast(forecast, stored_version)
+            except SQLAlchemyError:
+                self.db.rollback()  # Storing is only a cache; the forecast itself is still good
         
-        # Get last 2 years of data
-        two_years_ago = datetime.now() - timedelta(days=730)
-        query = query.filter(CarbonEvent.timestamp >= two_years_ago)
-        
-        carbon_events = query.all()
-        
-        if len(carbon_events) < 30:  # Need minimum data points
-            # Use global model if insufficient data
-            await self._train_global_model()
-            return
+        return forecast
+    
+    def get_forecast_version(
+        self,
+        supplier_id: Optional[str] = None,
+        product_id: Optional[str] = None,
+        engine: str = ENGINE_AUTO,
+        horizon_days: int = 90,
+        confidence_level: float = 0.95
+    ) -> Optional[Dict[str, Any]]:
+        """What the stored forecast a request would be served depends on
+        
+        Costs a version counter read, a metadata read and an aggregate over the
+        stored forecast's rows; never the scope's events. None while no fresh
+        forecast is stored, e.g. while the scope is served by the fallback model.
+        """
+        data_version = self._data_version(supplier_id)
+        engines = self._current_engines(supplier_id, product_id)
+        stored = self._fresh_materialized_query(
+            supplier_id, product_id, horizon_days, confidence_level, f"{data_version}:{engine}", engines
+        ).with_entities(
+            Forecast.model_version,
+            func.count(Forecast.id).label("days"),
+            func.min(Forecast.forecast_date).label("start_date"),
+            func.max(Forecast.created_at).label("generated_at")
+        ).group_by(Forecast.model_version).first()
+        if stored is None or stored.days != horizon_days or stored.start_date != datetime.now().date():
+            return None
+        
+        engine_name = engines[stored.model_version]
+        model_key = model_key_for(supplier_id, product_id) if engine_name == ENGINE_RANDOM_FOREST else None
+        return {
+            "data_version": data_version,
+            "engine": engine_name,
+            "model_version": stored.model_version,
+            "model_accuracy": self._get_model_accuracy(model_key),
+            "generated_at": stored.generated_at
+        }
+    
+    def _resolve_engine(self, engine: str, active_days: int) -> str:
+        """Pick the backend for a request; "auto" sends short series to exponential smoothing"""
+        if engine == ENGINE_AUTO:
+            if MIN_SMOOTHING_DAYS <= active_days <= settings.FORECAST_SMOOTHING_MAX_DAYS:
+                return ENGINE_EXPONENTIAL_SMOOTHING
+            return ENGINE_RANDOM_FOREST
+        if engine == ENGINE_EXPONENTIAL_SMOOTHING and active_days < MIN_SMOOTHING_DAYS:
+            return ENGINE_RANDOM_FOREST  # Too little history to initialise the season
+        return engine
+    
+    def _materialized_query(self, supplier_id: Optional[str], product_id: Optional[str], horizon_days: int, confidence_level: float):
+        """Stored forecast rows for one scope/horizon/confidence level, across model versions"""
+        return self.db.query(Forecast).filter(
+            Forecast.supplier_id.is_(None) if supplier_id is None else Forecast.supplier_id == supplier_id,
+            Forecast.product_id.is_(None) if product_id is None else Forecast.product_id == product_id,
+            Forecast.horizon_days == horizon_days,
+            Forecast.confidence_level == confidence_level
+        )
+    
+    def _current_engines(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, str]:
+        """Engines by the model versions a scope's stored forecast can be current under"""
+        engines = {ExponentialSmoothingEngine.model_version: ENGINE_EXPONENTIAL_SMOOTHING}
+        metadata = self.registry.get_metadata(model_key_for(supplier_id, product_id))
+        if metadata:
+            engines[metadata["model_version"]] = ENGINE_RANDOM_FOREST
+        return engines
+    
+    def _fresh_materialized_query(
+        self,
+        supplier_id: Optional[str],
+        product_id: Optional[str],
+        horizon_days: int,
+        confidence_level: float,
+        stored_version: str,
+        engines: Dict[str, str]
+    ):
+        """Stored forecast rows made from the current data, for the engine requested, by a current model"""
+        max_age = timedelta(hours=settings.FORECAST_CACHE_MAX_AGE_HOURS)
+        return self._materialized_query(supplier_id, product_id, horizon_days, confidence_level).filter(
+            Forecast.model_version.in_(list(engines)),
+            Forecast.data_version == stored_version,
+            Forecast.created_at >= datetime.now() - max_age
+        )
+    
+    def _load_materialized_forecast(
+        self,
+        supplier_id: Optional[str],
+        product_id: Optional[str],
+        horizon_days: int,
+        confidence_level: float,
+        stored_version: str
+    ) -> Optional[ForecastResponse]:
+        """Read a stored forecast if it is still fresh, otherwise None"""
+        engines = self._current_engines(supplier_id, product_id)
+        rows = self._fresh_materialized_query(
+            supplier_id, product_id, horizon_days, confidence_level, stored_version, engines
+        ).order_by(Forecast.forecast_date).all()
+        
+        # Forecasts start today, so yesterday's rows are stale even within max_age
+        if len(rows) != horizon_days or rows[0].forecast_date != datetime.now().date():
+            return None
+        
+        engine_name = engines[rows[0].model_version]
+        model_key = model_key_for(supplier_id, product_id) if engine_name == ENGINE_RANDOM_FOREST else None
+        return ForecastResponse(
+            supplier_id=supplier_id,
+            product_id=product_id,
+            forecast_horizon_days=horizon_days,
+            confidence_level=confidence_level,
+            forecast_data=[
+                ForecastDataPoint(
+                    date=datetime.combine(row.forecast_date, datetime.min.time()),
+                    predicted_emissions=row.predicted_emissions,
+                    confidence_lower=row.confidence_interval_lower,
+                    confidence_upper=row.confidence_interval_upper
+                )
+                for row in rows
+            ],
+            model_accuracy=self._get_model_accuracy(model_key),
+            generated_at=rows[0].created_at,
+            engine=engine_name
+        )
+    
+    def _store_materialized_forecast(self, forecast: ForecastResponse, stored_version: str):
+        """Replace the stored forecast for this scope/horizon with a freshly generated one"""
+        self._materialized_query(
+            forecast.supplier_id, forecast.product_id, forecast.forecast_horizon_days, forecast.confidence_level
+        ).delete(synchronize_session=False)
         
-        # Prepare training data
-        df = pd.DataFrame([
+        self.db.execute(insert(Forecast), [
             {
-                'timestamp': event.timestamp,
-                'emissions': event.emissions_kg_co2e,
-                'day_of_week': event.timestamp.weekday(),
-                'month': event.timestamp.month,
-                'year': event.timestamp.year,
-                'day_of_year': event.timestamp.timetuple().tm_yday
+                "supplier_id": forecast.supplier_id,
+                "product_id": forecast.product_id,
+                "forecast_date": point.date.date(),
+                "predicted_emissions": point.predicted_emissions,
+                "confidence_interval_lower": point.confidence_lower,
+                "confidence_interval_upper": point.confidence_upper,
+                "horizon_days": forecast.forecast_horizon_days,
+                "confidence_level": forecast.confidence_level,
+                "model_version": self.model_version,
+                "data_version": stored_version,
+                "created_at": forecast.generated_at
             }
-            for event in carbon_events
+            for point in forecast.forecast_data
         ])
+        self.db.commit()
+    
+    def _load_or_train_model(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Load an existing model, answering from the global model while a cold one trains"""
+        model_key = model_key_for(supplier_id, product_id)
+        artifact = self.registry.get(model_key)
+        status = {"fallback_model": False, "training_job_id": None}
+        
+        if artifact is None and model_key != GLOBAL_MODEL_KEY:
+            # Train the dedicated model in the background and serve the global one meanwhile
+            if self._has_training_data(supplier_id, product_id):
+                job = self.training_jobs.submit_model_training(supplier_id, product_id)
+                status["training_job_id"] = job["job_id"]
+            status["fallback_model"] = True
+        
+        if artifact is None:
+            artifact = self._load_global_artifact()
+        
+        self.model = artifact.model
+        self.scaler = artifact.scaler
+        self.model_key = artifact.model_key
+        self.model_version = artifact.model_version
+        return status
+    
+    def _cold_start_engine(self, supplier_id: str, feature_store: FeatureStore) -> Optional[NeighborPoolEngine]:
+        """Pool the models of the suppliers most similar to one without a model of its own"""
+        row = feature_store.get_scope(supplier_id, None)
+        profile = supplier_profile(row)
+        if profile is None:
+            return None
+        
+        artifacts: Dict[str, ModelArtifact] = {}
+        def has_model(neighbor_id: str) -> bool:
+            artifact = self.registry.get(model_key_for(neighbor_id, None))
+            if artifact is not None:
+                artifacts[neighbor_id] = artifact
+            return artifact is not None
+        
+        neighbors = supplier_index.nearest(
+            profile, settings.COLD_START_NEIGHBORS, exclude=supplier_id,
+            min_events=MIN_TRAINING_EVENTS, accept=has_model
+        )
+        if not neighbors:
+            return None
+        
+        features = feature_store.get_many([neighbor.supplier_id for neighbor in neighbors])
+        mean_emissions = row.emissions_sum / row.event_count
+        members = [
+            (
+                RandomForestEngine(artifacts[neighbor.supplier_id].model, artifacts[neighbor.supplier_id].scaler),
+                features[neighbor.supplier_id],
+                1 / (1 + neighbor.distance),
+                mean_emissions / neighbor.mean_emissions
+            )
+            for neighbor in neighbors
+            if features[neighbor.supplier_id]
+        ]
+        if not members:
+            return None
+        return NeighborPoolEngine(members, [neighbor.supplier_id for neighbor in neighbors if features[neighbor.supplier_id]])
+    
+    def _load_global_artifact(self) -> ModelArtifact:
+        """The global model, training it on the pool and waiting for it if none is stored yet"""
+        artifact = self.registry.get(GLOBAL_MODEL_KEY)
+        if artifact is None:
+            self.training_jobs.run_model_training(None, None)
+            artifact = self.registry.get(GLOBAL_MODEL_KEY)
+        return artifact
+    
+    def generate_portfolio_forecast(
+        self,
+        supplier_ids: Optional[List[str]] = None,
+        forecast_horizon_days: int = 90,
+        confidence_level: float = 0.95
+    ) -> PortfolioForecastResponse:
+        """Forecast many suppliers from one grouped query and batched predictions
+        
+        supplier_ids=None forecasts every supplier with events in the training
+        window. Suppliers are routed like the "auto" engine: short series are
+        smoothed together as one stacked matrix, the rest use their forest (or,
+        while their own model trains, similar suppliers' pooled forests, else the
+        global forest predicted once).
+        """
+        histories = self._load_supplier_daily_histories(supplier_ids)
+        if supplier_ids is None:
+            supplier_ids = list(histories)
+        supplier_ids = list(dict.fromkeys(supplier_ids))
+        future_dates = pd.date_range(datetime.now(), periods=forecast_horizon_days, freq="D", normalize=True)
+        
+        smoothing, forest = [], []
+        for supplier_id in supplier_ids:
+            history = histories.get(supplier_id)
+            if history is not None and MIN_SMOOTHING_DAYS <= len(history[0]) <= settings.FORECAST_SMOOTHING_MAX_DAYS:
+                smoothing.append(supplier_id)
+            else:
+                forest.append(supplier_id)
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        if smoothing:
+            batch = ExponentialSmoothingEngine().fit_batch(
+                [histories[supplier_id][:2] for supplier_id in smoothing]
+            ).forecast_batch(future_dates, confidence_level)
+            for i, supplier_id in enumerate(smoothing):
+                results[supplier_id] = {
+                    "engine": ENGINE_EXPONENTIAL_SMOOTHING,
+                    "fallback_model": False,
+                    **{key: values[i] for key, values in batch.items()}
+                }
+        
+        global_forecast = None
+        feature_store = FeatureStore(self.db)
+        features = feature_store.get_many(forest)
+        if forest:
+            supplier_index.refresh(self.db)
+        for supplier_id in forest:
+            artifact = self.registry.get(model_key_for(supplier_id, None))
+            pooled_engine = None
+            if artifact is None:
+                history = histories.get(supplier_id)
+                if history is not None and history[2].sum() >= MIN_TRAINING_EVENTS:
+                    self.training_jobs.submit_model_training(supplier_id, None)
+                if features[supplier_id]:
+                    pooled_engine = self._cold_start_engine(supplier_id, feature_store)
+            
+            if artifact is not None:
+                forecast = RandomForestEngine(artifact.model, artifact.scaler).forecast(
+                    future_dates, confidence_level, features[supplier_id]
+                )
+            elif pooled_engine is not None:
+                forecast = pooled_engine.forecast(future_dates, confidence_level, {})
+            else:
+                if global_forecast is None:
+                    global_artifact = self._load_global_artifact()
+                    global_forecast = RandomForestEngine(global_artifact.model, global_artifact.scaler).forecast(
+                        future_dates, confidence_level, self._prepare_forecast_features(None, None)
+                    )
+                forecast = global_forecast
+            results[supplier_id] = {
+                "engine": ENGINE_RANDOM_FOREST,
+                "fallback_model": artifact is None,
+                "similar_suppliers": pooled_engine.supplier_ids if pooled_engine is not None else None,
+                **forecast
+            }
         
-        # Create features
-        X = df[['day_of_week', 'month', 'year', 'day_of_year']].values
-        y = df['emissions'].values
-        
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        dates = future_dates.to_pydatetime()
+        def data_points(predicted: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> List[ForecastDataPoint]:
+            return [
+                ForecastDataPoint(date=date, predicted_emissions=pred, confidence_lower=low, confidence_upper=high)
+                for date, pred, low, high in zip(dates, predicted.tolist(), lower.tolist(), upper.tolist())
+            ]
         
-        # Train model
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.model.fit(X_scaled, y)
+        # Stack every supplier's forecast to total the portfolio in one pass
+        stacked = {
+            key: np.vstack([results[supplier_id][key] for supplier_id in supplier_ids])
+            if supplier_ids else np.zeros((0, len(dates)))
+            for key in ('predicted', 'lower', 'upper')
+        }
         
-        # Save model
-        os.makedirs(self.model_cache_dir, exist_ok=True)
-        joblib.dump(self.model, model_path)
+        return PortfolioForecastResponse(
+            forecast_horizon_days=forecast_horizon_days,
+            confidence_level=confidence_level,
+            suppliers=[
+                SupplierForecast(
+                    supplier_id=supplier_id,
+                    engine=results[supplier_id]["engine"],
+                    fallback_model=results[supplier_id]["fallback_model"],
+                    similar_suppliers=results[supplier_id].get("similar_suppliers"),
+                    forecast_data=data_points(stacked['predicted'][i], stacked['lower'][i], stacked['upper'][i])
+                )
+                for i, supplier_id in enumerate(supplier_ids)
+            ],
+            portfolio_total=data_points(*(stacked[key].sum(axis=0) for key in ('predicted', 'lower', 'upper'))),
+            generated_at=datetime.now()
+        )
     
-    async def _train_global_model(self):
-        """Train a global model using all available data"""
-        carbon_events = self.db.query(CarbonEvent).all()
-        
-        df = pd.DataFrame([
-            {
-                'timestamp': event.timestamp,
-                'emissions': event.emissions_kg_co2e,
-                'day_of_week': event.timestamp.weekday(),
-                'month': event.timestamp.month,
-                'year': event.timestamp.year,
-                'day_of_year': event.timestamp.timetuple().tm_yday
-            }
-            for event in carbon_events
-        ])
-        
-        X = df[['day_of_week', 'month', 'year', 'day_of_year']].values
-        y = df['emissions'].values
+    def _load_supplier_daily_histories(
+        self, supplier_ids: Optional[List[str]]
+    ) -> Dict[str, Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]]:
+        """Daily (days, mean emissions, event counts) per supplier from one grouped query"""
+        day = func.date(CarbonEvent.timestamp)
+        query = self._training_query(None, None)
+        if supplier_ids is not None:
+            query = query.filter(CarbonEvent.supplier_id.in_(supplier_ids))
+        
+        rows = query.with_entities(
+            CarbonEvent.supplier_id,
+            day.label("day"),
+            func.avg(CarbonEvent.emissions_kg_co2e).label("emissions"),
+            func.count(CarbonEvent.id).label("events")
+        ).group_by(CarbonEvent.supplier_id, day).order_by(CarbonEvent.supplier_id, day).all()
+        if not rows:
+            return {}
         
-        X_scaled = self.scaler.fit_transform(X)
+        suppliers = np.array([row.supplier_id for row in rows], dtype=object)
+        days = pd.to_datetime([row.day for row in rows])
+        emissions = np.fromiter((row.emissions for row in rows), dtype=float, count=len(rows))
+        events = np.fromiter((row.events for row in rows), dtype=float, count=len(rows))
         
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.model.fit(X_scaled, y)
+        # Rows are sorted by supplier, so each supplier is one contiguous slice
+        boundaries = np.flatnonzero(suppliers[1:] != suppliers[:-1]) + 1
+        starts, ends = np.r_[0, boundaries], np.r_[boundaries, len(rows)]
+        return {
+            suppliers[start]: (days[start:end], emissions[start:end], events[start:end])
+            for start, end in zip(starts, ends)
+        }
     
-    async def _prepare_forecast_features(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
-        """Prepare features for forecasting"""
-        # Get recent data for feature engineering
+    def _training_query(self, supplier_id: Optional[str], product_id: Optional[str]):
+        """Events in the training window for a supplier/product scope"""
         query = self.db.query(CarbonEvent)
         
         if supplier_id:
@@ -168,47 +706,199 @@ class ForecastService:
         if product_id:
             query = query.filter(CarbonEvent.product_id == product_id)
         
-        recent_events = query.order_by(CarbonEvent.timestamp.desc()).limit(100).all()
+        # Get last 2 years of data
+        two_years_ago = datetime.now() - timedelta(days=730)
+        return query.filter(CarbonEvent.timestamp >= two_years_ago)
+    
+    def _data_version(self, supplier_id: Optional[str]) -> str:
+        """Version of a scope's events, from the write counter bumped with the rollups
         
-        if not recent_events:
-            return {}
+        Product scopes share their supplier's counter, so a write to any of the
+        supplier's products counts as a change to each of them.
+        """
+        return str(EmissionsRollupService(self.db).get_scope_version(supplier_id).version)
+    
+    def _active_days(self, supplier_id: Optional[str], product_id: Optional[str], data_version: str) -> int:
+        """Days with events in a scope's training window, kept in its model's metadata while current"""
+        metadata = self.registry.get_metadata(model_key_for(supplier_id, product_id))
+        if metadata and metadata.get("data_version") == data_version and "active_days" in metadata:
+            return metadata["active_days"]
+        return self._training_query(supplier_id, product_id).with_entities(
+            func.count(func.distinct(func.date(CarbonEvent.timestamp)))
+        ).scalar()
+    
+    def _training_summary_columns(self) -> List[Any]:
+        """Aggregates over a scope's training window stored with its model"""
+        return [
+            func.count(CarbonEvent.id).label("event_count"),
+            func.max(CarbonEvent.id).label("last_event_id"),
+            func.count(func.distinct(func.date(CarbonEvent.timestamp))).label("active_days")
+        ]
+    
+    def _training_metadata(self, row: Any, data_version: str) -> Dict[str, Any]:
+        return {
+            "event_count": row.event_count,
+            "last_event_id": row.last_event_id,
+            "active_days": row.active_days,
+            "data_version": data_version
+        }
+    
+    def _has_training_data(self, supplier_id: Optional[str], product_id: Optional[str]) -> bool:
+        """Whether a scope has enough history for its own model"""
+        return self._training_query(supplier_id, product_id).limit(MIN_TRAINING_EVENTS).count() >= MIN_TRAINING_EVENTS
+    
+    def train_model(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Train a new forecasting model (blocking; run it on the training job pool)"""
+        model_key = model_key_for(supplier_id, product_id)
         
-        # Calculate rolling averages and trends
-        emissions = [event.emissions_kg_co2e for event in recent_events]
+        # Get historical data; the version is read first, so a write during training
+        # leaves the model marked stale rather than current
+        data_version = self._data_version(supplier_id)
+        query = self._training_query(supplier_id, product_id)
+        summary = query.with_entities(*self._training_summary_columns()).one()
+        
+        if summary.event_count < MIN_TRAINING_EVENTS:  # Need minimum data points
+            # Use global model if insufficient data
+            return self.train_global_model()
+        
+        metadata = {**self._training_metadata(summary, data_version), "supplier_id": supplier_id, "product_id": product_id}
+        result = self._fit_and_save(model_key, query, metadata)
+        if not product_id:
+            # Suppliers with a model are cold-start neighbours; make sure their profile is indexed
+            FeatureStore(self.db).get_scope(supplier_id, None)
+        return result
+    
+    def train_global_model(self) -> Dict[str, Any]:
+        """Train a global model using all available data"""
+        data_version = self._data_version(None)
+        query = self.db.query(CarbonEvent)
+        summary = query.with_entities(*self._training_summary_columns()).one()
+        if not summary.event_count:
+            raise ValueError("No carbon events available to train a forecast model")
+        
+        metadata = {**self._training_metadata(summary, data_version), "supplier_id": None, "product_id": None}
+        return self._fit_and_save(GLOBAL_MODEL_KEY, query, metadata)
+    
+    def _load_daily_training_data(self, query) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+        """Aggregate a scope's events by day in SQL: (days, mean emissions, event counts)"""
+        day = func.date(CarbonEvent.timestamp)
+        rows = query.with_entities(
+            day.label("day"),
+            func.avg(CarbonEvent.emissions_kg_co2e).label("emissions"),
+            func.count(CarbonEvent.id).label("events")
+        ).group_by(day).order_by(day).all()
+        
+        days = pd.to_datetime([row.day for row in rows])
+        emissions = np.fromiter((row.emissions for row in rows), dtype=float, count=len(rows))
+        events = np.fromiter((row.events for row in rows), dtype=float, count=len(rows))
+        return days, emissions, events
+    
+    def _fit_and_save(self, model_key: str, query, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Fit a scaler and RandomForest on a scope's daily history and store them in the registry"""
+        # Prepare training data; weighting each day's mean by its event count fits
+        # the same per-event model as one row per event, in O(days) memory
+        days, X, y, weights = self._training_matrix(*self._load_daily_training_data(query))
+        if not len(y):
+            raise ValueError(f"At least two days of history are needed to train {model_key}")
+        self.scaler, self.model = self._fit(X, y, weights)
+        
+        # Save model and scaler together so they are always loaded as a pair
+        artifact = self.registry.put(ModelArtifact(model_key, self.model, self.scaler, metadata=metadata))
         
         return {
-            'recent_avg': np.mean(emissions),
-            'recent_trend': np.polyfit(range(len(emissions)), emissions, 1)[0],
-            'volatility': np.std(emissions)
+            "model_key": model_key,
+            "training_days": len(y),
+            "training_events": metadata["event_count"],
+            "trained_at": artifact.trained_at,
+            "data_version": metadata["data_version"]
         }
     
-    def _create_future_features(self, future_date: datetime, features: Dict[str, Any]) -> List[float]:
-        """Create feature vector for future date"""
-        return [
-            future_date.weekday(),
-            future_date.month,
-            future_date.year,
-            future_date.timetuple().tm_yday
-        ]
+    def _training_matrix(
+        self, days: pd.DatetimeIndex, y: np.ndarray, weights: np.ndarray
+    ) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray, np.ndarray]:
+        """Calendar and history features per training day, dropping the first day (no history yet)"""
+        X = np.column_stack([calendar_features(days), history_feature_matrix(days, y, weights)])
+        return days[1:], X[1:], y[1:], weights[1:]
     
-    def _calculate_confidence_intervals(self, predictions: List[float], confidence_level: float) -> Dict[str, List[float]]:
-        """Calculate confidence intervals for predictions"""
-        # Simple confidence interval calculation
-        # In a real implementation, you'd use more sophisticated methods
-        std_dev = np.std(predictions) * 0.1  # Assume 10% of std as uncertainty
+    def _fit(self, X: np.ndarray, y: np.ndarray, weights: np.ndarray) -> Tuple[StandardScaler, RandomForestRegressor]:
+        """Fit the scaler and forest used by every forecast model"""
+        # Scale features
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
         
-        z_score = 1.96 if confidence_level == 0.95 else 1.645  # Approximate
+        # Train model
+        model = RandomForestRegressor(n_estimators=100, random_state=42)
+        model.fit(X_scaled, y, sample_weight=weights)
+        return scaler, model
+    
+    def backtest_model(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Rolling-origin backtest of a stored model's configuration on its own history
+        
+        The last BACKTEST_FOLDS windows of BACKTEST_HORIZON_DAYS days are each
+        predicted by a model fitted only on the days before that window. Metrics
+        are cached in the model's metadata under its current model_version.
+        """
+        model_key = model_key_for(supplier_id, product_id)
+        metadata = self.registry.get_metadata(model_key)
+        if metadata is None:
+            raise ValueError(f"No stored model for {model_key}")
+        
+        days, y, weights = self._load_daily_training_data(self._training_query(supplier_id, product_id))
+        days, X, y, weights = self._training_matrix(days, y, weights)
+        
+        actual, predicted = [], []
+        horizon = np.timedelta64(settings.BACKTEST_HORIZON_DAYS, "D")
+        last_origin = days.values[-1] - horizon + np.timedelta64(1, "D") if len(days) else None
+        for fold in reversed(range(settings.BACKTEST_FOLDS)):
+            if last_origin is None:
+                break
+            origin = last_origin - fold * horizon
+            train = days.values < origin
+            test = (days.values >= origin) & (days.values < origin + horizon)
+            if train.sum() < MIN_BACKTEST_TRAINING_DAYS or not test.any():
+                continue
+            
+            scaler, model = self._fit(X[train], y[train], weights[train])
+            actual.append(y[test])
+            predicted.append(np.maximum(model.predict(scaler.transform(X[test])), 0))
         
-        lower = [max(0, pred - z_score * std_dev) for pred in predictions]
-        upper = [pred + z_score * std_dev for pred in predictions]
+        folds = len(actual)
+        if not folds:
+            accuracy = {"model_version": metadata["model_version"], "folds": 0, "test_points": 0}
+        else:
+            actual, predicted = np.concatenate(actual), np.concatenate(predicted)
+            errors = predicted - actual
+            total_variance = np.sum((actual - actual.mean()) ** 2)
+            accuracy = {
+                "model_version": metadata["model_version"],
+                "folds": folds,
+                "test_points": int(len(actual)),
+                "mae": float(np.mean(np.abs(errors))),
+                "rmse": float(np.sqrt(np.mean(errors ** 2))),
+                "r2_score": float(1 - np.sum(errors ** 2) / total_variance) if total_variance > 0 else 0.0,
+                # 1 - weighted absolute percentage error, clipped to [0, 1]
+                "overall_accuracy": float(np.clip(1 - np.sum(np.abs(errors)) / max(np.sum(np.abs(actual)), 1e-9), 0, 1))
+            }
         
-        return {'lower': lower, 'upper': upper}
+        self.registry.update_metadata(model_key, {"accuracy": accuracy})
+        return {"model_key": model_key, **accuracy}
+    
+    def _prepare_forecast_features(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Prepare features for forecasting from the scope's precomputed feature row"""
+        return FeatureStore(self.db).get_features(supplier_id, product_id)
+    
+    def _get_model_accuracy(self, model_key: Optional[str]) -> Optional[float]:
+        """Backtested accuracy of a model's current version, if it has been evaluated"""
+        accuracy = self._stored_accuracy(self.registry.get_metadata(model_key) or {}) if model_key else None
+        return accuracy.get("overall_accuracy") if accuracy else None
     
-    def _get_model_accuracy(self) -> float:
-        """Get model accuracy (placeholder)"""
-        return 0.85  # Placeholder accuracy
+    def _stored_accuracy(self, metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        accuracy = metadata.get("accuracy")
+        if not accuracy or accuracy.get("model_version") != metadata.get("model_version"):
+            return None  # Never evaluated, or evaluated against an older fit
+        return accuracy
     
-    async def get_forecast_trends(self) -> Dict[str, Any]:
+    def get_forecast_trends(self) -> Dict[str, Any]:
         """Get overall forecast trends and insights"""
         # This would analyze trends across all suppliers
         return {
@@ -221,24 +911,108 @@ class ForecastService:
             ]
         }
     
-    async def retrain_models(self) -> Dict[str, Any]:
-        """Retrain all forecasting models"""
+    def retrain_models(self, mode: str = "global") -> Dict[str, Any]:
+        """Retrain forecasting models on the training job pool
+        
+        "global" clears every stored model and retrains the global one; supplier
+        models then retrain on their next request. "fleet" retrains every
+        supplier/product model in parallel, stalest first, skipping unchanged ones.
+        """
+        if mode == "fleet":
+            plan, skipped = self.plan_fleet_retrain()
+            return self.training_jobs.submit_fleet_training(plan, skipped)
+        
         # Clear existing models
         if os.path.exists(self.model_cache_dir):
             for file in os.listdir(self.model_cache_dir):
-                if file.startswith("forecast_model_"):
+                if file.startswith(MODEL_FILE_PREFIX):
                     os.remove(os.path.join(self.model_cache_dir, file))
+        self.registry.invalidate()
         
-        # Retrain global model
-        await self._train_global_model()
+        # Retrain global model; supplier models retrain on their next request
+        return self.training_jobs.submit_model_training(None, None)
+    
+    def plan_fleet_retrain(self) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """List models whose training data changed since their last fit, stalest first"""
+        versions = dict(self.db.query(EventScopeVersion.scope_key, EventScopeVersion.version))
+        version_columns = self._training_summary_columns()
+        window = self._training_query(None, None)
+        
+        scopes = [(None, None, window.with_entities(*version_columns).one())]
+        scopes += [
+            (row.supplier_id, None, row)
+            for row in window.with_entities(CarbonEvent.supplier_id, *version_columns)
+            .group_by(CarbonEvent.supplier_id)
+        ]
+        scopes += [
+            (row.supplier_id, row.product_id, row)
+            for row in window.with_entities(CarbonEvent.supplier_id, CarbonEvent.product_id, *version_columns)
+            .filter(CarbonEvent.product_id.isnot(None))
+            .group_by(CarbonEvent.supplier_id, CarbonEvent.product_id)
+        ]
         
-        return {"message": "Models retrained successfully", "models_updated": 1}
+        plan, skipped = [], []
+        for supplier_id, product_id, row in scopes:
+            if supplier_id is not None and row.event_count < MIN_TRAINING_EVENTS:
+                continue  # Served by the global model
+            if supplier_id is not None and self._resolve_engine(ENGINE_AUTO, row.active_days) == ENGINE_EXPONENTIAL_SMOOTHING:
+                continue  # Short series are served by exponential smoothing, which keeps no model
+            
+            model_key = model_key_for(supplier_id, product_id)
+            stored = self.registry.get_metadata(model_key)
+            if stored and stored.get("data_version") == str(versions.get(scope_version_key(supplier_id), 0)):
+                skipped.append(model_key)
+                continue
+            
+            plan.append({
+                "model_key": model_key,
+                "supplier_id": supplier_id,
+                "product_id": product_id,
+                # New events since the last fit; never-trained models count all of theirs
+                "staleness": max(row.event_count - (stored or {}).get("event_count", 0), 0)
+            })
+        
+        plan.sort(key=lambda entry: entry["staleness"], reverse=True)
+        return plan, skipped
     
-    async def get_model_accuracy(self) -> Dict[str, float]:
-        """Get detailed model accuracy metrics"""
+    def get_training_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get progress and results of a training job"""
+        return self.training_jobs.get(job_id)
+    
+    def get_registry_stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters for the in-memory model registry"""
+        return {**self.registry.stats(), "similarity_index": supplier_index.stats()}
+    
+    def get_model_accuracy(self) -> Dict[str, Any]:
+        """Get backtested accuracy metrics, queueing backtests for unevaluated models"""
+        models, pending = {}, []
+        for model_key, metadata in self.registry.list_metadata().items():
+            accuracy = self._stored_accuracy(metadata)
+            if accuracy is None:
+                pending.append({
+                    "model_key": model_key,
+                    "supplier_id": metadata.get("supplier_id"),
+                    "product_id": metadata.get("product_id")
+                })
+            elif accuracy["test_points"]:
+                models[model_key] = accuracy
+        
+        job = self.training_jobs.submit_backtests(pending) if pending else None
+        
+        # Pool per-model metrics weighted by the number of backtested days
+        points = np.array([m["test_points"] for m in models.values()], dtype=float)
+        def pooled(metric: str) -> Optional[float]:
+            if not points.sum():
+                return None
+            return float(np.average([m[metric] for m in models.values()], weights=points))
+        
         return {
-            "overall_accuracy": 0.85,
-            "mae": 0.12,
-            "rmse": 0.18,
-            "r2_score": 0.78
-        } 
\ No newline at end of file
+            "overall_accuracy": pooled("overall_accuracy"),
+            "mae": pooled("mae"),
+            "rmse": float(np.sqrt(np.average([m["rmse"] ** 2 for m in models.values()], weights=points))) if points.sum() else None,
+            "r2_score": pooled("r2_score"),
+            "models_evaluated": len(models),
+            "models": models,
+            "pending_models": [scope["model_key"] for scope in pending],
+            "backtest_job_id": job["job_id"] if job else None
+        }
@@ -0,0 +1,231 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any
+import threading
+import joblib
+import json
+import os
+
+from app.core.config import settings
+
+# Bump when the on-disk artifact layout changes; older files are ignored and retrained
+ARTIFACT_FORMAT_VERSION = 2
+MODEL_FILE_PREFIX = "forecast_model_"
+GLOBAL_MODEL_KEY = "global"
+
+
+def model_key_for(supplier_id: Optional[str], product_id: Optional[str]) -> str:
+    """Registry key for a supplier/product model; the global model has no supplier"""
+    return f"{supplier_id}_{product_id}" if supplier_id else GLOBAL_MODEL_KEY
+
+
+class ModelArtifact:
+    """A fitted forecast model together with the scaler its features were fitted with"""
+
+    def __init__(
+        self,
+        model_key: str,
+        model: Any,
+        scaler: Any,
+        trained_at: Optional[datetime] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.model_key = model_key
+        self.model = model
+        self.scaler = scaler
+        self.trained_at = trained_at or datetime.now()
+        self.metadata = metadata or {}
+        self.size_bytes = 0
+        # (mtime_ns, size) of the file this artifact was read from or written to
+        self.file_stamp = None
+
+    @property
+    def model_version(self) -> str:
+        """Identifies this particular fit; changes every time the model is retrained"""
+        return f"v{ARTIFACT_FORMAT_VERSION}-{self.trained_at:%Y%m%d%H%M%S%f}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "model_key": self.model_key,
+            "model": self.model,
+            "scaler": self.scaler,
+            "trained_at": self.trained_at,
+            "metadata": self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Optional["ModelArtifact"]:
+        """Rebuild an artifact, returning None for legacy or incompatible files"""
+        if not isinstance(data, dict) or data.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            return None
+        return cls(
+            model_key=data["model_key"],
+            model=data["model"],
+            scaler=data["scaler"],
+            trained_at=data.get("trained_at"),
+            metadata=data.get("metadata")
+        )
+
+
+class ModelRegistry:
+    """Process-wide store of forecast models, backed by MODEL_CACHE_DIR and an in-memory LRU"""
+
+    def __init__(self, cache_dir: str, max_models: int, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._models: "OrderedDict[str, ModelArtifact]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path_for(self, model_key: str) -> str:
+        return os.path.join(self.cache_dir, f"{MODEL_FILE_PREFIX}{model_key}.joblib")
+
+    def metadata_path_for(self, model_key: str) -> str:
+        return os.path.join(self.cache_dir, f"{MODEL_FILE_PREFIX}{model_key}.meta.json")
+
+    def get(self, model_key: str) -> Optional[ModelArtifact]:
+        """Return the artifact for model_key from memory, falling back to disk
+
+        A resident model is only returned while its file is unchanged, so a
+        retrain or delete in another worker process is picked up on the next get.
+        """
+        model_path = self.path_for(model_key)
+        stamp = self._file_stamp(model_path)
+        with self._lock:
+            artifact = self._models.get(model_key)
+            if artifact is not None and artifact.file_stamp == stamp:
+                self._models.move_to_end(model_key)
+                self.hits += 1
+                return artifact
+            if artifact is not None:
+                self._resident_bytes -= self._models.pop(model_key).size_bytes
+            self.misses += 1
+
+        if stamp is None:
+            return None
+
+        artifact = ModelArtifact.from_dict(joblib.load(model_path))
+        if artifact is None:
+            return None
+        artifact.size_bytes = stamp[1]
+        artifact.file_stamp = stamp
+        self._remember(artifact)
+        return artifact
+
+    def put(self, artifact: ModelArtifact) -> ModelArtifact:
+        """Persist an artifact to disk and keep it resident"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        model_path = self.path_for(artifact.model_key)
+
+        # Write to a temporary file first so readers never see a half-written model
+        tmp_path = f"{model_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        joblib.dump(artifact.to_dict(), tmp_path)
+        os.replace(tmp_path, model_path)
+
+        # Small sidecar so staleness checks don't have to unpickle the model
+        metadata_path = self.metadata_path_for(artifact.model_key)
+        tmp_path = f"{metadata_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                **artifact.metadata,
+                "trained_at": artifact.trained_at.isoformat(),
+                "model_version": artifact.model_version
+            }, f)
+        os.replace(tmp_path, metadata_path)
+
+        artifact.file_stamp = self._file_stamp(model_path)
+        artifact.size_bytes = artifact.file_stamp[1]
+        self._remember(artifact)
+        return artifact
+
+    def get_metadata(self, model_key: str) -> Optional[Dict[str, Any]]:
+        """Read a stored model's metadata without loading the model itself"""
+        metadata_path = self.metadata_path_for(model_key)
+        if not os.path.exists(self.path_for(model_key)) or not os.path.exists(metadata_path):
+            return None
+        with open(metadata_path) as f:
+            return json.load(f)
+
+    def update_metadata(self, model_key: str, updates: Dict[str, Any]):
+        """Merge extra fields (e.g. backtest results) into a stored model's metadata"""
+        metadata = self.get_metadata(model_key)
+        if metadata is None:
+            return
+        metadata_path = self.metadata_path_for(model_key)
+        tmp_path = f"{metadata_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**metadata, **updates}, f)
+        os.replace(tmp_path, metadata_path)
+
+    def list_metadata(self) -> Dict[str, Dict[str, Any]]:
+        """Metadata for every model stored on disk, keyed by model key"""
+        if not os.path.exists(self.cache_dir):
+            return {}
+        suffix = ".meta.json"
+        models = {}
+        for file in os.listdir(self.cache_dir):
+            if file.startswith(MODEL_FILE_PREFIX) and file.endswith(suffix):
+                model_key = file[len(MODEL_FILE_PREFIX):-len(suffix)]
+                metadata = self.get_metadata(model_key)
+                if metadata is not None:
+                    models[model_key] = metadata
+        return models
+
+    def invalidate(self, model_key: Optional[str] = None):
+        """Drop one model (or every model) from memory"""
+        with self._lock:
+            if model_key is None:
+                self._models.clear()
+                self._resident_bytes = 0
+            elif model_key in self._models:
+                self._resident_bytes -= self._models.pop(model_key).size_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "resident_models": len(self._models),
+                "resident_bytes": self._resident_bytes,
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes
+            }
+
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _remember(self, artifact: ModelArtifact):
+        with self._lock:
+            previous = self._models.pop(artifact.model_key, None)
+            if previous is not None:
+                self._resident_bytes -= previous.size_bytes
+
+            self._models[artifact.model_key] = artifact
+            self._resident_bytes += artifact.size_bytes
+
+            # Evict least recently used models until we are back within budget,
+            # always keeping the model that was just inserted
+            while len(self._models) > 1 and (
+                len(self._models) > self.max_models or self._resident_bytes > self.max_bytes
+            ):
+                _, evicted = self._models.popitem(last=False)
+                self._resident_bytes -= evicted.size_bytes
+                self.evictions += 1
+
+
+model_registry = ModelRegistry(
+    cache_dir=settings.MODEL_CACHE_DIR,
+    max_models=settings.MODEL_REGISTRY_MAX_MODELS,
+    max_bytes=settings.MODEL_REGISTRY_MAX_BYTES
+)
@@ -1,15 +1,51 @@
-from typing import List
+from datetime import date
+from typing import List, Dict, Any, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.models.report import Report
+from app.services.rollup_service import EmissionsRollupService
+
 class ReportService:
     def __init__(self, db: Session):
         self.db = db
 
     def generate_report(self, report_type: str, filters: dict = None):
-        return {"report_type": report_type, "filters": filters or {}, "data": []}
+        """Emissions per period and supplier, read from the daily or monthly rollup"""
+        filters = filters or {}
+        start_date = filters.get("start_date")
+        end_date = filters.get("end_date")
+        data = EmissionsRollupService(self.db).get_emissions_by_period(
+            granularity="daily" if report_type == "daily" else "monthly",
+            start_date=date.fromisoformat(str(start_date)[:10]) if start_date else None,
+            end_date=date.fromisoformat(str(end_date)[:10]) if end_date else None,
+            supplier_ids=filters.get("suppliers")
+        )
+        return {"report_type": report_type, "filters": filters, "data": data}
 
     def export_report_pdf(self, report_data):
         return b"PDF_BYTES_PLACEHOLDER"
 
     def export_report_csv(self, report_data):
         return "col1,col2\nval1,val2"
+
+    def get_report_history(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Generated reports, newest first"""
+        reports = self.db.query(Report).order_by(Report.created_at.desc(), Report.id.desc()).offset(skip).limit(limit).all()
+        return [
+            {
+                "id": report.id,
+                "report_type": report.report_type,
+                "report_date": report.report_date,
+                "data_period_start": report.data_period_start,
+                "data_period_end": report.data_period_end,
+                "total_emissions": report.total_emissions,
+                "file_path": report.file_path,
+                "created_at": report.created_at
+            }
+            for report in reports
+        ]
+
+    def get_history_version(self) -> Tuple:
+        """Report count, newest id and newest creation time, which the report history depends on"""
+        return tuple(self.db.query(func.count(Report.id), func.max(Report.id), func.max(Report.created_at)).one())
@@ -0,0 +1,216 @@
+from datetime import date
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterable, NamedTuple, Tuple
+from sqlalchemy import func, delete, insert, select, cast, Date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.carbon_event import CarbonEvent
+from app.models.emissions_rollup import DailyEmissionsRollup, MonthlyEmissionsRollup
+from app.models.event_scope_version import ALL_EVENTS_SCOPE, EventScopeVersion, scope_version_key
+
+ROLLUP_KEY = ("period", "supplier_id", "product_id", "event_type")
+ROLLUP_MODELS = {"daily": DailyEmissionsRollup, "monthly": MonthlyEmissionsRollup}
+
+
+class ScopeVersion(NamedTuple):
+    version: int
+    last_modified: Optional[datetime]
+
+
+class EmissionsRollupService:
+    """Daily and monthly emissions totals per supplier, product and event type
+
+    Every carbon event write adds its emissions to both rollups in the same
+    transaction, so dashboards and reports read a handful of pre-summed rows
+    instead of aggregating the month's events on each request. It also bumps
+    the version counters of the events' suppliers and of all events, which
+    ETags are made from.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_events(self, events: Iterable[CarbonEvent], sign: int = 1):
+        """Add events to the rollups (sign=-1 takes them out again)"""
+        totals: Dict[type, Dict[Tuple, List[float]]] = {DailyEmissionsRollup: {}, MonthlyEmissionsRollup: {}}
+        scopes = set()
+        for event in events:
+            scopes.add(scope_version_key(event.supplier_id))
+            if event.timestamp is None or event.emissions_kg_co2e is None:
+                continue
+            day = event.timestamp.date()
+            for model, period in ((DailyEmissionsRollup, day), (MonthlyEmissionsRollup, day.replace(day=1))):
+                key = (period, event.supplier_id, event.product_id or "", event.event_type)
+                entry = totals[model].setdefault(key, [0.0, 0])
+                entry[0] += sign * float(event.emissions_kg_co2e)
+                entry[1] += sign
+
+        for model, rows in totals.items():
+            if rows:
+                self._upsert(model, [
+                    {**dict(zip(ROLLUP_KEY, key)), "emissions_total": emissions, "event_count": count}
+                    for key, (emissions, count) in rows.items()
+                ])
+        if scopes:
+            self._bump_versions([ALL_EVENTS_SCOPE, *sorted(scopes)])
+
+    def record_event(self, event: CarbonEvent, sign: int = 1):
+        """Add one event to the rollups (sign=-1 takes it out again)"""
+        self.record_events([event], sign)
+
+    def _dialect_insert(self, model):
+        dialect_insert = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        return dialect_insert(model)
+
+    def _upsert(self, model, rows: List[Dict[str, Any]]):
+        # INSERT ... ON CONFLICT DO UPDATE increments in place, so concurrent writers
+        # never lose each other's updates; each key appears once per statement
+        statement = self._dialect_insert(model).values(rows)
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={
+                "emissions_total": model.emissions_total + statement.excluded.emissions_total,
+                "event_count": model.event_count + statement.excluded.event_count,
+                "updated_at": func.now()
+            }
+        ))
+
+    def _bump_versions(self, scope_keys: List[str]):
+        statement = self._dialect_insert(EventScopeVersion).values(
+            [{"scope_key": scope_key, "version": 1} for scope_key in scope_keys]
+        )
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=["scope_key"],
+            set_={"version": EventScopeVersion.version + 1, "updated_at": func.now()}
+        ))
+
+    def get_scope_version(self, supplier_id: Optional[str] = None) -> ScopeVersion:
+        """Version counter and last change of a supplier's events, or of all events; one primary key read"""
+        row = self.db.query(EventScopeVersion.version, EventScopeVersion.updated_at).filter(
+            EventScopeVersion.scope_key == scope_version_key(supplier_id)
+        ).one_or_none()
+        return ScopeVersion(*row) if row else ScopeVersion(0, None)
+
+    def _month_start(self, column):
+        if self.db.get_bind().dialect.name == "postgresql":
+            return cast(func.date_trunc("month", column), Date)
+        return func.date(column, "start of month")
+
+    def rebuild(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, Any]:
+        """Recompute both rollups from carbon_events for the whole months overlapping a date range
+
+        Intended for backfills; without a range every rollup row is rebuilt.
+        """
+        start = start_date.replace(day=1) if start_date else None
+        end = None
+        if end_date:
+            end = date(end_date.year + end_date.month // 12, end_date.month % 12 + 1, 1)
+
+        def in_range(column):
+            conditions = []
+            if start:
+                conditions.append(column >= start)
+            if end:
+                conditions.append(column < end)
+            return conditions
+
+        for model in (DailyEmissionsRollup, MonthlyEmissionsRollup):
+            self.db.execute(delete(model).where(*in_range(model.period)))
+
+        columns = [*ROLLUP_KEY, "emissions_total", "event_count"]
+        day = func.date(CarbonEvent.timestamp)
+        product = func.coalesce(CarbonEvent.product_id, "")
+        self.db.execute(insert(DailyEmissionsRollup).from_select(columns, select(
+            day, CarbonEvent.supplier_id, product, CarbonEvent.event_type,
+            func.sum(CarbonEvent.emissions_kg_co2e), func.count(CarbonEvent.id)
+        ).where(*in_range(CarbonEvent.timestamp)).group_by(
+            day, CarbonEvent.supplier_id, product, CarbonEvent.event_type
+        )))
+
+        # Months are summed from the fresh daily rows rather than from the events again
+        month = self._month_start(DailyEmissionsRollup.period)
+        self.db.execute(insert(MonthlyEmissionsRollup).from_select(columns, select(
+            month, DailyEmissionsRollup.supplier_id, DailyEmissionsRollup.product_id, DailyEmissionsRollup.event_type,
+            func.sum(DailyEmissionsRollup.emissions_total), func.sum(DailyEmissionsRollup.event_count)
+        ).where(*in_range(DailyEmissionsRollup.period)).group_by(
+            month, DailyEmissionsRollup.supplier_id, DailyEmissionsRollup.product_id, DailyEmissionsRollup.event_type
+        )))
+
+        # Backfilled events bypassed record_events, so their scopes' versions move here
+        suppliers = sorted(self.db.scalars(select(CarbonEvent.supplier_id).where(
+            *in_range(CarbonEvent.timestamp)
+        ).distinct()))
+        scope_keys = [ALL_EVENTS_SCOPE, *(scope_version_key(supplier) for supplier in suppliers)]
+        for start in range(0, len(scope_keys), 1000):
+            self._bump_versions(scope_keys[start:start + 1000])
+        self.db.commit()
+
+        return {
+            "start_date": start,
+            "end_date": end,
+            "daily_rows": self.db.query(DailyEmissionsRollup).filter(*in_range(DailyEmissionsRollup.period)).count(),
+            "monthly_rows": self.db.query(MonthlyEmissionsRollup).filter(*in_range(MonthlyEmissionsRollup.period)).count()
+        }
+
+    def get_dashboard_version(self) -> Tuple:
+        """Version and last change of all events, which the dashboard summary depends on"""
+        return tuple(self.get_scope_version())
+
+    def get_dashboard_summary(self, top_suppliers: int = 5) -> Dict[str, Any]:
+        """Current month's total emissions and top suppliers, from the monthly rollup"""
+        current_month = self.db.query(MonthlyEmissionsRollup).filter(
+            MonthlyEmissionsRollup.period == date.today().replace(day=1)
+        )
+        supplier_emissions = func.sum(MonthlyEmissionsRollup.emissions_total)
+
+        total_emissions = current_month.with_entities(supplier_emissions).scalar() or 0
+        top = current_month.with_entities(
+            MonthlyEmissionsRollup.supplier_id,
+            supplier_emissions.label("total_emissions")
+        ).group_by(MonthlyEmissionsRollup.supplier_id).having(
+            func.sum(MonthlyEmissionsRollup.event_count) > 0
+        ).order_by(supplier_emissions.desc()).limit(top_suppliers).all()
+
+        return {
+            "total_emissions_kg_co2e": float(total_emissions),
+            "top_suppliers": [
+                {"supplier_id": supplier.supplier_id, "emissions": float(supplier.total_emissions)}
+                for supplier in top
+            ]
+        }
+
+    def get_emissions_by_period(
+        self,
+        granularity: str = "monthly",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        supplier_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Emissions and event counts per period and supplier from the daily or monthly rollup"""
+        model = ROLLUP_MODELS[granularity]
+        query = self.db.query(model)
+        if start_date:
+            query = query.filter(model.period >= start_date)
+        if end_date:
+            query = query.filter(model.period <= end_date)
+        if supplier_ids:
+            query = query.filter(model.supplier_id.in_(supplier_ids))
+
+        rows = query.with_entities(
+            model.period,
+            model.supplier_id,
+            func.sum(model.emissions_total).label("emissions"),
+            func.sum(model.event_count).label("events")
+        ).group_by(model.period, model.supplier_id).order_by(model.period, model.supplier_id).all()
+
+        return [
+            {
+                "period": row.period.isoformat(),
+                "supplier_id": row.supplier_id,
+                "emissions_kg_co2e": float(row.emissions),
+                "event_count": int(row.events)
+            }
+            for row in rows
+            if row.events
+        ]
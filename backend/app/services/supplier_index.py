@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Callable, NamedTuple
+from sqlalchemy.orm import Session
+import numpy as np
+import threading
+import json
+
+from app.models.forecast_feature import ForecastFeature
+
+# Event types with their own share in a profile; anything else counts as "other"
+EVENT_TYPES = ("transport", "manufacturing", "energy", "waste")
+# Relative weight of the seasonality block against the event-type mix and scale
+SEASONALITY_WEIGHT = 0.5
+PROFILE_SIZE = len(EVENT_TYPES) + 1 + 1 + 7
+
+
+class Neighbor(NamedTuple):
+    supplier_id: str
+    distance: float
+    mean_emissions: float
+
+
+def supplier_profile(row: ForecastFeature) -> Optional[np.ndarray]:
+    """A supplier's event-type mix, scale and weekly seasonality as one vector
+
+    Mix shares are in [0, 1] and scale is log10 of the mean event's emissions, so
+    a tenfold difference in size weighs as much as a completely different mix.
+    """
+    if not row.event_count or not row.emissions_sum or row.emissions_sum <= 0:
+        return None
+    mean_emissions = row.emissions_sum / row.event_count
+
+    type_totals = {event_type: totals[0] for event_type, totals in json.loads(row.event_type_totals or "{}").items()}
+    total = sum(type_totals.values()) or 1.0
+    mix = [type_totals.get(event_type, 0.0) / total for event_type in EVENT_TYPES]
+    mix.append(max(0.0, 1.0 - sum(mix)))
+
+    weekday_sums, weekday_counts = (np.asarray(values, dtype=float) for values in json.loads(row.weekday_totals))
+    weekday_means = weekday_sums / np.maximum(weekday_counts, 1)
+    seasonality = np.where(weekday_counts > 0, np.clip(weekday_means / mean_emissions - 1, -1, 1), 0.0)
+
+    return np.concatenate([mix, [np.log10(mean_emissions)], SEASONALITY_WEIGHT * seasonality])
+
+
+class SupplierSimilarityIndex:
+    """Process-wide nearest-neighbour index over supplier profiles
+
+    Profiles are built from the supplier-level forecast_features rows; refresh()
+    only re-reads rows updated since the previous refresh, so new suppliers and
+    new events are folded in without rebuilding the index.
+    """
+
+    def __init__(self):
+        self._positions: Dict[str, int] = {}
+        self._supplier_ids: List[str] = []
+        self._vectors = np.zeros((0, PROFILE_SIZE))
+        self._mean_emissions = np.zeros(0)
+        self._event_counts = np.zeros(0)
+        self._watermark: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> int:
+        """Fold in supplier profiles changed since the last refresh; returns how many were read"""
+        query = db.query(ForecastFeature).filter(
+            ForecastFeature.supplier_id.isnot(None),
+            ForecastFeature.product_id.is_(None)
+        )
+        with self._lock:
+            watermark = self._watermark
+        if watermark is not None:
+            # Re-read the last second too; some databases store timestamps to the second
+            query = query.filter(ForecastFeature.updated_at >= watermark - timedelta(seconds=1))
+        rows = query.all()
+
+        with self._lock:
+            new_vectors, new_means, new_counts = [], [], []
+            for row in rows:
+                profile = supplier_profile(row)
+                if profile is None:
+                    profile, mean_emissions, event_count = np.zeros(PROFILE_SIZE), 0.0, 0
+                else:
+                    mean_emissions, event_count = row.emissions_sum / row.event_count, row.event_count
+
+                position = self._positions.get(row.supplier_id)
+                if position is None:
+                    self._positions[row.supplier_id] = len(self._supplier_ids)
+                    self._supplier_ids.append(row.supplier_id)
+                    new_vectors.append(profile)
+                    new_means.append(mean_emissions)
+                    new_counts.append(event_count)
+                else:
+                    self._vectors[position] = profile
+                    self._mean_emissions[position] = mean_emissions
+                    self._event_counts[position] = event_count
+
+            if new_vectors:
+                self._vectors = np.vstack([self._vectors, new_vectors])
+                self._mean_emissions = np.concatenate([self._mean_emissions, new_means])
+                self._event_counts = np.concatenate([self._event_counts, new_counts])
+
+            stamps = [row.updated_at for row in rows if row.updated_at is not None]
+            if stamps:
+                self._watermark = max(stamps + ([self._watermark] if self._watermark else []))
+        return len(rows)
+
+    def nearest(
+        self,
+        profile: np.ndarray,
+        k: int,
+        exclude: Optional[str] = None,
+        min_events: int = 0,
+        accept: Optional[Callable[[str], bool]] = None
+    ) -> List[Neighbor]:
+        """The k closest suppliers with at least min_events events that pass accept()"""
+        with self._lock:
+            supplier_ids = list(self._supplier_ids)
+            distances = np.linalg.norm(self._vectors - profile, axis=1)
+            distances[self._event_counts < max(min_events, 1)] = np.inf
+            mean_emissions = self._mean_emissions.copy()
+        if exclude in self._positions:
+            distances[self._positions[exclude]] = np.inf
+
+        neighbors = []
+        for position in np.argsort(distances):
+            if not np.isfinite(distances[position]) or len(neighbors) == k:
+                break
+            supplier_id = supplier_ids[position]
+            if accept is None or accept(supplier_id):
+                neighbors.append(Neighbor(supplier_id, float(distances[position]), float(mean_emissions[position])))
+        return neighbors
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"suppliers": len(self._supplier_ids)}
+
+
+supplier_index = SupplierSimilarityIndex()
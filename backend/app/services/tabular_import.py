@@ -0,0 +1,149 @@
+from datetime import date, datetime
+from typing import Optional, Dict, Any, List, Iterator, BinaryIO
+from openpyxl import load_workbook
+import csv
+import io
+import math
+import os
+import re
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Header spellings accepted for each CarbonEvent field, after normalise_header()
+COLUMN_ALIASES = {
+    "supplier_id": ("supplier_id", "supplier", "supplier_code", "vendor", "vendor_id"),
+    "product_id": ("product_id", "product", "product_code", "sku", "item_id"),
+    "event_type": ("event_type", "type", "category", "activity_type", "emission_type"),
+    "emissions_kg_co2e": ("emissions_kg_co2e", "emissions", "emissions_kg", "co2e_kg", "kg_co2e", "co2e"),
+    "emission_factor": ("emission_factor", "factor"),
+    "timestamp": ("timestamp", "date", "datetime", "event_date", "event_time", "shipment_date", "occurred_at"),
+}
+# Fields every row needs, from its own cells or the upload's defaults
+REQUIRED_FIELDS = ("supplier_id", "event_type", "emissions_kg_co2e", "timestamp")
+# Identifier fields, kept as text even when a spreadsheet stores them as numbers
+TEXT_FIELDS = ("supplier_id", "product_id", "event_type")
+_FIELD_BY_ALIAS = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+
+def tabular_format(content_type: Optional[str], filename: Optional[str]) -> Optional[str]:
+    """"csv" or "xlsx" for spreadsheet uploads, None for documents"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if content_type == XLSX_CONTENT_TYPE or extension == ".xlsx":
+        return "xlsx"
+    if content_type == "text/csv" or extension == ".csv":
+        return "csv"
+    return None
+
+
+def normalise_header(header: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(header if header is not None else "").strip().lower()).strip("_")
+
+
+def map_columns(header: List[Any]) -> List[str]:
+    """The CarbonEvent field each column fills, or its normalised name if it is kept as extracted data
+
+    Only the first column for a field fills it; blank headers map to "".
+    """
+    columns, used = [], set()
+    for name in map(normalise_header, header):
+        field = _FIELD_BY_ALIAS.get(name)
+        if field and field not in used:
+            used.add(field)
+            columns.append(field)
+        else:
+            columns.append(name)
+    return columns
+
+
+class RowReader:
+    """Rows of a CSV or XLSX file one at a time, without loading the whole file
+
+    progress() is the share of the file read so far: the byte position for CSV,
+    and for XLSX, whose byte position in the zipped sheet means nothing, the rows
+    read against the row count in the sheet's dimensions.
+    """
+
+    def __init__(self, fileobj: BinaryIO, file_format: str):
+        self.fileobj = fileobj
+        self.file_format = file_format
+        self.rows_read = 0
+        self.total_rows: Optional[int] = None
+        fileobj.seek(0, os.SEEK_END)
+        self.total_bytes = fileobj.tell()
+        fileobj.seek(0)
+        self._rows = self._read()
+
+    def __iter__(self) -> "RowReader":
+        return self
+
+    def __next__(self) -> List[Any]:
+        row = next(self._rows)
+        self.rows_read += 1
+        return row
+
+    def close(self):
+        self._rows.close()
+
+    def progress(self) -> float:
+        if self.file_format == "xlsx":
+            return min(self.rows_read / self.total_rows, 1.0) if self.total_rows else 0.0
+        return min(self.fileobj.tell() / self.total_bytes, 1.0) if self.total_bytes else 0.0
+
+    def _read(self) -> Iterator[List[Any]]:
+        if self.file_format == "xlsx":
+            # Read-only mode streams rows from the sheet XML instead of building the workbook
+            workbook = load_workbook(self.fileobj, read_only=True, data_only=True)
+            try:
+                sheet = workbook.active
+                self.total_rows = sheet.max_row  # None when the sheet does not record its dimensions
+                for row in sheet.iter_rows(values_only=True):
+                    yield list(row)
+            finally:
+                workbook.close()
+        else:
+            text = io.TextIOWrapper(self.fileobj, encoding="utf-8-sig", newline="")
+            try:
+                yield from csv.reader(text)
+            finally:
+                text.detach()  # Leave the upload's file open for its owner
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _extracted_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return number if math.isfinite(number) else value
+    return value
+
+
+def event_records(rows: Iterator[List[Any]], columns: List[str], defaults: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """CarbonEvent records from data rows, for CarbonEventService.ingest
+
+    Mapped columns fill event fields and the defaults fill any the row leaves
+    empty; every other non-empty cell goes into extracted_data under its column
+    name, so e.g. distance_km and vehicle_type can be queried. Blank rows are skipped.
+    """
+    for row in rows:
+        if all(_is_blank(value) for value in row):
+            continue
+        record, extracted = dict(defaults), {}
+        for name, value in zip(columns, row):
+            if _is_blank(value) or not name:
+                continue
+            if name in TEXT_FIELDS:
+                record[name] = str(value).strip()
+            elif name in COLUMN_ALIASES:
+                record[name] = value.strip() if isinstance(value, str) else value
+            else:
+                extracted[name] = _extracted_value(value)
+        if extracted:
+            record["extracted_data"] = extracted
+        yield record
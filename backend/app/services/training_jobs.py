@@ -0,0 +1,213 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable, Tuple
+import multiprocessing
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+from app.services.model_registry import model_key_for, model_registry
+
+# Finished jobs kept around for status lookups before the oldest are dropped
+MAX_FINISHED_JOBS = 1000
+# Job kinds whose tasks replace model artifacts on disk
+TRAINING_JOB_KINDS = ("train_model", "fleet_retrain")
+
+
+def run_model_training(supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+    """Train one forecast model in a worker process and persist it to the registry"""
+    from app.core.database import SessionLocal
+    from app.services.forecast_service import ForecastService
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        result = ForecastService(db).train_model(supplier_id, product_id)
+    finally:
+        db.close()
+    result["wall_time_seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_model_backtest(supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+    """Backtest one stored forecast model in a worker process and cache its metrics"""
+    from app.core.database import SessionLocal
+    from app.services.forecast_service import ForecastService
+
+    db = SessionLocal()
+    try:
+        return ForecastService(db).backtest_model(supplier_id, product_id)
+    finally:
+        db.close()
+
+
+class TrainingJobQueue:
+    """Runs model training on a process pool and tracks job progress in memory"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active_models: Dict[str, str] = {}
+        # Reentrant so a check-then-submit can hold it across submit(), which takes it too
+        self._lock = threading.RLock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Created lazily so importing the app never spawns worker processes
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(
+        self,
+        kind: str,
+        tasks: List[Tuple[str, Callable, tuple]],
+        details: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Queue a job made of one or more (label, function, args) tasks"""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "details": details or {},
+            "submitted_at": datetime.now(),
+            "finished_at": None,
+            "tasks": {},
+            "results": {},
+            "errors": {}
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+
+        for label, fn, args in tasks:
+            job["tasks"][label] = self.executor.submit(fn, *args)
+        if not tasks:
+            job["finished_at"] = datetime.now()
+            job["details"]["models_updated"] = 0
+
+        # Callbacks are attached once every task is submitted so an early finisher
+        # cannot mark the job complete while the rest are still being queued
+        for label, future in list(job["tasks"].items()):
+            future.add_done_callback(
+                lambda f, label=label: self._on_task_done(job_id, label, f)
+            )
+        return self.get(job_id)
+
+    def submit_model_training(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Queue training for one model, reusing an in-flight job for the same model"""
+        model_key = model_key_for(supplier_id, product_id)
+        # One lock over the check, the submit and the registration, so two callers
+        # asking for the same model cannot both queue it
+        with self._lock:
+            job_id = self._active_models.get(model_key)
+            if job_id is not None:
+                return self.get(job_id)
+
+            job = self.submit("train_model", [(model_key, run_model_training, (supplier_id, product_id))])
+            queued_job = self._jobs.get(job["job_id"])
+            if queued_job is not None and queued_job["finished_at"] is None:
+                self._active_models[model_key] = job["job_id"]
+            return job
+
+    def submit_fleet_training(self, plan: List[Dict[str, Any]], skipped: List[str]) -> Dict[str, Any]:
+        """Queue one training task per planned model; the pool runs them in parallel"""
+        tasks = [
+            (entry["model_key"], run_model_training, (entry["supplier_id"], entry["product_id"]))
+            for entry in plan
+        ]
+        job = self.submit("fleet_retrain", tasks, details={"planned": plan, "skipped": skipped})
+        with self._lock:
+            queued_job = self._jobs.get(job["job_id"])
+            if queued_job is not None and queued_job["finished_at"] is None:
+                for entry in plan:
+                    self._active_models.setdefault(entry["model_key"], job["job_id"])
+        return job
+
+    def submit_backtests(self, scopes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Queue a backtest per model, skipping models already being backtested"""
+        with self._lock:
+            scopes = [scope for scope in scopes if f"backtest:{scope['model_key']}" not in self._active_models]
+            tasks = [
+                (scope["model_key"], run_model_backtest, (scope["supplier_id"], scope["product_id"]))
+                for scope in scopes
+            ]
+            job = self.submit("backtest", tasks)
+            queued_job = self._jobs.get(job["job_id"])
+            if queued_job is not None and queued_job["finished_at"] is None:
+                for scope in scopes:
+                    self._active_models[f"backtest:{scope['model_key']}"] = job["job_id"]
+            return job
+
+    def run_model_training(self, supplier_id: Optional[str], product_id: Optional[str]) -> Dict[str, Any]:
+        """Train one model on the pool and wait for it; blocks, so call it from a worker thread"""
+        job = self.submit_model_training(supplier_id, product_id)
+        with self._lock:
+            future = self._jobs[job["job_id"]]["tasks"][model_key_for(supplier_id, product_id)]
+        return future.result()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a snapshot of a job's status, progress and results"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            futures = list(job["tasks"].values())
+            done = sum(1 for future in futures if future.done())
+            if job["finished_at"] is not None:
+                status = "failed" if job["errors"] else "completed"
+            elif done or any(future.running() for future in futures):
+                status = "running"
+            else:
+                status = "queued"
+
+            return {
+                "job_id": job_id,
+                "kind": job["kind"],
+                "status": status,
+                "details": job["details"],
+                "progress": round(100 * done / len(futures)) if futures else 100,
+                "tasks_total": len(futures),
+                "tasks_completed": done,
+                "submitted_at": job["submitted_at"],
+                "finished_at": job["finished_at"],
+                "results": dict(job["results"]),
+                "errors": dict(job["errors"])
+            }
+
+    def _on_task_done(self, job_id: str, label: str, future: Future):
+        with self._lock:
+            job = self._jobs[job_id]
+        if job["kind"] in TRAINING_JOB_KINDS:
+            # Workers write artifacts to disk; drop any stale resident copy in this process
+            model_registry.invalidate(label)
+
+        with self._lock:
+            if future.cancelled():
+                job["errors"][label] = "cancelled"
+            elif future.exception() is not None:
+                job["errors"][label] = str(future.exception())
+            else:
+                job["results"][label] = future.result()
+
+            if all(task.done() for task in job["tasks"].values()):
+                job["finished_at"] = datetime.now()
+                job["details"]["models_updated"] = len(job["results"])
+                for model_key, active_job_id in list(self._active_models.items()):
+                    if active_job_id == job_id:
+                        del self._active_models[model_key]
+                self._prune_finished()
+
+    def _prune_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+training_jobs = TrainingJobQueue(max_workers=settings.TRAINING_WORKERS)
@@ -0,0 +1,62 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any
+import threading
+
+from app.core.config import settings
+
+
+def run_upload_job(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Process one spooled upload in a worker thread, on its own session"""
+    from app.core.database import SessionLocal
+    from app.services.upload_service import UploadService
+
+    db = SessionLocal()
+    try:
+        return UploadService(db).process_job(upload_id)
+    finally:
+        db.close()
+
+
+class UploadJobQueue:
+    """Runs spooled uploads on a thread pool
+
+    Jobs are tracked in the upload_jobs table rather than in memory, so their
+    status can be read from any API process and survives a restart.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Created lazily so importing the app never starts worker threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="upload")
+            return self._executor
+
+    def submit(self, upload_id: str) -> Future:
+        """Queue a spooled upload; it runs once a worker is free"""
+        return self.executor.submit(run_upload_job, upload_id)
+
+    def resume(self) -> int:
+        """Queue again the jobs still waiting in the table, e.g. after a restart"""
+        from app.core.database import SessionLocal
+        from app.models.upload_job import UploadJob
+
+        db = SessionLocal()
+        try:
+            upload_ids = [
+                upload_id for (upload_id,) in
+                db.query(UploadJob.upload_id).filter(UploadJob.status == "queued").order_by(UploadJob.id)
+            ]
+        finally:
+            db.close()
+        for upload_id in upload_ids:
+            self.submit(upload_id)
+        return len(upload_ids)
+
+
+upload_jobs = UploadJobQueue(max_workers=settings.UPLOAD_WORKERS)
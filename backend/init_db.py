@@ -1,17 +1,25 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, insert, text
 from app.core.database import Base, engine
+from app.core.migrations import upgrade_schema
 from app.models.carbon_event import CarbonEvent
+from app.models.emissions_rollup import DailyEmissionsRollup, MonthlyEmissionsRollup
+from app.models.event_scope_version import EventScopeVersion
 from app.models.forecast import Forecast
+from app.models.forecast_feature import ForecastFeature
 from app.models.incentive import Incentive
 from app.models.report import Report
+from app.models.upload_job import UploadJob
 from datetime import datetime, timedelta
 import json
 
+from rebuild_rollups import rebuild_rollups
+
 def init_database():
     """Initialize the database with tables and sample data"""
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     
     # Create a connection to insert sample data
     with engine.connect() as conn:
@@ -30,11 +38,11 @@ def init_database():
                 'timestamp': datetime.now() - timedelta(days=1),
                 'verification_status': 'verified',
                 'source_document': 'invoice_001.pdf',
-                'extracted_data': json.dumps({
+                'extracted_data': {
                     'fuel_consumption': 500.0,
                     'distance_km': 2000.0,
                     'vehicle_type': 'diesel_truck'
-                }),
+                },
                 'confidence_score': 0.95
             },
             {
@@ -44,11 +52,11 @@ def init_database():
                 'timestamp': datetime.now() - timedelta(days=2),
                 'verification_status': 'verified',
                 'source_document': 'manufacturing_report_001.pdf',
-                'extracted_data': json.dumps({
+                'extracted_data': {
                     'energy_consumption': 2500.0,
                     'raw_materials': 1000.0,
                     'waste_generated': 50.0
-                }),
+                },
                 'confidence_score': 0.92
             },
             {
@@ -58,10 +66,10 @@ def init_database():
                 'timestamp': datetime.now() - timedelta(days=3),
                 'verification_status': 'verified',
                 'source_document': 'utility_bill_001.pdf',
-                'extracted_data': json.dumps({
+                'extracted_data': {
                     'electricity_consumption': 1500.0,
                     'gas_consumption': 200.0
-                }),
+                },
                 'confidence_score': 0.88
             },
             {
@@ -71,11 +79,11 @@ def init_database():
                 'timestamp': datetime.now() - timedelta(days=4),
                 'verification_status': 'verified',
                 'source_document': 'transport_log_001.csv',
-                'extracted_data': json.dumps({
+                'extracted_data': {
                     'fuel_consumption': 800.0,
                     'distance_km': 3500.0,
                     'vehicle_type': 'refrigerated_truck'
-                }),
+                },
                 'confidence_score': 0.94
             },
             {
@@ -85,27 +93,20 @@ def init_database():
                 'timestamp': datetime.now() - timedelta(days=5),
                 'verification_status': 'verified',
                 'source_document': 'waste_report_001.pdf',
-                'extracted_data': json.dumps({
+                'extracted_data': {
                     'waste_volume': 100.0,
                     'waste_type': 'industrial',
                     'disposal_method': 'landfill'
-                }),
+                },
                 'confidence_score': 0.87
             }
         ]
         
-        for event in sample_events:
-            conn.execute(text("""
-                INSERT INTO carbon_events 
-                (supplier_id, event_type, emissions_kg_co2e, timestamp, verification_status, 
-                 source_document, extracted_data, confidence_score, created_at, updated_at)
-                VALUES (:supplier_id, :event_type, :emissions_kg_co2e, :timestamp, :verification_status,
-                        :source_document, :extracted_data, :confidence_score, :created_at, :updated_at)
-            """), {
-                **event,
-                'created_at': datetime.now(),
-                'updated_at': datetime.now()
-            })
+        # Bound through the JSONDocument column type, so documents are stored as JSON
+        conn.execute(insert(CarbonEvent), [
+            {**event, 'created_at': datetime.now(), 'updated_at': datetime.now()}
+            for event in sample_events
+        ])
         
         # Insert sample forecasts
         sample_forecasts = [
@@ -239,7 +240,10 @@ def init_database():
             })
         
         conn.commit()
-        print("Database initialized successfully with sample data!")
+    
+    # Sample events were inserted directly, so fill the rollups from them
+    rebuild_rollups()
+    print("Database initialized successfully with sample data!")
 
 if __name__ == "__main__":
     init_database() 
\ No newline at end of file
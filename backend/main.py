@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -6,14 +7,24 @@ import uvicorn
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.database import engine, Base
+from app.core.migrations import upgrade_schema
+from app.services.upload_jobs import upload_jobs
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uploads spooled before a restart are still waiting in the job table
+    upload_jobs.resume()
+    yield
 
 app = FastAPI(
     title="ESG Carbon Optimizer API",
     description="AI-powered carbon emissions tracking and optimization platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
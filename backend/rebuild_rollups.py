@@ -0,0 +1,27 @@
+from datetime import date
+import argparse
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.migrations import upgrade_schema
+from app.models.emissions_rollup import DailyEmissionsRollup, MonthlyEmissionsRollup
+from app.services.rollup_service import EmissionsRollupService
+
+def rebuild_rollups(start_date: date = None, end_date: date = None):
+    """Recompute the daily and monthly emissions rollups from carbon_events"""
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    
+    db = SessionLocal()
+    try:
+        result = EmissionsRollupService(db).rebuild(start_date, end_date)
+    finally:
+        db.close()
+    
+    print(f"Rebuilt {result['daily_rows']} daily and {result['monthly_rows']} monthly rollup rows.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the emissions rollup tables from carbon_events")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD); whole months are rebuilt")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD); whole months are rebuilt")
+    args = parser.parse_args()
+    rebuild_rollups(args.start, args.end)
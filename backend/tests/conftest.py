@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import, so point the app at a throwaway database and upload dir first
+_workdir = tempfile.mkdtemp(prefix="esg-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_workdir, "uploads")
+os.environ["MODEL_CACHE_DIR"] = os.path.join(_workdir, "models")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import SessionLocal  # noqa: E402
+from main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def make_event(supplier_id: str, emissions: float = 5.0, timestamp: str = "2026-10-01T00:00:00", **fields):
+    return {
+        "supplier_id": supplier_id,
+        "event_type": "transport",
+        "emissions_kg_co2e": emissions,
+        "timestamp": timestamp,
+        **fields
+    }
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import date, datetime
+
+from app.core.database import AsyncSessionLocal, async_database_url
+from app.models.emissions_rollup import DailyEmissionsRollup
+from app.services.carbon_event_service import AsyncCarbonEventService
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def test_async_engine_uses_each_backends_asyncio_driver():
+    assert async_database_url("sqlite:///./walmart_esg.db").drivername == "sqlite+aiosqlite"
+    assert async_database_url("postgresql://user@db/esg").drivername == "postgresql+asyncpg"
+
+
+def test_async_service_writes_keep_rollups_in_step(db):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            service = AsyncCarbonEventService(session)
+            event = await service.create_event({
+                "supplier_id": "AD-A", "event_type": "energy", "emissions_kg_co2e": 4.0, "timestamp": datetime(2026, 10, 2)
+            })
+            await service.update_event(event, {"emissions_kg_co2e": 6.0})
+            rows, _ = await service.list_events(supplier_id="AD-A", fields=["id", "emissions_kg_co2e"])
+            return event.id, rows
+
+    event_id, rows = asyncio.run(scenario())
+
+    assert rows == [{"id": event_id, "emissions_kg_co2e": 6.0}]
+    rollup = db.query(DailyEmissionsRollup).filter(
+        DailyEmissionsRollup.supplier_id == "AD-A", DailyEmissionsRollup.period == date(2026, 10, 2)
+    ).one()
+    assert (rollup.event_count, rollup.emissions_total) == (1, 6.0)
+
+
+def test_concurrent_reads_each_get_a_session(client):
+    created = client.post(f"{EVENTS}bulk", json=[make_event("AD-C", float(i + 1)) for i in range(3)]).json()
+    assert created["inserted"] == 3
+
+    async def read():
+        async with AsyncSessionLocal() as session:
+            rows, _ = await AsyncCarbonEventService(session).list_events(supplier_id="AD-C", fields=["emissions_kg_co2e"])
+            return [row["emissions_kg_co2e"] for row in rows]
+
+    async def read_concurrently():
+        return await asyncio.gather(*(read() for _ in range(8)))
+
+    assert asyncio.run(read_concurrently()) == [[1.0, 2.0, 3.0]] * 8
+
+
+def test_event_lifecycle_through_async_endpoints(client):
+    event_id = client.post(EVENTS, json=make_event("AD-L", 3.0)).json()["id"]
+
+    updated = client.put(f"{EVENTS}{event_id}", json={"emissions_kg_co2e": 7.5}).json()
+    assert updated["emissions_kg_co2e"] == 7.5
+    assert client.get(f"{EVENTS}{event_id}").json()["emissions_kg_co2e"] == 7.5
+
+    assert client.delete(f"{EVENTS}{event_id}").status_code == 200
+    assert client.get(f"{EVENTS}{event_id}").status_code == 404
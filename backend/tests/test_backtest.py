@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from app.services.forecast_service import ForecastService
+from conftest import make_event
+
+START = datetime(2026, 1, 1, 9)
+
+
+def _history(client, supplier_id, days):
+    records = [
+        make_event(supplier_id, 100.0 + 15 * ((START + timedelta(days=day)).weekday()), timestamp=(START + timedelta(days=day)).isoformat())
+        for day in range(days)
+    ]
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == days
+
+
+def test_backtest_scores_held_out_windows_and_caches_them_per_fit(client, db):
+    _history(client, "BT-A", 200)
+    service = ForecastService(db)
+    service.train_model("BT-A", None)
+
+    accuracy = service.backtest_model("BT-A", None)
+
+    assert (accuracy["folds"], accuracy["test_points"]) == (3, 90)
+    # A clean weekly pattern is easy to predict from calendar features
+    assert accuracy["overall_accuracy"] > 0.9
+    assert accuracy["mae"] <= accuracy["rmse"]
+    assert service._get_model_accuracy("BT-A_None") == accuracy["overall_accuracy"]
+
+    # A refit has a new model version, so the cached metrics no longer apply
+    service.train_model("BT-A", None)
+    assert service._get_model_accuracy("BT-A_None") is None
+
+
+def test_folds_without_enough_training_history_are_skipped(client, db):
+    _history(client, "BT-B", 60)
+    service = ForecastService(db)
+    service.train_model("BT-B", None)
+
+    accuracy = service.backtest_model("BT-B", None)
+
+    assert (accuracy["folds"], accuracy["test_points"]) == (1, 30)
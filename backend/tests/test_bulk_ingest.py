@@ -0,0 +1,37 @@
+import json
+
+from app.core.config import settings
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def test_bulk_ingest_reports_bad_rows_and_keeps_the_rest(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INSERT_CHUNK_ROWS", 2)
+    records = [
+        make_event("BI-A"),
+        make_event("BI-A", -1.0),
+        make_event("BI-A"),
+        {"supplier_id": "BI-A"},
+        make_event("BI-A")
+    ]
+    summary = client.post(f"{EVENTS}bulk", json=records).json()
+
+    assert (summary["received"], summary["inserted"], summary["failed"]) == (5, 3, 2)
+    assert [error["index"] for error in summary["errors"]] == [1, 3]
+    assert len(client.get(EVENTS, params={"supplier_id": "BI-A"}).json()) == 3
+
+
+def test_ndjson_body_is_ingested_line_by_line(client):
+    lines = [json.dumps(make_event("BI-N", float(i + 1))) for i in range(3)] + ["{not json", ""]
+    summary = client.post(
+        f"{EVENTS}bulk", content="\n".join(lines).encode(), headers={"content-type": "application/x-ndjson"}
+    ).json()
+
+    assert (summary["received"], summary["inserted"], summary["failed"]) == (4, 3, 1)
+    assert [error["index"] for error in summary["errors"]] == [3]
+    assert sorted(row["emissions_kg_co2e"] for row in client.get(EVENTS, params={"supplier_id": "BI-N"}).json()) == [1.0, 2.0, 3.0]
+
+
+def test_body_that_is_not_an_array_is_rejected(client):
+    assert client.post(f"{EVENTS}bulk", json=make_event("BI-X")).status_code == 400
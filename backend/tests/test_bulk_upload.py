@@ -0,0 +1,54 @@
+from app.core.database import SessionLocal
+from app.models.upload_job import UploadJob
+from app.services import upload_service
+
+HEADER = b"supplier_id,event_type,emissions_kg_co2e,timestamp\n"
+
+
+def _csv(supplier_id, rows):
+    return HEADER + b"".join(b"%s,transport,%d,2026-10-01T00:00:00\n" % (supplier_id, i + 1) for i in range(rows))
+
+
+def _post(client, contents):
+    files = [("files", (f"events_{i}.csv", content, "text/csv")) for i, content in enumerate(contents)]
+    return client.post("/api/v1/upload/bulk", files=files, data={"supplier_id": "BU-A"}).json()
+
+
+def test_repeats_within_a_batch_are_parsed_once(client, monkeypatch):
+    parsed = []
+    parse = upload_service.parse_bulk_file
+    monkeypatch.setattr(upload_service, "parse_bulk_file", lambda entry: parsed.append(entry["filename"]) or parse(entry))
+    batch = _post(client, [_csv(b"BU-A", 3), _csv(b"BU-A", 3), _csv(b"BU-B", 2)])
+
+    first, repeat, other = batch["results"]
+    assert sorted(parsed) == ["events_0.csv", "events_2.csv"]
+    assert first["status"] == other["status"] == "success"
+    assert repeat["status"] == "duplicate"
+    assert repeat["duplicate_of"] == first["upload_id"]
+    assert repeat["event_id_ranges"] == first["event_id_ranges"]
+    assert batch["stats"]["events_inserted"] == 5
+    assert batch["stats"]["duplicates"] == 1
+
+    status = client.get(f"/api/v1/upload/status/{repeat['upload_id']}").json()
+    assert (status["status"], status["rows_inserted"], status["duplicate_of"]) == ("completed", 3, first["upload_id"])
+
+
+def test_every_job_is_queued_before_any_file_is_parsed(client, monkeypatch):
+    seen = []
+    parse = upload_service.parse_bulk_file
+
+    def parse_after_looking(entry):
+        db = SessionLocal()
+        try:
+            seen.append({job.filename: job.status for job in db.query(UploadJob).filter(UploadJob.supplier_id == "BU-Q")})
+        finally:
+            db.close()
+        parse(entry)
+
+    monkeypatch.setattr(upload_service, "parse_bulk_file", parse_after_looking)
+    files = [("files", (f"queued_{i}.csv", _csv(b"BU-Q", i + 1), "text/csv")) for i in range(3)]
+    client.post("/api/v1/upload/bulk", files=files, data={"supplier_id": "BU-Q"})
+
+    assert len(seen) == 3
+    assert set(seen[0]) == {"queued_0.csv", "queued_1.csv", "queued_2.csv"}
+    assert all(status in ("queued", "processing", "completed") for status in seen[0].values())
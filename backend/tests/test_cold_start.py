@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.services.forecast_service import ForecastService
+from conftest import make_event
+
+START = datetime(2026, 6, 1, 9)
+
+
+def _history(supplier_id, days, emissions):
+    # Waste-only suppliers far larger than any other in the tests, so they are each other's nearest neighbours
+    return [
+        make_event(supplier_id, emissions, timestamp=(START + timedelta(days=day)).isoformat(), event_type="waste")
+        for day in range(days)
+    ]
+
+
+@pytest.fixture(scope="module")
+def neighbours(client):
+    records = _history("CS-A", 40, 100000.0) + _history("CS-B", 40, 120000.0)
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == 80
+
+    db = SessionLocal()
+    try:
+        service = ForecastService(db)
+        for supplier_id in ("CS-A", "CS-B"):
+            service.train_model(supplier_id, None)
+    finally:
+        db.close()
+
+
+def test_supplier_without_a_model_is_forecast_from_similar_suppliers(client, neighbours):
+    assert client.post("/api/v1/carbon-events/bulk", json=_history("CS-NEW", 5, 200000.0)).json()["inserted"] == 5
+
+    forecast = client.post(
+        "/api/v1/forecast/", json={"supplier_id": "CS-NEW", "forecast_horizon_days": 7, "engine": "random_forest"}
+    ).json()
+
+    assert forecast["fallback_model"] is True
+    assert sorted(forecast["similar_suppliers"][:2]) == ["CS-A", "CS-B"]
+    # Neighbour forecasts are rescaled to the new supplier's own size
+    assert all(point["predicted_emissions"] > 50000 for point in forecast["forecast_data"])
+
+
+def test_supplier_with_its_own_model_is_not_pooled(client, neighbours):
+    forecast = client.post(
+        "/api/v1/forecast/", json={"supplier_id": "CS-A", "forecast_horizon_days": 7, "engine": "random_forest"}
+    ).json()
+
+    assert forecast["fallback_model"] is False
+    assert forecast["similar_suppliers"] is None
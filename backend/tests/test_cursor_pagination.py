@@ -0,0 +1,51 @@
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def _walk(client, supplier_id, limit, on_page=None):
+    seen, cursor = [], None
+    while True:
+        params = {"supplier_id": supplier_id, "limit": limit, "fields": "id"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(EVENTS, params=params)
+        seen += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+        if on_page:
+            on_page()
+
+
+def test_cursor_walk_over_tied_timestamps_sees_each_event_once(client):
+    created = client.post(f"{EVENTS}bulk", json=[make_event("KS-A", float(i + 1)) for i in range(7)]).json()
+    assert created["inserted"] == 7
+
+    seen = _walk(client, "KS-A", 3)
+
+    assert len(seen) == 7
+    assert seen == sorted(set(seen))
+
+
+def test_inserts_during_a_walk_do_not_shift_later_pages(client):
+    records = [make_event("KS-B", timestamp=f"2026-10-0{day}T00:00:00") for day in range(2, 8)]
+    assert client.post(f"{EVENTS}bulk", json=records).json()["inserted"] == 6
+    inserted = []
+
+    def insert_behind_and_ahead():
+        # One event before the walk's position and one after it, after every page
+        for timestamp in ("2026-10-01T00:00:00", "2026-10-09T00:00:00"):
+            inserted.append(client.post(EVENTS, json=make_event("KS-B", timestamp=timestamp)).json()["id"])
+
+    seen = _walk(client, "KS-B", 2, on_page=insert_behind_and_ahead)
+
+    assert len(seen) == len(set(seen))
+    behind, ahead = inserted[::2], inserted[1::2]
+    assert not set(behind) & set(seen)
+    assert set(ahead) <= set(seen)
+
+
+def test_malformed_cursor_is_rejected(client):
+    response = client.get(EVENTS, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.services.feature_store import history_feature_matrix
+from app.services.forecast_service import ForecastService
+from conftest import make_event
+
+START = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=10)
+
+
+def test_daily_training_data_is_aggregated_in_sql(client, db):
+    # Several events on some days, at different times of day, and a gap
+    events = [
+        (0, 8, 10.0), (0, 17, 30.0), (1, 9, 5.0), (3, 0, 12.0), (3, 12, 18.0), (3, 23, 30.0)
+    ]
+    records = [
+        make_event("DA-A", emissions, timestamp=(START + timedelta(days=day, hours=hour)).isoformat())
+        for day, hour, emissions in events
+    ]
+    client.post("/api/v1/carbon-events/bulk", json=records)
+
+    service = ForecastService(db)
+    days, emissions, counts = service._load_daily_training_data(service._training_query("DA-A", None))
+
+    expected = pd.DataFrame(events, columns=["day", "hour", "emissions"]).groupby("day")["emissions"].agg(["mean", "count"])
+    assert list(days) == [pd.Timestamp(START + timedelta(days=day)) for day in expected.index]
+    assert emissions.tolist() == expected["mean"].tolist()
+    assert counts.tolist() == expected["count"].tolist()
+
+
+def test_history_features_only_use_earlier_days():
+    days = pd.date_range("2026-10-01", periods=5, freq="D")
+    means = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
+    counts = np.array([1.0, 2.0, 1.0, 1.0, 4.0])
+
+    X = history_feature_matrix(days, means, counts)
+
+    assert np.isnan(X[0]).all()
+    # recent_avg on the third day is the event-weighted mean of the first two
+    assert X[2, 0] == (10.0 * 1 + 20.0 * 2) / 3
+    # lag_1 is the previous day's mean; changing a later day leaves earlier rows alone
+    assert X[3, 3] == 30.0
+    later = history_feature_matrix(days, np.array([10.0, 20.0, 30.0, 40.0, 500.0]), counts)
+    assert np.array_equal(X[:5], later[:5], equal_nan=True)
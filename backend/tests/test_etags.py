@@ -0,0 +1,57 @@
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import event
+
+from app.core.database import engine
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def test_conditional_get_until_a_write_changes_the_scope(client):
+    params = {"supplier_id": "ET-A"}
+    client.post(EVENTS, json=make_event("ET-A"))
+    etag = client.get(EVENTS, params=params).headers["ETag"]
+
+    assert client.get(EVENTS, params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    client.post(EVENTS, json=make_event("ET-A", 7.0))
+    response = client.get(EVENTS, params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_single_event_is_revalidated_against_the_all_events_version(client):
+    event_id = client.post(EVENTS, json=make_event("ET-B")).json()["id"]
+    etag = client.get(f"{EVENTS}{event_id}").headers["ETag"]
+
+    assert client.get(f"{EVENTS}{event_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"{EVENTS}{event_id}", json={"emissions_kg_co2e": 8.0})
+    response = client.get(f"{EVENTS}{event_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["emissions_kg_co2e"] == 8.0
+
+
+def test_unchanged_forecast_poll_skips_history_and_forecast(client):
+    today = datetime.combine(datetime.now().date(), time(9))
+    records = [make_event("ET-F", 100.0 + day % 7, timestamp=(today - timedelta(days=day)).isoformat()) for day in range(21)]
+    client.post(f"{EVENTS}bulk", json=records)
+    url = "/api/v1/forecast/supplier/ET-F"
+    etag = client.get(url, params={"horizon_days": 7}).headers["ETag"]
+
+    seen = []
+    record = lambda conn, cursor, statement, *args: seen.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url, params={"horizon_days": 7}, headers={"If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 304
+    assert not [statement for statement in seen if "carbon_events" in statement]
+
+    client.post(EVENTS, json=make_event("ET-F", 900.0, timestamp=today.isoformat()))
+    response = client.get(url, params={"horizon_days": 7}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
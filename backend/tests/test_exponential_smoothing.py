@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from app.services.forecast_service import ExponentialSmoothingEngine
+
+# Emissions by weekday, Monday first
+WEEKLY_PATTERN = np.array([100.0, 120.0, 140.0, 160.0, 180.0, 60.0, 40.0])
+
+
+def _weekly_series(end: str, weeks: int = 8):
+    days = pd.date_range(end=end, periods=7 * weeks, freq="D")
+    return days, WEEKLY_PATTERN[days.dayofweek]
+
+
+def test_forecast_puts_the_weekly_pattern_on_the_right_weekdays():
+    days, y = _weekly_series("2026-10-14")
+    engine = ExponentialSmoothingEngine().fit(days, y)
+
+    # Starts on the last fitted day, as a forecast made on a day with events does
+    future_dates = pd.date_range("2026-10-14", periods=14, freq="D")
+    predicted = engine.forecast(future_dates, 0.95, {})["predicted"]
+
+    np.testing.assert_allclose(predicted, WEEKLY_PATTERN[future_dates.dayofweek], rtol=0.05)
+
+
+def test_batch_forecast_aligns_series_ending_on_different_days():
+    histories = [_weekly_series("2026-10-10"), _weekly_series("2026-10-14")]
+    engine = ExponentialSmoothingEngine().fit_batch(histories)
+
+    future_dates = pd.date_range("2026-10-15", periods=7, freq="D")
+    predicted = engine.forecast_batch(future_dates, 0.95)["predicted"]
+
+    for series in predicted:
+        np.testing.assert_allclose(series, WEEKLY_PATTERN[future_dates.dayofweek], rtol=0.05)
+
+
+def test_interval_contains_the_forecast_and_widens_with_the_horizon():
+    days, y = _weekly_series("2026-10-14")
+    y = y + np.random.default_rng(0).normal(0, 5, len(y))
+    engine = ExponentialSmoothingEngine().fit(days, y)
+
+    result = engine.forecast(pd.date_range("2026-10-15", periods=30, freq="D"), 0.9, {})
+    width = result["upper"] - result["lower"]
+
+    assert np.all(result["lower"] <= result["predicted"])
+    assert np.all(result["predicted"] <= result["upper"])
+    assert width[-1] > width[0]
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pytest
+
+from conftest import make_event
+
+EXPORT = "/api/v1/carbon-events/export"
+EXTRACTED = {"distance_km": 1000.0, "vehicle_type": "diesel_truck"}
+
+
+@pytest.fixture(scope="module")
+def exported_events(client):
+    records = [make_event("EX-A", float(i + 1), extracted_data=EXTRACTED) for i in range(3)]
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == 3
+
+
+def test_ndjson_export_keeps_json_documents_as_objects(client, exported_events):
+    response = client.get(EXPORT, params={"format": "ndjson", "supplier_id": "EX-A"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["emissions_kg_co2e"] for row in rows] == [1.0, 2.0, 3.0]
+    assert all(row["extracted_data"] == EXTRACTED for row in rows)
+
+
+def test_csv_export_writes_json_documents_as_json_text(client, exported_events):
+    response = client.get(EXPORT, params={"format": "csv", "supplier_id": "EX-A"})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert all(json.loads(row["extracted_data"]) == EXTRACTED for row in rows)
+
+
+def test_arrow_export_streams_typed_columns(client, exported_events):
+    response = client.get(EXPORT, params={"format": "arrow", "supplier_id": "EX-A"})
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 3
+    assert table.schema.field("emissions_kg_co2e").type == pa.float64()
+    assert [json.loads(value) for value in table.column("extracted_data").to_pylist()] == [EXTRACTED] * 3
+
+
+def test_empty_csv_export_still_has_its_header(client):
+    response = client.get(EXPORT, params={"format": "csv", "supplier_id": "EX-NONE"})
+
+    assert response.text.splitlines()[0].startswith("id,")
+    assert len(response.text.splitlines()) == 1
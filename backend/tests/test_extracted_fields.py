@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+SUMMARY = "/api/v1/carbon-events/extracted/summary"
+
+
+@pytest.fixture(scope="module")
+def extracted_events(client):
+    records = [
+        make_event("XF-A", 10.0, extracted_data={"distance_km": "1,200", "vehicle_type": "diesel_truck"}),
+        make_event("XF-A", 20.0, extracted_data={"distance_km": 800, "vehicle_type": "diesel_truck"}),
+        make_event("XF-A", 30.0, extracted_data={"distance_km": 2500.0, "vehicle_type": "electric_van"}),
+        make_event("XF-A", 40.0, extracted_data={"distance_km": "n/a", "vehicle_type": "electric_van"})
+    ]
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == 4
+
+
+def test_numeric_fields_are_stored_as_numbers(client, extracted_events):
+    rows = client.get(EVENTS, params={"supplier_id": "XF-A"}).json()
+
+    assert [row["extracted_data"].get("distance_km") for row in rows] == [1200.0, 800.0, 2500.0, None]
+    assert rows[3]["extracted_data"] == {"vehicle_type": "electric_van"}
+
+
+def test_where_filters_compare_numbers(client, extracted_events):
+    rows = client.get(EVENTS, params={"supplier_id": "XF-A", "where": ["distance_km:gte:1000"]}).json()
+    assert [row["emissions_kg_co2e"] for row in rows] == [10.0, 30.0]
+
+    rows = client.get(EVENTS, params={
+        "supplier_id": "XF-A", "where": ["distance_km:lt:2000", "vehicle_type:eq:diesel_truck"]
+    }).json()
+    assert [row["emissions_kg_co2e"] for row in rows] == [10.0, 20.0]
+
+
+def test_invalid_where_filter_is_rejected(client, extracted_events):
+    response = client.get(EVENTS, params={"where": ["distance_km:gte:far"]})
+    assert response.status_code == 400
+
+
+def test_summary_totals_field_by_group(client, extracted_events):
+    response = client.get(SUMMARY, params={"supplier_id": "XF-A", "field": "distance_km", "group_by": "vehicle_type"})
+
+    groups = {group["group"]: group for group in response.json()["groups"]}
+    assert groups["diesel_truck"]["event_count"] == 2
+    assert groups["diesel_truck"]["total"] == 2000.0
+    # Only events that report the field count
+    assert groups["electric_van"]["event_count"] == 1
+    assert groups["electric_van"]["emissions_kg_co2e"] == 30.0
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.carbon_event import CarbonEvent
+from app.models.forecast_feature import ForecastFeature
+from app.services.feature_store import FeatureStore, history_feature_matrix
+from app.services.model_registry import model_key_for
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def _feature_totals(db, supplier_id):
+    row = db.query(ForecastFeature).filter(ForecastFeature.scope_key == model_key_for(supplier_id, None)).one()
+    return row.event_count, round(row.emissions_sum, 6)
+
+
+def test_writes_keep_feature_store_totals_in_step(client, db):
+    event_id = client.post(EVENTS, json=make_event("FS-A", 5.0)).json()["id"]
+    assert _feature_totals(db, "FS-A") == (1, 5.0)
+
+    client.put(f"{EVENTS}{event_id}", json={"emissions_kg_co2e": 9.0})
+    db.expire_all()
+    assert _feature_totals(db, "FS-A") == (1, 9.0)
+
+    client.put(f"{EVENTS}{event_id}", json={"supplier_id": "FS-B"})
+    db.expire_all()
+    assert _feature_totals(db, "FS-A") == (0, 0.0)
+    assert _feature_totals(db, "FS-B") == (1, 9.0)
+
+    client.delete(f"{EVENTS}{event_id}")
+    db.expire_all()
+    assert _feature_totals(db, "FS-B") == (0, 0.0)
+
+
+def test_served_features_match_the_training_features_of_the_next_day(client, db):
+    start = datetime(2026, 9, 1, 10)
+    daily = {0: [4.0, 6.0], 1: [7.0], 3: [3.0, 5.0, 10.0], 7: [8.0], 8: [12.0], 9: [2.0, 4.0]}
+    records = [
+        make_event("FS-C", emissions, timestamp=(start + timedelta(days=day, hours=i)).isoformat())
+        for day, values in daily.items() for i, emissions in enumerate(values)
+    ]
+    client.post(f"{EVENTS}bulk", json=records)
+
+    features = FeatureStore(db).get_features("FS-C", None)
+
+    days = pd.DatetimeIndex([start.date() + timedelta(days=day) for day in daily] + [start.date() + timedelta(days=10)])
+    means = np.array([np.mean(values) for values in daily.values()] + [0.0])
+    counts = np.array([len(values) for values in daily.values()] + [1.0])
+    next_day = history_feature_matrix(days, means, counts)[-1]
+    served = [features[name] for name in ("recent_avg", "recent_trend", "volatility", "lag_1", "lag_7")]
+    assert served == pytest.approx(next_day[:5].tolist())
+    assert features["weekday_means"][days[-1].dayofweek] == pytest.approx(next_day[5])
+    assert features["event_count"] == 10
+
+
+def test_scope_written_before_the_store_is_seeded_from_its_events(db):
+    db.add_all([
+        CarbonEvent(supplier_id="FS-D", event_type="transport", emissions_kg_co2e=emissions, timestamp=datetime(2026, 9, 1 + i))
+        for i, emissions in enumerate([1.0, 2.0, 3.0])
+    ])
+    db.commit()
+
+    row = FeatureStore(db).get_scope("FS-D", None)
+
+    assert (row.event_count, row.emissions_sum) == (3, 6.0)
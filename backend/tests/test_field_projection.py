@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+from app.core.database import async_engine
+from app.schemas.carbon_event import CarbonEventResponse
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def test_default_listing_matches_the_response_model(client):
+    event_id = client.post(EVENTS, json=make_event("FP-A", 2.5, extracted_data={"distance_km": 40})).json()["id"]
+
+    rows = client.get(EVENTS, params={"supplier_id": "FP-A"}).json()
+
+    assert [row["id"] for row in rows] == [event_id]
+    assert CarbonEventResponse.model_validate(rows[0]).model_dump(mode="json") == rows[0]
+
+
+def test_only_requested_fields_are_selected(client):
+    client.post(EVENTS, json=make_event("FP-B", 2.5, extracted_data={"distance_km": 40}))
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        rows = client.get(EVENTS, params={"supplier_id": "FP-B", "fields": "id, emissions_kg_co2e,id"}).json()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert [set(row) for row in rows] == [{"id", "emissions_kg_co2e"}]
+    listing = next(statement for statement in statements if "FROM carbon_events" in statement)
+    assert "extracted_data" not in listing
+    assert "audit_trail" not in listing
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get(EVENTS, params={"fields": "id,password"})
+
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from app.services.forecast_service import ForecastService
+from conftest import make_event
+
+START = datetime(2026, 1, 1, 9)
+
+
+def _history(supplier_id, days):
+    return [make_event(supplier_id, 20.0 + day % 7, timestamp=(START + timedelta(days=day)).isoformat()) for day in range(days)]
+
+
+def _plan(db, keys):
+    plan, skipped = ForecastService(db).plan_fleet_retrain()
+    return {entry["model_key"]: entry["staleness"] for entry in plan if entry["model_key"] in keys}, [
+        key for key in skipped if key in keys
+    ]
+
+
+def test_plan_lists_stale_forest_models_stalest_first(client, db):
+    records = _history("FL-A", 200) + _history("FL-B", 190) + _history("FL-SHORT", 40) + _history("FL-TINY", 5)
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == len(records)
+    keys = {"FL-A_None", "FL-B_None", "FL-SHORT_None", "FL-TINY_None"}
+
+    plan, skipped = _plan(db, keys)
+    # Short series are served by exponential smoothing and tiny ones by the global model
+    assert plan == {"FL-A_None": 200, "FL-B_None": 190}
+    assert skipped == []
+    order = [entry["model_key"] for entry in ForecastService(db).plan_fleet_retrain()[0]]
+    assert order.index("FL-A_None") < order.index("FL-B_None")
+
+    ForecastService(db).train_model("FL-A", None)
+    plan, skipped = _plan(db, keys)
+    assert plan == {"FL-B_None": 190}
+    assert skipped == ["FL-A_None"]
+
+    client.post("/api/v1/carbon-events/", json=make_event("FL-A", 25.0, timestamp=(START + timedelta(days=200)).isoformat()))
+    db.expire_all()
+    plan, _ = _plan(db, keys)
+    assert plan == {"FL-A_None": 1, "FL-B_None": 190}
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+from app.services.forecast_service import RandomForestEngine
+
+FEATURES = {
+    "recent_avg": 50.0, "recent_trend": 0.0, "volatility": 8.0, "lag_1": 52.0, "lag_7": 49.0,
+    "weekday_means": [40.0, 45.0, 50.0, 55.0, 60.0, 30.0, 20.0]
+}
+FUTURE_DATES = pd.date_range("2026-10-18", periods=21, freq="D")
+
+
+@pytest.fixture(scope="module")
+def noisy_engine():
+    days = pd.date_range("2025-01-01", periods=300, freq="D")
+    engine = RandomForestEngine(None, None)
+    X = engine.create_features(days, FEATURES)
+    y = 50 + 5 * np.asarray(days.dayofweek) + np.random.default_rng(1).normal(0, 10, len(days))
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=50, random_state=0).fit(scaler.transform(X), y)
+    return RandomForestEngine(model, scaler)
+
+
+def test_intervals_are_quantiles_of_the_trees(noisy_engine):
+    result = noisy_engine.forecast(FUTURE_DATES, 0.8, FEATURES)
+
+    trees = noisy_engine.predict_trees(noisy_engine.scaler.transform(noisy_engine.create_features(FUTURE_DATES, FEATURES)))
+    assert trees.shape == (50, 21)
+    lower, upper = np.quantile(trees, [0.1, 0.9], axis=0)
+    assert result["lower"] == pytest.approx(np.maximum(np.minimum(lower, result["predicted"]), 0))
+    assert result["upper"] == pytest.approx(np.maximum(upper, result["predicted"]))
+    assert result["predicted"] == pytest.approx(noisy_engine.model.predict(
+        noisy_engine.scaler.transform(noisy_engine.create_features(FUTURE_DATES, FEATURES))
+    ), rel=1e-5)
+
+
+def test_higher_confidence_widens_the_interval_around_the_forecast(noisy_engine):
+    narrow = noisy_engine.forecast(FUTURE_DATES, 0.5, FEATURES)
+    wide = noisy_engine.forecast(FUTURE_DATES, 0.95, FEATURES)
+
+    assert np.all(wide["lower"] <= narrow["lower"])
+    assert np.all(wide["upper"] >= narrow["upper"])
+    assert np.all((wide["upper"] - wide["lower"]) > 0)
+    for result in (narrow, wide):
+        assert np.all(result["lower"] <= result["predicted"])
+        assert np.all(result["predicted"] <= result["upper"])
+        assert np.all(result["lower"] >= 0)
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+from conftest import make_event
+
+FORECAST = "/api/v1/forecast/"
+REQUEST = {"supplier_id": "MF-A", "forecast_horizon_days": 7}
+
+
+@pytest.fixture(scope="module")
+def history(client):
+    # Three weeks of daily events: "auto" serves these with exponential smoothing
+    today = datetime.combine(datetime.now().date(), time(9))
+    records = [
+        make_event("MF-A", 100.0 + 10 * (today - timedelta(days=day)).weekday(), timestamp=(today - timedelta(days=day)).isoformat())
+        for day in range(21)
+    ]
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == len(records)
+
+
+@contextmanager
+def statements():
+    seen = []
+
+    def record(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_stored_forecast_is_served_without_reading_history(client, history):
+    first = client.post(FORECAST, json=REQUEST).json()
+    assert first["engine"] == "exponential_smoothing"
+
+    with statements() as seen:
+        second = client.post(FORECAST, json=REQUEST).json()
+
+    assert second["generated_at"] == first["generated_at"]
+    assert second["forecast_data"] == first["forecast_data"]
+    assert second["engine"] == "exponential_smoothing"
+    assert not [statement for statement in seen if "carbon_events" in statement]
+
+
+def test_stored_forecast_is_replaced_after_a_write(client, history):
+    first = client.post(FORECAST, json=REQUEST).json()
+    today = datetime.combine(datetime.now().date(), time(12))
+    assert client.post("/api/v1/carbon-events/", json=make_event("MF-A", 5000.0, timestamp=today.isoformat())).status_code == 200
+
+    second = client.post(FORECAST, json=REQUEST).json()
+
+    assert second["generated_at"] != first["generated_at"]
+    assert second["forecast_data"] != first["forecast_data"]
+
+
+def test_stored_forecast_is_kept_per_requested_engine(client, history):
+    client.post(FORECAST, json=REQUEST)
+    forest = client.post(FORECAST, json={**REQUEST, "engine": "random_forest"}).json()
+
+    smoothed = client.post(FORECAST, json=REQUEST).json()
+
+    assert forest["engine"] == "random_forest"
+    assert smoothed["engine"] == "exponential_smoothing"
@@ -0,0 +1,60 @@
+import os
+
+from app.services.model_registry import ModelArtifact, ModelRegistry
+
+
+def make_registry(cache_dir, max_models=10, max_bytes=10 ** 9):
+    return ModelRegistry(cache_dir=str(cache_dir), max_models=max_models, max_bytes=max_bytes)
+
+
+def make_artifact(model_key, **metadata):
+    return ModelArtifact(model_key, model={"coef": [1.0, 2.0]}, scaler=None, metadata=metadata)
+
+
+def test_least_recently_used_model_is_evicted(tmp_path):
+    registry = make_registry(tmp_path, max_models=2)
+    registry.put(make_artifact("a"))
+    registry.put(make_artifact("b"))
+    registry.get("a")
+    registry.put(make_artifact("c"))
+
+    stats = registry.stats()
+    assert stats["resident_models"] == 2
+    assert stats["evictions"] == 1
+    assert "b" not in registry._models
+
+    # Evicted models are reloaded from disk
+    assert registry.get("b").model_key == "b"
+    assert registry.stats()["misses"] == 1
+
+
+def test_byte_budget_keeps_the_newest_model(tmp_path):
+    registry = make_registry(tmp_path, max_bytes=1)
+    registry.put(make_artifact("a"))
+    registry.put(make_artifact("b"))
+
+    assert list(registry._models) == ["b"]
+
+
+def test_retrain_in_another_process_replaces_resident_model(tmp_path):
+    worker = make_registry(tmp_path)
+    other_worker = make_registry(tmp_path)
+    first = worker.put(make_artifact("a", run="first"))
+    assert worker.get("a") is first
+
+    retrained = other_worker.put(make_artifact("a", run="retrained after new events"))
+
+    reloaded = worker.get("a")
+    assert reloaded.model_version == retrained.model_version
+    assert reloaded.metadata["run"] == "retrained after new events"
+    assert worker.get("a") is reloaded
+    assert worker.stats()["resident_models"] == 1
+
+
+def test_deleted_model_is_not_served_from_memory(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.put(make_artifact("a"))
+    os.remove(registry.path_for("a"))
+
+    assert registry.get("a") is None
+    assert registry.stats()["resident_bytes"] == 0
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from app.services.document_extraction import PdfExtractionPool, extract_text, page_ranges
+
+
+def make_pdf(pages):
+    """A minimal PDF with a page of Helvetica text lines per entry of pages"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 12 Tf 72 720 Td 14 TL " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+
+    content, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    content += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return content
+
+
+BILL = [
+    ["Utility bill", "Distance travelled: 120 km"],
+    ["Page two"],
+    ["Page three"],
+    ["Electricity used 12,400 kWh", "Total emissions 4.2 tonnes CO2e"],
+    ["Electricity used 99 kWh"]
+]
+
+
+@pytest.fixture
+def pool():
+    pool = PdfExtractionPool(max_workers=2, pages_per_task=2)
+    yield pool
+    pool.executor.shutdown()
+
+
+def test_pages_are_split_into_ranges():
+    assert page_ranges(5, 2) == [(0, 2), (2, 4), (4, 5)]
+    assert page_ranges(0, 2) == []
+
+
+def test_ranges_are_merged_in_page_order(pool, tmp_path):
+    path = tmp_path / "bill.pdf"
+    path.write_bytes(make_pdf(BILL))
+    progress = []
+
+    extraction = pool.extract(str(path), on_pages=lambda done, total: progress.append((done, total)))
+
+    assert extraction["pages"] == 5
+    assert extraction["extracted_data"] == {"distance_km": 120.0, "energy_consumption": 12400.0, "calculated_emissions": 4200.0}
+    assert progress[0] == (0, 5)
+    assert progress[-1] == (5, 5)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+def test_estimated_emissions_score_below_stated_ones():
+    stated = extract_text("Diesel 100 litres\nEmissions 250 kg CO2e")
+    estimated = extract_text("Diesel 100 litres")
+
+    assert estimated["extracted_data"]["calculated_emissions"] == 231.0
+    assert estimated["confidence_score"] < stated["confidence_score"]
+    assert extract_text("")["confidence_score"] == 0.0
+
+
+def test_uploaded_pdf_reports_its_pages(client):
+    queued = client.post(
+        "/api/v1/upload/file", files={"file": ("bill.pdf", make_pdf(BILL), "application/pdf")}, data={"supplier_id": "PX-A"}
+    ).json()
+    for _ in range(600):
+        status = client.get(f"/api/v1/upload/status/{queued['upload_id']}").json()
+        if status["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.05)
+
+    assert (status["status"], status["pages_total"], status["pages_processed"]) == ("completed", 5, 5)
+    event, = client.get("/api/v1/carbon-events/", params={"supplier_id": "PX-A"}).json()
+    assert event["emissions_kg_co2e"] == 4200.0
+    assert event["source_document"] == "bill.pdf"
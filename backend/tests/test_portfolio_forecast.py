@@ -0,0 +1,43 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from conftest import make_event
+
+SUPPLIERS = ["PF-A", "PF-B"]
+
+
+@pytest.fixture(scope="module")
+def histories(client):
+    # Three weeks of daily events ending today: short enough for exponential smoothing
+    today = datetime.combine(datetime.now().date(), time(9))
+    records = [
+        make_event(supplier_id, 50.0 * (i + 1) + 10 * ((today - timedelta(days=day)).weekday()),
+                   timestamp=(today - timedelta(days=day)).isoformat())
+        for i, supplier_id in enumerate(SUPPLIERS)
+        for day in range(21)
+    ]
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == len(records)
+
+
+def test_portfolio_total_is_the_sum_of_its_suppliers(client, histories):
+    portfolio = client.post("/api/v1/forecast/portfolio", json={"supplier_ids": SUPPLIERS, "forecast_horizon_days": 5}).json()
+
+    assert [supplier["supplier_id"] for supplier in portfolio["suppliers"]] == SUPPLIERS
+    for day, total in enumerate(portfolio["portfolio_total"]):
+        for key in ("predicted_emissions", "confidence_lower", "confidence_upper"):
+            assert total[key] == pytest.approx(sum(s["forecast_data"][day][key] for s in portfolio["suppliers"]))
+
+
+def test_portfolio_dates_line_up_with_single_supplier_forecasts(client, histories):
+    portfolio = client.post("/api/v1/forecast/portfolio", json={"supplier_ids": SUPPLIERS, "forecast_horizon_days": 5}).json()
+    single = client.post(
+        "/api/v1/forecast/", json={"supplier_id": "PF-A", "forecast_horizon_days": 5, "engine": "exponential_smoothing"}
+    ).json()
+
+    portfolio_points = portfolio["suppliers"][0]["forecast_data"]
+    assert [point["date"] for point in portfolio_points] == [point["date"] for point in single["forecast_data"]]
+    assert portfolio_points[0]["date"] == datetime.now().date().isoformat() + "T00:00:00"
+    assert [point["predicted_emissions"] for point in portfolio_points] == pytest.approx(
+        [point["predicted_emissions"] for point in single["forecast_data"]]
+    )
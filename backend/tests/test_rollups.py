@@ -0,0 +1,67 @@
+from datetime import date, datetime
+
+from app.models.carbon_event import CarbonEvent
+from app.models.emissions_rollup import DailyEmissionsRollup
+from app.services.rollup_service import EmissionsRollupService
+from conftest import make_event
+
+EVENTS = "/api/v1/carbon-events/"
+
+
+def _rollup_totals(db, supplier_id):
+    rows = db.query(DailyEmissionsRollup).filter(
+        DailyEmissionsRollup.supplier_id == supplier_id,
+        DailyEmissionsRollup.period == date(2026, 10, 1)
+    ).all()
+    return sum(row.event_count for row in rows), round(sum(row.emissions_total for row in rows), 6)
+
+
+def test_writes_keep_rollups_in_step(client, db):
+    event_id = client.post(EVENTS, json=make_event("RU-A", 5.0)).json()["id"]
+    assert _rollup_totals(db, "RU-A") == (1, 5.0)
+
+    client.put(f"{EVENTS}{event_id}", json={"emissions_kg_co2e": 9.0})
+    db.expire_all()
+    assert _rollup_totals(db, "RU-A") == (1, 9.0)
+
+    client.put(f"{EVENTS}{event_id}", json={"supplier_id": "RU-B"})
+    db.expire_all()
+    assert _rollup_totals(db, "RU-A") == (0, 0.0)
+    assert _rollup_totals(db, "RU-B") == (1, 9.0)
+
+    client.delete(f"{EVENTS}{event_id}")
+    db.expire_all()
+    assert _rollup_totals(db, "RU-B") == (0, 0.0)
+
+
+def test_dashboard_summary_includes_this_months_writes(client):
+    before = client.get(f"{EVENTS}summary/dashboard").json()
+    now = datetime.now().replace(microsecond=0).isoformat()
+    client.post(EVENTS, json=make_event("RU-DASH", 10 ** 9, timestamp=now))
+
+    after = client.get(f"{EVENTS}summary/dashboard").json()
+
+    assert after["total_emissions_kg_co2e"] - before["total_emissions_kg_co2e"] == 10 ** 9
+    assert after["top_suppliers"][0] == {"supplier_id": "RU-DASH", "emissions": 10 ** 9}
+
+
+def test_rebuild_backfills_events_written_around_the_rollups(db):
+    db.add_all([
+        CarbonEvent(supplier_id="RU-R", event_type="energy", emissions_kg_co2e=emissions, timestamp=timestamp)
+        for emissions, timestamp in [(1.0, datetime(2025, 3, 1, 8)), (2.0, datetime(2025, 3, 1, 9)), (4.0, datetime(2025, 3, 20))]
+    ])
+    db.commit()
+    service = EmissionsRollupService(db)
+    version = service.get_scope_version("RU-R").version
+    assert service.get_emissions_by_period("monthly", supplier_ids=["RU-R"]) == []
+
+    service.rebuild(date(2025, 3, 10), date(2025, 3, 10))
+
+    assert service.get_emissions_by_period("daily", supplier_ids=["RU-R"]) == [
+        {"period": "2025-03-01", "supplier_id": "RU-R", "emissions_kg_co2e": 3.0, "event_count": 2},
+        {"period": "2025-03-20", "supplier_id": "RU-R", "emissions_kg_co2e": 4.0, "event_count": 1}
+    ]
+    assert service.get_emissions_by_period("monthly", supplier_ids=["RU-R"]) == [
+        {"period": "2025-03-01", "supplier_id": "RU-R", "emissions_kg_co2e": 7.0, "event_count": 3}
+    ]
+    assert service.get_scope_version("RU-R").version > version
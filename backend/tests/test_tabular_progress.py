@@ -0,0 +1,55 @@
+import io
+
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.services.tabular_import import RowReader
+from app.services.upload_service import UploadService
+
+HEADER = ["supplier_id", "event_type", "emissions_kg_co2e", "timestamp"]
+
+
+def _xlsx(rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for i in range(rows):
+        sheet.append(["TP-X", "transport", i + 1, "2026-10-01T00:00:00"])
+    content = io.BytesIO()
+    workbook.save(content)
+    content.seek(0)
+    return content
+
+
+def test_xlsx_progress_counts_rows_against_the_sheet_dimensions():
+    rows = RowReader(_xlsx(99), "xlsx")
+    for _ in range(50):
+        next(rows)
+
+    assert rows.total_rows == 100
+    assert rows.progress() == 0.5
+    for _ in rows:
+        pass
+    assert rows.progress() == 1.0
+
+
+def test_csv_progress_follows_the_byte_position():
+    content = ",".join(HEADER).encode() + b"\n" + b"TP-C,transport,1,2026-10-01T00:00:00\n" * 20000
+    rows = RowReader(io.BytesIO(content), "csv")
+    next(rows)
+    assert 0 < rows.progress() < 1
+    for _ in rows:
+        pass
+    assert rows.progress() == 1.0
+
+
+def test_xlsx_import_reports_progress_per_chunk(db, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_INSERT_CHUNK_ROWS", 25)
+    reported = []
+
+    result = UploadService(db).import_table(
+        _xlsx(99), "xlsx", "events.xlsx", on_progress=lambda summary, share: reported.append((summary["received"], share))
+    )
+
+    assert result["rows_inserted"] == 99
+    assert reported == [(25, 0.26), (50, 0.51), (75, 0.76), (99, 1.0)]
@@ -0,0 +1,84 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import training_jobs as training_jobs_module
+from app.services.training_jobs import TrainingJobQueue
+from conftest import make_event
+
+
+def slow_training(supplier_id, product_id):
+    time.sleep(0.5)
+    return {"model_key": f"{supplier_id}_{product_id}"}
+
+
+def failing_training(supplier_id, product_id):
+    raise ValueError(f"No history for {supplier_id}")
+
+
+def wait_for(queue, job_id):
+    for _ in range(300):
+        job = queue.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.fixture
+def queue():
+    queue = TrainingJobQueue(max_workers=1)
+    yield queue
+    queue.executor.shutdown()
+
+
+def test_training_for_the_same_model_is_queued_once(queue, monkeypatch):
+    monkeypatch.setattr(training_jobs_module, "run_model_training", slow_training)
+
+    first = queue.submit_model_training("TJ-Q", None)
+    again = queue.submit_model_training("TJ-Q", None)
+    other = queue.submit_model_training("TJ-R", None)
+
+    assert again["job_id"] == first["job_id"]
+    assert other["job_id"] != first["job_id"]
+    assert first["status"] in ("queued", "running")
+    job = wait_for(queue, first["job_id"])
+    assert (job["status"], job["progress"]) == ("completed", 100)
+    assert job["results"] == {"TJ-Q_None": {"model_key": "TJ-Q_None"}}
+
+    # Once finished, the model can be queued again
+    wait_for(queue, other["job_id"])
+    assert queue.submit_model_training("TJ-Q", None)["job_id"] != first["job_id"]
+
+
+def test_failed_task_is_reported_on_the_job(queue, monkeypatch):
+    monkeypatch.setattr(training_jobs_module, "run_model_training", failing_training)
+
+    job = wait_for(queue, queue.submit_model_training("TJ-F", None)["job_id"])
+
+    assert job["status"] == "failed"
+    assert job["errors"] == {"TJ-F_None": "No history for TJ-F"}
+
+
+def test_cold_supplier_is_served_by_the_global_model_while_its_own_trains(client):
+    # Long enough history that "auto" picks the forest, which needs a trained model
+    start = datetime(2026, 1, 1, 9)
+    records = [make_event("TJ-A", 50.0 + day % 7, timestamp=(start + timedelta(days=day)).isoformat()) for day in range(200)]
+    assert client.post("/api/v1/carbon-events/bulk", json=records).json()["inserted"] == 200
+
+    cold = client.post("/api/v1/forecast/", json={"supplier_id": "TJ-A", "forecast_horizon_days": 7}).json()
+    assert cold["fallback_model"] is True
+    assert cold["training_job_id"]
+
+    for _ in range(600):
+        job = client.get(f"/api/v1/forecast/train/{cold['training_job_id']}").json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.1)
+    assert job["status"] == "completed"
+    assert job["results"]["TJ-A_None"]["training_events"] == 200
+
+    warm = client.post("/api/v1/forecast/", json={"supplier_id": "TJ-A", "forecast_horizon_days": 7}).json()
+    assert warm["fallback_model"] is False
+    assert warm["training_job_id"] is None
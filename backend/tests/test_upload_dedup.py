@@ -0,0 +1,71 @@
+import hashlib
+import time
+
+from app.core.database import SessionLocal
+from app.models.upload_job import UploadJob
+
+CSV = b"supplier_id,event_type,emissions_kg_co2e,timestamp,distance_km\n" + b"".join(
+    b'UP-A,transport,%d,2026-10-01T00:00:00,"1,200"\n' % emissions for emissions in range(1, 6)
+)
+
+
+def _upload(client, content=CSV, supplier_id="UP-A"):
+    queued = client.post(
+        "/api/v1/upload/file", files={"file": ("events.csv", content, "text/csv")}, data={"supplier_id": supplier_id}
+    ).json()
+    for _ in range(200):
+        status = client.get(f"/api/v1/upload/status/{queued['upload_id']}").json()
+        if status["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.05)
+    return queued, client.get(f"/api/v1/upload/parsed-data/{queued['upload_id']}").json()
+
+
+def test_repeat_upload_reuses_the_first_uploads_events(client):
+    first, first_data = _upload(client)
+    assert first_data["status"] == "completed"
+    (start, end), = first_data["event_id_ranges"]
+    assert end - start + 1 == 5
+
+    event = client.get(f"/api/v1/carbon-events/{start}").json()
+    assert event["extracted_data"]["distance_km"] == 1200.0
+
+    repeat, repeat_data = _upload(client)
+    assert repeat["status"] == "duplicate"
+    assert repeat["duplicate_of"] == first["upload_id"]
+    assert repeat_data["event_id_ranges"] == first_data["event_id_ranges"]
+
+
+def test_upload_is_reprocessed_once_its_events_are_deleted(client):
+    content = CSV.replace(b"UP-A", b"UP-B")
+    _, first_data = _upload(client, content)
+    (start, _), = first_data["event_id_ranges"]
+    client.delete(f"/api/v1/carbon-events/{start}")
+
+    again, again_data = _upload(client, content)
+    assert again["status"] == "queued"
+    assert again_data["status"] == "completed"
+    assert again_data["event_id_ranges"] != first_data["event_id_ranges"]
+
+
+def test_uploads_are_keyed_by_the_sha256_of_their_content(client):
+    content = CSV.replace(b"UP-A", b"UP-H")
+    queued, _ = _upload(client, content, "UP-H")
+
+    db = SessionLocal()
+    try:
+        job = db.query(UploadJob).filter(UploadJob.upload_id == queued["upload_id"]).one()
+    finally:
+        db.close()
+    assert job.content_hash == hashlib.sha256(content).hexdigest()
+
+
+def test_same_file_from_another_supplier_is_processed(client):
+    content = CSV.replace(b"UP-A,", b",")
+    _, first_data = _upload(client, content, "UP-S1")
+
+    other, other_data = _upload(client, content, "UP-S2")
+
+    assert other["status"] == "queued"
+    assert other_data["event_id_ranges"] != first_data["event_id_ranges"]
+    assert len(client.get("/api/v1/carbon-events/", params={"supplier_id": "UP-S2"}).json()) == 5
@@ -0,0 +1,57 @@
+from app.services.upload_jobs import UploadJobQueue, run_upload_job, upload_jobs
+
+CSV = b"supplier_id,event_type,emissions_kg_co2e,timestamp\n" + (
+    b"UJ-%s,transport,4,2026-10-01T00:00:00\n"
+    b"UJ-%s,transport,-1,2026-10-01T00:00:00\n"
+    b"UJ-%s,transport,6,2026-10-01T00:00:00\n"
+)
+
+
+def _queue_without_running(client, monkeypatch, supplier_id):
+    queued = []
+    monkeypatch.setattr(upload_jobs, "submit", queued.append)
+    content = CSV.replace(b"%s", supplier_id.encode())
+    response = client.post(
+        "/api/v1/upload/file", files={"file": ("events.csv", content, "text/csv")}, data={"supplier_id": f"UJ-{supplier_id}"}
+    ).json()
+    assert queued == [response["upload_id"]]
+    return response["upload_id"]
+
+
+def test_upload_returns_at_once_and_the_job_reports_its_rows(client, monkeypatch):
+    upload_id = _queue_without_running(client, monkeypatch, "A")
+    status = client.get(f"/api/v1/upload/status/{upload_id}").json()
+    assert (status["status"], status["progress"], status["started_at"]) == ("queued", 0, None)
+
+    run_upload_job(upload_id)
+
+    status = client.get(f"/api/v1/upload/status/{upload_id}").json()
+    assert (status["status"], status["progress"]) == ("completed", 100)
+    assert (status["rows_received"], status["rows_inserted"], status["rows_failed"]) == (3, 2, 1)
+    assert len(status["errors"]) == 1
+    assert status["finished_at"] is not None
+    assert len(client.get("/api/v1/carbon-events/", params={"supplier_id": "UJ-A"}).json()) == 2
+
+
+def test_job_queued_twice_runs_once(client, monkeypatch):
+    upload_id = _queue_without_running(client, monkeypatch, "B")
+
+    assert run_upload_job(upload_id)["status"] == "completed"
+    assert run_upload_job(upload_id) is None
+    assert len(client.get("/api/v1/carbon-events/", params={"supplier_id": "UJ-B"}).json()) == 2
+
+
+def test_waiting_jobs_are_queued_again_on_resume(client, monkeypatch):
+    upload_id = _queue_without_running(client, monkeypatch, "C")
+    queue = UploadJobQueue()
+    resumed = []
+    monkeypatch.setattr(queue, "submit", resumed.append)
+
+    assert queue.resume() == len(resumed)
+    assert upload_id in resumed
+    run_upload_job(upload_id)
+
+
+def test_unknown_upload_is_not_found(client):
+    assert client.get("/api/v1/upload/status/no-such-upload").status_code == 404
+    assert client.get("/api/v1/upload/parsed-data/no-such-upload").status_code == 404
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+from app.services.forecast_service import RandomForestEngine
+
+FEATURES = {
+    "recent_avg": 100.0, "recent_trend": 0.5, "volatility": 4.0, "lag_1": 104.0, "lag_7": 98.0,
+    "weekday_means": [90.0, 95.0, 100.0, 105.0, 110.0, 120.0, 80.0]
+}
+
+
+@pytest.fixture(scope="module")
+def forest_engine():
+    days = pd.date_range("2025-01-01", periods=200, freq="D")
+    engine = RandomForestEngine(None, None)
+    X = engine.create_features(days, FEATURES)
+    y = 100 + 10 * np.asarray(days.dayofweek) + np.random.default_rng(0).normal(0, 3, len(days))
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=20, random_state=0).fit(scaler.transform(X), y)
+    return RandomForestEngine(model, scaler)
+
+
+def test_whole_horizon_matches_day_by_day_prediction(forest_engine):
+    future_dates = pd.date_range("2026-10-18", periods=30, freq="D")
+
+    result = forest_engine.forecast(future_dates, 0.95, FEATURES)
+
+    day_by_day = [
+        forest_engine.model.predict(forest_engine.scaler.transform(forest_engine.create_features(future_dates[[i]], FEATURES)))[0]
+        for i in range(len(future_dates))
+    ]
+    assert result["predicted"] == pytest.approx(day_by_day, rel=1e-5)
+
+
+def test_feature_matrix_has_a_row_per_date_with_its_weekday_mean(forest_engine):
+    future_dates = pd.date_range("2026-10-18", periods=14, freq="D")
+
+    X = forest_engine.create_features(future_dates, FEATURES)
+
+    assert X.shape == (14, 10)
+    assert list(X[:, 0]) == list(future_dates.dayofweek)
+    assert list(X[:, -1]) == [FEATURES["weekday_means"][day] for day in future_dates.dayofweek]
@@ -22,18 +22,69 @@ CREATE TABLE IF NOT EXISTS carbon_events (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create emissions rollup tables (maintained on every carbon event write)
+CREATE TABLE IF NOT EXISTS emissions_daily_rollups (
+    id SERIAL PRIMARY KEY,
+    period DATE NOT NULL,
+    supplier_id VARCHAR(100) NOT NULL,
+    product_id VARCHAR(100) NOT NULL DEFAULT '',
+    event_type VARCHAR(50) NOT NULL,
+    emissions_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_emissions_daily_rollups_key UNIQUE (period, supplier_id, product_id, event_type)
+);
+
+CREATE TABLE IF NOT EXISTS emissions_monthly_rollups (
+    id SERIAL PRIMARY KEY,
+    period DATE NOT NULL,
+    supplier_id VARCHAR(100) NOT NULL,
+    product_id VARCHAR(100) NOT NULL DEFAULT '',
+    event_type VARCHAR(50) NOT NULL,
+    emissions_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_emissions_monthly_rollups_key UNIQUE (period, supplier_id, product_id, event_type)
+);
+
+-- Create event scope versions table (a counter per supplier and for all events, for ETags)
+CREATE TABLE IF NOT EXISTS event_scope_versions (
+    scope_key VARCHAR(110) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create forecasts table
 CREATE TABLE IF NOT EXISTS forecasts (
     id SERIAL PRIMARY KEY,
     supplier_id VARCHAR(100),
+    product_id VARCHAR(100),
     forecast_date DATE NOT NULL,
     predicted_emissions DECIMAL(10, 2) NOT NULL,
     confidence_interval_lower DECIMAL(10, 2),
     confidence_interval_upper DECIMAL(10, 2),
+    horizon_days INTEGER,
+    confidence_level DOUBLE PRECISION,
     model_version VARCHAR(50),
+    data_version VARCHAR(100),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create forecast feature store table (one row per supplier/product scope)
+CREATE TABLE IF NOT EXISTS forecast_features (
+    id SERIAL PRIMARY KEY,
+    scope_key VARCHAR(210) UNIQUE NOT NULL,
+    supplier_id VARCHAR(100),
+    product_id VARCHAR(100),
+    event_count INTEGER NOT NULL DEFAULT 0,
+    emissions_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_event_date DATE,
+    daily_totals TEXT,
+    weekday_totals TEXT,
+    event_type_totals TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create incentives table
 CREATE TABLE IF NOT EXISTS incentives (
     id SERIAL PRIMARY KEY,
@@ -59,12 +110,74 @@ CREATE TABLE IF NOT EXISTS reports (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create upload jobs table (one row per uploaded file, updated by the upload workers)
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    id SERIAL PRIMARY KEY,
+    upload_id VARCHAR(32) UNIQUE NOT NULL,
+    filename VARCHAR(255),
+    content_type VARCHAR(100),
+    file_path VARCHAR(500) NOT NULL,
+    file_size INTEGER NOT NULL DEFAULT 0,
+    content_hash VARCHAR(64),
+    duplicate_of VARCHAR(32),
+    supplier_id VARCHAR(100),
+    document_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    progress INTEGER NOT NULL DEFAULT 0,
+    rows_received INTEGER NOT NULL DEFAULT 0,
+    rows_inserted INTEGER NOT NULL DEFAULT 0,
+    rows_failed INTEGER NOT NULL DEFAULT 0,
+    pages_total INTEGER,
+    pages_processed INTEGER NOT NULL DEFAULT 0,
+    errors JSONB,
+    result JSONB,
+    error_message VARCHAR(1000),
+    confidence_score DOUBLE PRECISION,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_carbon_events_supplier_id ON carbon_events(supplier_id);
 CREATE INDEX IF NOT EXISTS idx_carbon_events_timestamp ON carbon_events(timestamp);
 CREATE INDEX IF NOT EXISTS idx_carbon_events_event_type ON carbon_events(event_type);
+CREATE INDEX IF NOT EXISTS ix_carbon_events_timestamp_id ON carbon_events(timestamp, id);
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_status ON upload_jobs(status);
+CREATE INDEX IF NOT EXISTS ix_carbon_events_supplier_timestamp_id ON carbon_events(supplier_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_emissions_daily_rollups_period ON emissions_daily_rollups(period);
+CREATE INDEX IF NOT EXISTS idx_emissions_daily_rollups_supplier_id ON emissions_daily_rollups(supplier_id);
+CREATE INDEX IF NOT EXISTS idx_emissions_monthly_rollups_period ON emissions_monthly_rollups(period);
+CREATE INDEX IF NOT EXISTS idx_emissions_monthly_rollups_supplier_id ON emissions_monthly_rollups(supplier_id);
 CREATE INDEX IF NOT EXISTS idx_forecasts_supplier_id ON forecasts(supplier_id);
 CREATE INDEX IF NOT EXISTS idx_forecasts_forecast_date ON forecasts(forecast_date);
+CREATE INDEX IF NOT EXISTS idx_forecast_features_supplier_id ON forecast_features(supplier_id);
+CREATE INDEX IF NOT EXISTS idx_forecast_features_updated_at ON forecast_features(updated_at);
+
+-- Materialized forecast columns for databases created before they existed
+ALTER TABLE forecasts ADD COLUMN IF NOT EXISTS product_id VARCHAR(100);
+ALTER TABLE forecasts ADD COLUMN IF NOT EXISTS horizon_days INTEGER;
+ALTER TABLE forecasts ADD COLUMN IF NOT EXISTS confidence_level DOUBLE PRECISION;
+ALTER TABLE forecasts ADD COLUMN IF NOT EXISTS data_version VARCHAR(100);
+CREATE INDEX IF NOT EXISTS ix_forecasts_lookup ON forecasts(supplier_id, product_id, horizon_days, model_version);
+
+-- Native JSON event documents, with expression indexes on the extracted fields the API queries
+ALTER TABLE carbon_events ADD COLUMN IF NOT EXISTS activity_data JSONB;
+ALTER TABLE carbon_events ADD COLUMN IF NOT EXISTS audit_trail JSONB;
+ALTER TABLE carbon_events ALTER COLUMN activity_data TYPE JSONB USING activity_data::jsonb;
+ALTER TABLE carbon_events ALTER COLUMN audit_trail TYPE JSONB USING audit_trail::jsonb;
+ALTER TABLE carbon_events ALTER COLUMN extracted_data TYPE JSONB USING extracted_data::jsonb;
+CREATE INDEX IF NOT EXISTS ix_carbon_events_extracted_fuel_consumption ON carbon_events ((CAST((extracted_data ->> 'fuel_consumption') AS DOUBLE PRECISION)));
+CREATE INDEX IF NOT EXISTS ix_carbon_events_extracted_distance_km ON carbon_events ((CAST((extracted_data ->> 'distance_km') AS DOUBLE PRECISION)));
+CREATE INDEX IF NOT EXISTS ix_carbon_events_extracted_energy_consumption ON carbon_events ((CAST((extracted_data ->> 'energy_consumption') AS DOUBLE PRECISION)));
+CREATE INDEX IF NOT EXISTS ix_carbon_events_extracted_waste_generated ON carbon_events ((CAST((extracted_data ->> 'waste_generated') AS DOUBLE PRECISION)));
+CREATE INDEX IF NOT EXISTS ix_carbon_events_extracted_vehicle_type ON carbon_events ((extracted_data ->> 'vehicle_type'));
+
+-- Upload content hashes for databases created before they existed
+ALTER TABLE upload_jobs ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE upload_jobs ADD COLUMN IF NOT EXISTS duplicate_of VARCHAR(32);
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_content_hash ON upload_jobs(content_hash);
 
 -- Insert sample data
 INSERT INTO carbon_events (supplier_id, event_type, emissions_kg_co2e, verification_status, source_document) VALUES